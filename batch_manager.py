@@ -0,0 +1,113 @@
+import collections
+import os
+import time
+import tomllib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from project_spec import ProjectSpec
+from trace_recorder import TraceRecorder
+
+class BatchResult:
+    """Outcome of scaffolding one project in a batch run."""
+
+    def __init__(self, spec, succeeded, elapsed, error=None):
+        self.spec = spec
+        self.succeeded = succeeded
+        self.elapsed = elapsed
+        self.error = error
+        self.steps = []
+
+    @property
+    def cpu_time(self):
+        return sum(step.cpu_time + step.child_cpu_time for step in self.steps)
+
+    @property
+    def slowest_step(self):
+        return max(self.steps, key=lambda step: step.wall_time, default=None)
+
+class BatchManager:
+    """Scaffolds many projects from a TOML manifest across a worker pool."""
+
+    @staticmethod
+    def load_manifest(path):
+        """Load project specs from a manifest file.
+
+        The manifest holds an optional ``[defaults]`` table and one ``[[project]]``
+        table per site. Relative directories are resolved against the manifest's folder.
+        """
+        with open(path, 'rb') as f:
+            manifest = tomllib.load(f)
+
+        base_dir = os.path.dirname(os.path.abspath(path))
+        defaults = manifest.get('defaults', {})
+        specs = [ProjectSpec.from_dict(entry, defaults, base_dir) for entry in manifest.get('project', [])]
+
+        if not specs:
+            raise ValueError(f"Manifest '{path}' does not define any [[project]] entries.")
+
+        directories = [spec.directory for spec in specs]
+        duplicates = sorted({d for d in directories if directories.count(d) > 1})
+        if duplicates:
+            raise ValueError(f"Manifest '{path}' assigns several projects to the same directory: {', '.join(duplicates)}")
+
+        return specs, manifest.get('workers')
+
+    @staticmethod
+    def run(specs, scaffold, max_workers=None):
+        """Run ``scaffold(spec)`` for every spec concurrently and return a BatchResult per spec, in manifest order."""
+        max_workers = max_workers or min(len(specs), os.cpu_count() or 1)
+        results = {}
+        # Traced steps are matched to projects by label, so projects sharing a name get numbered labels.
+        counts = collections.Counter(spec.label for spec in specs)
+        for index, spec in enumerate(specs, 1):
+            if counts[spec.label] > 1:
+                spec.label = f"{spec.label}#{index}"
+
+        # Collect each project's traced steps as they finish.
+        steps_by_label = {}
+        unsubscribe = TraceRecorder.instance().subscribe(
+            lambda span: steps_by_label.setdefault(span.project, []).append(span))
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                futures = {pool.submit(BatchManager._timed, scaffold, spec): index for index, spec in enumerate(specs)}
+                for future in as_completed(futures):
+                    result = future.result()
+                    results[futures[future]] = result
+                    status = "done" if result.succeeded else "FAILED"
+                    print(f"[{result.spec.label}] {status} in {result.elapsed:.1f}s")
+        finally:
+            unsubscribe()
+
+        for result in results.values():
+            result.steps = steps_by_label.get(result.spec.label, [])
+        return [results[index] for index in range(len(specs))]
+
+    @staticmethod
+    def _timed(scaffold, spec):
+        """Scaffold one project, converting failures (including ``sys.exit`` from the managers) into a result."""
+        start = time.perf_counter()
+        try:
+            scaffold(spec)
+        except SystemExit as e:
+            return BatchResult(spec, False, time.perf_counter() - start, f"exited with status {e.code}")
+        except Exception as e:
+            return BatchResult(spec, False, time.perf_counter() - start, str(e))
+        return BatchResult(spec, True, time.perf_counter() - start)
+
+    @staticmethod
+    def print_report(results):
+        """Print a per-project success/failure/timing table and return True if every project succeeded."""
+        width = max(len(r.spec.label) for r in results)
+        print("\nBatch report:")
+        for r in results:
+            status = "ok" if r.succeeded else "failed"
+            line = f"  {r.spec.label:<{width}}  {status:<6}  {r.elapsed:8.2f}s  cpu {r.cpu_time:7.2f}s"
+            if r.slowest_step:
+                line += f"  slowest {r.slowest_step.name} ({r.slowest_step.wall_time:.2f}s)"
+            line += f"  {r.spec.directory}"
+            if r.error:
+                line += f"  ({r.error})"
+            print(line)
+
+        failed = sum(1 for r in results if not r.succeeded)
+        print(f"{len(results) - failed} succeeded, {failed} failed.")
+        return failed == 0
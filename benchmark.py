@@ -0,0 +1,408 @@
+import argparse
+import glob
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Directory holding this script, main.py and the per-commit results.
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(ROOT_DIR, ".benchmarks")
+PROJECT_NAME = "bench_project"
+APP_NAME = "bench_app"
+REGRESSION_THRESHOLD = 0.10  # Fractional slowdown against the baseline that counts as a regression
+
+# Shared prologue of every fake tool: latency, chatty output and a log of each invocation.
+FAKE_TOOL_PROLOGUE = '''import os, sys, time, json
+TOOL = os.path.basename(sys.argv[0])
+ARGS = sys.argv[1:]
+NETWORK = {network!r}
+if ARGS[:1] != ['--version']:
+    latency = float(os.environ.get('FAKE_' + TOOL.upper() + '_LATENCY', os.environ.get('FAKE_TOOL_LATENCY', '0')))
+    # Offline uv and npm calls are served from their caches, like the real tools after a prewarm.
+    cached = '--offline' in ARGS or os.environ.get('UV_OFFLINE' if TOOL == 'uv' else 'npm_config_offline')
+    if not cached and any(' '.join(ARGS).startswith(prefix) for prefix in NETWORK):
+        if os.environ.get('FAKE_OFFLINE'):
+            sys.exit(f"{{TOOL}}: network unavailable (FAKE_OFFLINE)")
+        latency += float(os.environ.get('FAKE_NETWORK_LATENCY', '0'))
+    time.sleep(latency)
+    for i in range(int(os.environ.get('FAKE_TOOL_OUTPUT_LINES', '0'))):
+        print(f"{{TOOL}}: output line {{i}}")
+    if os.environ.get('FAKE_TOOL_LOG'):
+        with open(os.environ['FAKE_TOOL_LOG'], 'a') as log:
+            log.write(json.dumps([TOOL] + ARGS) + "\\n")
+'''
+
+FAKE_TOOLS = {
+    'snap': ([], '''
+if ARGS[:1] == ['--version']:
+    print("snap    2.63")
+'''),
+    'git': ([], '''
+REAL_GIT = os.environ.get('FAKE_REAL_GIT')
+if ARGS[:1] == ['--version']:
+    print("git version 2.43.0 (fake)")
+elif REAL_GIT:
+    # Repository commands go to the real git, so --initial-commit runs create real commits.
+    os.execv(REAL_GIT, [REAL_GIT] + ARGS)
+elif ARGS[:1] == ['init']:
+    # Without a real git no repository is created, so --initial-commit runs skip the commit and say so.
+    print("fake git: no real git found; not creating a repository.", file=sys.stderr)
+else:
+    sys.exit(f"fake git: no real git found for 'git {' '.join(ARGS)}'.")
+'''),
+    'uv': (['init', 'add', 'sync', 'lock'], '''
+name = os.path.basename(os.getcwd()).lower().replace('_', '-')
+if ARGS[:1] == ['--version']:
+    print("uv 0.5.0 (fake)")
+elif ARGS[:1] == ['init']:
+    with open('pyproject.toml', 'w') as f:
+        f.write(f'[project]\\nname = "{name}"\\nversion = "0.1.0"\\nrequires-python = ">=3.12"\\ndependencies = []\\n')
+    for filename, content in (('.python-version', '3.12\\n'), ('README.md', ''), ('main.py', f'def main():\\n    print("Hello from {name}!")\\n')):
+        with open(filename, 'w') as f:
+            f.write(content)
+    # Like real uv, create a repository with uv's own .gitignore unless the directory is already inside one.
+    parents = [os.getcwd()]
+    while os.path.dirname(parents[-1]) != parents[-1]:
+        parents.append(os.path.dirname(parents[-1]))
+    if not any(os.path.exists(os.path.join(parent, '.git')) for parent in parents):
+        import subprocess
+        subprocess.run(['git', 'init', '--quiet'], check=False)
+        with open('.gitignore', 'w') as f:
+            f.write('# Python-generated files\\n__pycache__/\\n*.py[oc]\\nbuild/\\ndist/\\nwheels/\\n*.egg-info\\n\\n# Virtual environments\\n.venv\\n')
+elif ARGS[:1] == ['add']:
+    site_packages = os.path.join('.venv', 'lib', 'python3.12', 'site-packages')
+    os.makedirs(site_packages, exist_ok=True)
+    target = os.path.join(site_packages, 'django')
+    if not os.path.exists(target):
+        import shutil
+        shutil.copytree(os.environ['FAKE_DJANGO_PACKAGE'], target)
+    with open('pyproject.toml') as f:
+        content = f.read()
+    with open('pyproject.toml', 'w') as f:
+        f.write(content.replace('dependencies = []', 'dependencies = [\\n    "django>=5.1.3",\\n]'))
+    with open('uv.lock', 'w') as f:
+        f.write('version = 1\\n\\n[[package]]\\nname = "django"\\nversion = "5.1.3"\\n')
+elif ARGS[:1] == ['run']:
+    command = ARGS[1:]
+    if command[:1] == ['python']:
+        command = command[1:]
+    sys.path.insert(0, os.environ['FAKE_SCAFFOLDER_DIR'])
+    from django_template_engine import DjangoTemplateEngine
+    django_dir = DjangoTemplateEngine.locate_django(os.getcwd())
+    if command[:2] == ['django-admin', 'startproject']:
+        DjangoTemplateEngine.start_project(os.getcwd(), command[2], django_dir)
+    elif command[1:2] == ['startapp']:
+        DjangoTemplateEngine.start_apps(os.getcwd(), [command[2]], django_dir)
+    else:
+        sys.exit(f"fake uv: unsupported command {command}")
+'''),
+    'npm': (['install', 'view'], '''
+if ARGS[:1] == ['--version']:
+    print("10.8.0")
+elif ARGS[:1] == ['view']:
+    print(json.dumps("3.4.17"))
+elif ARGS[:1] == ['init']:
+    name = os.path.basename(os.getcwd()).lower()
+    with open('package.json', 'w') as f:
+        f.write('{\\n  "name": "' + name + '",\\n  "version": "1.0.0",\\n  "main": "index.js",\\n  "scripts": {\\n'
+                '    "test": "echo \\\\"Error: no test specified\\\\" && exit 1"\\n  },\\n  "license": "ISC"\\n}\\n')
+elif ARGS[:1] == ['install']:
+    package_dir = os.path.join('node_modules', 'tailwindcss')
+    os.makedirs(os.path.join(package_dir, 'lib'), exist_ok=True)
+    with open(os.path.join(package_dir, 'package.json'), 'w') as f:
+        f.write('{"name": "tailwindcss", "version": "3.4.17"}\\n')
+    with open(os.path.join(package_dir, 'lib', 'index.js'), 'w') as f:
+        f.write('module.exports = {};\\n' * 200)
+    with open('package.json') as f:
+        package = json.load(f)
+    package['dependencies'] = {'tailwindcss': '^3.4.17'}
+    with open('package.json', 'w') as f:
+        f.write(json.dumps(package, indent=2) + "\\n")
+    with open('package-lock.json', 'w') as f:
+        f.write(json.dumps({'name': package['name'], 'lockfileVersion': 3,
+                            'packages': {'': {'name': package['name'], 'dependencies': package['dependencies']}}}, indent=2) + "\\n")
+elif ARGS[:2] == ['run', 'build']:
+    os.makedirs(os.path.join('static', 'css'), exist_ok=True)
+    with open(os.path.join('static', 'css', 'output.css'), 'w') as f:
+        f.write('*,:after,:before{box-sizing:border-box}\\n')
+'''),
+    'npx': ([], '''
+if ARGS[:1] == ['--version']:
+    print("10.8.0")
+elif ARGS[:2] == ['tailwindcss', 'init']:
+    with open('tailwind.config.js', 'w') as f:
+        f.write("/** @type {import('tailwindcss').Config} */\\nmodule.exports = {\\n  content: [],\\n  theme: {\\n    extend: {},\\n  },\\n  plugins: [],\\n}\\n\\n")
+'''),
+}
+
+# Minimal stand-in for the Django package uv would install: just enough for the template engine.
+FAKE_DJANGO_FILES = {
+    '__init__.py': 'VERSION = (5, 1, 3, "final", 0)\n',
+    'conf/project_template/manage.py-tpl': (
+        "#!/usr/bin/env python\nimport os\nimport sys\n\n\ndef main():\n"
+        "    os.environ.setdefault('DJANGO_SETTINGS_MODULE', '{{ project_name }}.settings')\n"
+        "    from django.core.management import execute_from_command_line\n"
+        "    execute_from_command_line(sys.argv)\n\n\nif __name__ == '__main__':\n    main()\n"),
+    'conf/project_template/project_name/__init__.py-tpl': '',
+    'conf/project_template/project_name/settings.py-tpl': (
+        '"""\nDjango settings for {{ project_name }} project.\n\nGenerated using Django {{ django_version }}.\n"""\n\n'
+        "from pathlib import Path\n\nBASE_DIR = Path(__file__).resolve().parent.parent\n\n"
+        "SECRET_KEY = '{{ secret_key }}'\n\nDEBUG = True\n\nALLOWED_HOSTS = []\n\n"
+        "INSTALLED_APPS = [\n    'django.contrib.admin',\n    'django.contrib.auth',\n"
+        "    'django.contrib.contenttypes',\n    'django.contrib.sessions',\n"
+        "    'django.contrib.messages',\n    'django.contrib.staticfiles',\n]\n\n"
+        "ROOT_URLCONF = '{{ project_name }}.urls'\n\n"
+        "TEMPLATES = [\n    {\n        'BACKEND': 'django.template.backends.django.DjangoTemplates',\n"
+        "        'DIRS': [],\n        'APP_DIRS': True,\n        'OPTIONS': {\n            'context_processors': [\n"
+        "                'django.template.context_processors.request',\n            ],\n        },\n    },\n]\n\n"
+        "WSGI_APPLICATION = '{{ project_name }}.wsgi.application'\n\n"
+        "DATABASES = {\n    'default': {\n        'ENGINE': 'django.db.backends.sqlite3',\n"
+        "        'NAME': BASE_DIR / 'db.sqlite3',\n    }\n}\n\n"
+        "STATIC_URL = 'static/'\n\nDEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'\n"),
+    'conf/project_template/project_name/urls.py-tpl': (
+        '"""\nURL configuration for {{ project_name }} project.\n"""\n'
+        "from django.contrib import admin\nfrom django.urls import path\n\n"
+        "urlpatterns = [\n    path('admin/', admin.site.urls),\n]\n"),
+    'conf/project_template/project_name/wsgi.py-tpl': (
+        "import os\n\nfrom django.core.wsgi import get_wsgi_application\n\n"
+        "os.environ.setdefault('DJANGO_SETTINGS_MODULE', '{{ project_name }}.settings')\n\n"
+        "application = get_wsgi_application()\n"),
+    'conf/project_template/project_name/asgi.py-tpl': (
+        "import os\n\nfrom django.core.asgi import get_asgi_application\n\n"
+        "os.environ.setdefault('DJANGO_SETTINGS_MODULE', '{{ project_name }}.settings')\n\n"
+        "application = get_asgi_application()\n"),
+    'conf/app_template/__init__.py-tpl': '',
+    'conf/app_template/admin.py-tpl': "from django.contrib import admin\n\n# Register your models here.\n",
+    'conf/app_template/apps.py-tpl': (
+        "from django.apps import AppConfig\n\n\nclass {{ camel_case_app_name }}Config(AppConfig):\n"
+        "    default_auto_field = 'django.db.models.BigAutoField'\n    name = '{{ app_name }}'\n"),
+    'conf/app_template/migrations/__init__.py-tpl': '',
+    'conf/app_template/models.py-tpl': "from django.db import models\n\n# Create your models here.\n",
+    'conf/app_template/tests.py-tpl': "from django.test import TestCase\n\n# Create your tests here.\n",
+    'conf/app_template/views.py-tpl': "from django.shortcuts import render\n\n# Create your views here.\n",
+}
+
+def create_fake_toolchain(root):
+    """Write fake uv/npm/npx/snap/git executables and a fake Django package under ``root``; return the bin dir."""
+    bin_dir = os.path.join(root, "bin")
+    os.makedirs(bin_dir, exist_ok=True)
+    for tool, (network, body) in FAKE_TOOLS.items():
+        path = os.path.join(bin_dir, tool)
+        with open(path, 'w') as f:
+            f.write(f"#!{sys.executable}\n" + FAKE_TOOL_PROLOGUE.format(network=network) + body)
+        os.chmod(path, 0o755)
+
+    django_dir = os.path.join(root, "django")
+    for relative_path, content in FAKE_DJANGO_FILES.items():
+        path = os.path.join(django_dir, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content)
+    return bin_dir, django_dir
+
+def fake_environment(bin_dir, django_dir, cache_dir, latency, network_latency):
+    """Return the environment for running main.py against the fake toolchain.
+
+    The fake git hands repository commands to the real git found on the current PATH, if any, under a fixed identity.
+    """
+    env = dict(os.environ)
+    real_git = env.get('FAKE_REAL_GIT') or shutil.which('git')
+    if real_git and os.path.dirname(real_git) != bin_dir:
+        env['FAKE_REAL_GIT'] = real_git
+    for variable, value in (('GIT_AUTHOR_NAME', 'Benchmark'), ('GIT_AUTHOR_EMAIL', 'benchmark@example.com'),
+                            ('GIT_COMMITTER_NAME', 'Benchmark'), ('GIT_COMMITTER_EMAIL', 'benchmark@example.com')):
+        env.setdefault(variable, value)
+    env.update({
+        'PATH': bin_dir + os.pathsep + env.get('PATH', ''),
+        'DJANGO_SETUP_CACHE_DIR': cache_dir,
+        'FAKE_DJANGO_PACKAGE': django_dir,
+        'FAKE_SCAFFOLDER_DIR': ROOT_DIR,
+        'FAKE_TOOL_LATENCY': str(latency),
+        'FAKE_NETWORK_LATENCY': str(network_latency),
+    })
+    return env
+
+def scaffold(env, directory, extra_args=()):
+    """Run one single-project scaffold through main.py and return its wall time in seconds."""
+    command = [sys.executable, os.path.join(ROOT_DIR, "main.py"), PROJECT_NAME, APP_NAME,
+               "--directory", directory, *extra_args]
+    start = time.perf_counter()
+    result = subprocess.run(command, input="y\n", env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"Scaffold failed ({result.returncode}):\n{result.stdout[-2000:]}")
+    return elapsed
+
+def scaffold_batch(env, workdir, projects, extra_args=()):
+    """Run a manifest of ``projects`` sites through main.py and return its wall time in seconds."""
+    manifest_path = os.path.join(workdir, "projects.toml")
+    with open(manifest_path, 'w') as f:
+        f.write("[defaults]\ntailwind = true\n\n")
+        for i in range(projects):
+            f.write(f'[[project]]\nname = "site_{i}"\napp = "app_{i}"\ndirectory = "sites/site_{i}"\n\n')
+
+    command = [sys.executable, os.path.join(ROOT_DIR, "main.py"), "--manifest", manifest_path, *extra_args]
+    start = time.perf_counter()
+    result = subprocess.run(command, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"Batch scaffold failed ({result.returncode}):\n{result.stdout[-2000:]}")
+    return elapsed
+
+def summarize(runs):
+    return {'runs': [round(r, 4) for r in runs], 'median': round(statistics.median(runs), 4), 'min': round(min(runs), 4)}
+
+def run_fake_benchmarks(repeat, batch_size, latency, network_latency):
+    """Measure cold start, warm cache and batch throughput against the fake toolchain."""
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="django-setup-bench-") as root:
+        bin_dir, django_dir = create_fake_toolchain(root)
+
+        def env_for(cache_dir):
+            return fake_environment(bin_dir, django_dir, cache_dir, latency, network_latency)
+
+        cold, warm, batch = [], [], []
+        for i in range(repeat):
+            run_dir = os.path.join(root, f"run_{i}")
+            cache_dir = os.path.join(run_dir, "cache")
+            env = env_for(cache_dir)
+
+            # Cold: empty caches, so the snapshot is built from the (fake) toolchain.
+            cold.append(scaffold(env, os.path.join(run_dir, "cold_site"), ["--snapshot-cache"]))
+            # Warm: same cache, fresh target, so the snapshot is materialized.
+            warm.append(scaffold(env, os.path.join(run_dir, "warm_site"), ["--snapshot-cache"]))
+            # Batch: a fresh cache shared by every project in the manifest.
+            batch_dir = os.path.join(run_dir, "batch")
+            os.makedirs(batch_dir)
+            batch.append(scaffold_batch(env_for(os.path.join(batch_dir, "cache")), batch_dir, batch_size,
+                                        ["--snapshot-cache"]))
+
+        results['cold_start'] = summarize(cold)
+        results['warm_cache'] = summarize(warm)
+        results['batch'] = summarize(batch)
+        results['batch']['projects'] = batch_size
+        results['batch']['throughput'] = round(batch_size / statistics.median(batch), 3)
+    return results
+
+def real_toolchain_cache_available():
+    """Return True when uv and npm are installed and uv already has a populated cache."""
+    if not (shutil.which("uv") and shutil.which("npm")):
+        return False
+    try:
+        cache_dir = subprocess.run(["uv", "cache", "dir"], check=True, stdout=subprocess.PIPE, text=True).stdout.strip()
+    except (subprocess.CalledProcessError, OSError):
+        return False
+    return os.path.isdir(cache_dir) and bool(os.listdir(cache_dir))
+
+def run_real_benchmarks(repeat):
+    """Measure cold start and warm cache against the real toolchain, relying on uv's populated cache."""
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="django-setup-bench-real-") as root:
+        cold, warm = [], []
+        for i in range(repeat):
+            run_dir = os.path.join(root, f"run_{i}")
+            env = dict(os.environ, DJANGO_SETUP_CACHE_DIR=os.path.join(run_dir, "cache"))
+            cold.append(scaffold(env, os.path.join(run_dir, "cold_site"), ["--snapshot-cache"]))
+            warm.append(scaffold(env, os.path.join(run_dir, "warm_site"), ["--snapshot-cache"]))
+        results['cold_start'] = summarize(cold)
+        results['warm_cache'] = summarize(warm)
+    return results
+
+def current_commit():
+    """Return (commit, dirty) for the working tree, or ('unknown', True) outside a git checkout."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, check=True,
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT_DIR, check=True,
+                                stdout=subprocess.PIPE, text=True).stdout.strip()
+    except (subprocess.CalledProcessError, OSError):
+        return "unknown", True
+    return commit, bool(status)
+
+def load_baseline(commit, current):
+    """Load the results for ``commit``, or the most recent stored results of another commit."""
+    if commit:
+        path = os.path.join(RESULTS_DIR, f"{commit}.json")
+        if not os.path.exists(path):
+            print(f"No stored results for {commit}.")
+            return None
+    else:
+        candidates = [p for p in glob.glob(os.path.join(RESULTS_DIR, "*.json"))
+                      if not os.path.basename(p).startswith(current)]
+        if not candidates:
+            return None
+        path = max(candidates, key=os.path.getmtime)
+
+    with open(path) as f:
+        return json.load(f)
+
+def compare(results, baseline, threshold):
+    """Print each scenario against the baseline and return the names of regressed scenarios."""
+    regressions = []
+    print(f"\nCompared with {baseline['commit']}:")
+    for suite in ('fake', 'real'):
+        for name, current in results.get(suite, {}).items():
+            previous = baseline.get(suite, {}).get(name)
+            if not previous:
+                continue
+            change = current['median'] / previous['median'] - 1
+            flag = "REGRESSION" if change > threshold else "ok"
+            print(f"  {suite}/{name:<12} {previous['median']:8.3f}s -> {current['median']:8.3f}s  {change:+7.1%}  {flag}")
+            if change > threshold:
+                regressions.append(f"{suite}/{name}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scaffolder against fake (and optionally real) toolchains.")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs per scenario; the median is reported")
+    parser.add_argument('--batch-size', type=int, default=8, help="Projects in the batch throughput scenario")
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds each fake tool invocation sleeps")
+    parser.add_argument('--network-latency', type=float, default=0.0, help="Extra seconds for fake network-bound commands")
+    parser.add_argument('--real', action='store_true', help="Also benchmark the real toolchain when its cache is available")
+    parser.add_argument('--baseline', help="Commit to compare against (default: most recent stored results)")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD, help="Slowdown fraction flagged as a regression")
+    parser.add_argument('--no-save', action='store_true', help="Do not store the results for this commit")
+    args = parser.parse_args()
+
+    commit, dirty = current_commit()
+    results = {
+        'commit': commit,
+        'dirty': dirty,
+        'timestamp': time.time(),
+        'python': sys.version.split()[0],
+        'settings': {'repeat': args.repeat, 'batch_size': args.batch_size,
+                     'latency': args.latency, 'network_latency': args.network_latency},
+        'fake': run_fake_benchmarks(args.repeat, args.batch_size, args.latency, args.network_latency),
+    }
+    if args.real:
+        if real_toolchain_cache_available():
+            results['real'] = run_real_benchmarks(args.repeat)
+        else:
+            print("Skipping real-toolchain benchmarks: uv/npm missing or uv cache is empty.")
+
+    for suite in ('fake', 'real'):
+        for name, scenario in results.get(suite, {}).items():
+            extra = f"  ({scenario['throughput']} projects/s)" if 'throughput' in scenario else ""
+            print(f"{suite}/{name:<12} median {scenario['median']:.3f}s  min {scenario['min']:.3f}s{extra}")
+
+    regressions = []
+    baseline = load_baseline(args.baseline, commit)
+    if baseline:
+        regressions = compare(results, baseline, args.threshold)
+
+    if not args.no_save:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{commit}{'-dirty' if dirty else ''}.json")
+        with open(path, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved results to {path}")
+
+    sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+import asyncio
+import atexit
+import codecs
+import os
+import queue
+import random
+import signal
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from trace_recorder import TraceRecorder
+
+class CommandTimeout(subprocess.CalledProcessError):
+    """Raised by ``CommandRunner.run`` when a command was killed for exceeding its timeout."""
+
+    def __init__(self, returncode, cmd, timeout):
+        super().__init__(returncode, cmd)
+        self.timeout = timeout
+
+    def __str__(self):
+        return f"Command '{self.cmd}' timed out after {self.timeout:g}s."
+
+class StepOutput:
+    """A ``sys.stdout`` wrapper that writes whole lines, each prefixed with the step that printed it.
+
+    Steps run on several threads at once. Each thread's partial line is buffered until it ends,
+    and complete lines are written under one lock, so concurrent steps never garble each other's
+    lines. Output printed outside a step passes through unchanged.
+    """
+
+    _install_lock = threading.Lock()
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def install():
+        """Wrap ``sys.stdout`` unless it already is wrapped."""
+        with StepOutput._install_lock:
+            if not isinstance(sys.stdout, StepOutput):
+                sys.stdout = StepOutput(sys.stdout)
+
+    @staticmethod
+    def end_line():
+        """Write out the calling thread's unfinished line, if any, e.g. when its step ends."""
+        if isinstance(sys.stdout, StepOutput):
+            sys.stdout._emit(None, '')
+
+    @staticmethod
+    def prefix(span):
+        if CommandRunner.show_project and span.project:
+            return f"[{span.project}:{span.name}] "
+        return f"[{span.name}] "
+
+    def write(self, text):
+        span = TraceRecorder.current()
+        if span is None and getattr(self._local, 'span', None) is None:
+            return self.stream.write(text)
+        self._emit(span, text)
+        return len(text)
+
+    def _emit(self, span, text):
+        buffered_span = getattr(self._local, 'span', None)
+        partial = getattr(self._local, 'partial', '')
+        out = ''
+        if partial and buffered_span is not span:
+            # The thread moved on to another step, or out of steps; finish the old step's line first.
+            out = f"{StepOutput.prefix(buffered_span)}{partial}\n"
+            partial = ''
+        if span is None:
+            out += text
+        else:
+            lines = (partial + text).split('\n')
+            partial = lines.pop()
+            out += ''.join(f"{StepOutput.prefix(span)}{line}\n" for line in lines)
+        self._local.span, self._local.partial = (span, partial) if partial else (None, '')
+        if out:
+            with self._lock:
+                self.stream.write(out)
+
+    def flush(self):
+        self.stream.flush()
+
+    def isatty(self):
+        return self.stream.isatty()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+class CommandRunner:
+    """Runs external commands for scaffold steps and reports their exit code and CPU time to the trace.
+
+    Commands from every thread run on one shared asyncio loop, which relays their output, enforces
+    timeouts, caps how many run at once and retries network commands with backoff. Callers still
+    block until their command is done, so steps keep their sequential code.
+    """
+
+    # Seconds before a command is stopped; 0 disables the limit. Set from --command-timeout.
+    timeout = 900
+    # Commands allowed to run at the same time across all steps and projects.
+    max_concurrent = os.cpu_count() or 4
+    # Extra attempts for commands that fail because of the network, and the first delay between them.
+    network_retries = 2
+    backoff = 2.0
+    # Prefix output with the project as well as the step, for batches whose output interleaves.
+    show_project = False
+    # Seconds between SIGTERM and SIGKILL for a command that timed out, and to drain output after it exits.
+    KILL_GRACE = 5.0
+    DRAIN_GRACE = 1.0
+
+    _loop = None
+    _semaphore = None
+    _reaper = None
+    # Process groups of the commands running now, stopped if the process exits first.
+    _groups = set()
+    _loop_lock = threading.Lock()
+
+    @staticmethod
+    def run(args, cwd=None, check=True, env=None, timeout=None, retries=0, interactive=False):
+        """Run ``args`` like ``subprocess.run`` and return a CompletedProcess, printing its output prefixed with the step.
+
+        ``timeout`` overrides ``CommandRunner.timeout``; ``retries`` reruns a failed or timed-out command with
+        exponential backoff, so only pass it for idempotent commands. ``check`` raises CalledProcessError, or
+        CommandTimeout, once no attempt is left. Only ``interactive`` commands, such as ``sudo`` installs the
+        user just confirmed, may read the terminal; the rest get no stdin.
+        """
+        returncode, timed_out, _ = CommandRunner._submit(args, cwd, env, timeout, retries, interactive)
+        if check and timed_out:
+            raise CommandTimeout(returncode, args, timed_out)
+        if check and returncode:
+            raise subprocess.CalledProcessError(returncode, args)
+        return subprocess.CompletedProcess(args, returncode)
+
+    @staticmethod
+    def capture(args, input=None, cwd=None, check=True, env=None, timeout=None, merge_stderr=False):
+        """Run ``args`` feeding it ``input`` (bytes, or an iterable of bytes chunks) and return a CompletedProcess with its stdout.
+
+        stderr is printed like ``run`` output, or returned with stdout when ``merge_stderr`` is set.
+        """
+        returncode, timed_out, stdout = CommandRunner._submit(args, cwd, env, timeout, 0, False,
+                                                              input=input, capture='merged' if merge_stderr else 'stdout')
+        if check and timed_out:
+            raise CommandTimeout(returncode, args, timed_out)
+        if check and returncode:
+            raise subprocess.CalledProcessError(returncode, args, stdout)
+        return subprocess.CompletedProcess(args, returncode, stdout)
+
+    @staticmethod
+    def _submit(args, cwd, env, timeout, retries, interactive, input=None, capture=None):
+        """Run the command on the shared loop and relay its events; return ``(returncode, timeout_hit, stdout)``.
+
+        ``timeout_hit`` is the timeout that stopped the last attempt, or None.
+        """
+        timeout = CommandRunner.timeout if timeout is None else timeout
+        chunks = [input] if isinstance(input, bytes) else input
+        events = queue.SimpleQueue()
+        future = asyncio.run_coroutine_threadsafe(
+            CommandRunner._run(list(args), cwd, env, timeout or None, retries, interactive, chunks, capture, events.put),
+            CommandRunner._event_loop())
+
+        # Output is written from the calling thread, where the step's trace span and stdout routing apply;
+        # StepOutput prefixes it with the step, and commands run outside steps are labelled here.
+        StepOutput.install()
+        prefix = '' if TraceRecorder.current() else f"[{os.path.basename(str(args[0]))}] "
+        partial = ''
+        while True:
+            event = events.get()
+            if event is None:
+                break
+            kind, value = event
+            if kind == 'output':
+                lines = (partial + value).split('\n')
+                partial = lines.pop()
+                if lines:
+                    sys.stdout.write(''.join(f"{prefix}{line}\n" for line in lines))
+            elif kind == 'exit':
+                TraceRecorder.record_command(*value)
+            else:
+                print(f"{prefix}{value}")
+        if partial:
+            sys.stdout.write(f"{prefix}{partial}\n")
+        sys.stdout.flush()
+
+        returncode, timed_out, stdout = future.result()
+        return returncode, timeout if timed_out else None, stdout
+
+    @staticmethod
+    def _event_loop():
+        """Start the shared loop on its own thread on first use."""
+        with CommandRunner._loop_lock:
+            if CommandRunner._loop is None:
+                loop = asyncio.new_event_loop()
+                CommandRunner._semaphore = asyncio.Semaphore(CommandRunner.max_concurrent)
+                # One reaper thread per command that may run, so a timeout never fires while a reap is still queued.
+                CommandRunner._reaper = ThreadPoolExecutor(max_workers=CommandRunner.max_concurrent, thread_name_prefix='command-reaper')
+                threading.Thread(target=loop.run_forever, name='command-runner', daemon=True).start()
+                # Commands run in their own sessions, which Ctrl-C at the terminal does not reach.
+                atexit.register(CommandRunner._stop_running)
+                CommandRunner._loop = loop
+            return CommandRunner._loop
+
+    @staticmethod
+    async def _run(args, cwd, env, timeout, retries, interactive, chunks, capture, report):
+        """Run up to ``retries + 1`` attempts; return ``(returncode, timed_out, stdout)`` of the last one."""
+        try:
+            for attempt in range(retries + 1):
+                async with CommandRunner._semaphore:
+                    returncode, child_cpu_time, timed_out, stdout = await CommandRunner._attempt(
+                        args, cwd, env, timeout, interactive, chunks, capture, report)
+                report(('exit', (returncode, child_cpu_time)))
+                reason = f"timed out after {timeout:g}s" if timed_out else f"failed with exit code {returncode}"
+                if returncode == 0 or attempt == retries:
+                    if timed_out:
+                        report(('note', f"'{' '.join(map(str, args))}' {reason} and was stopped."))
+                    return returncode, timed_out, stdout
+                delay = CommandRunner.backoff * 2 ** attempt * random.uniform(1.0, 1.5)
+                report(('note', f"'{' '.join(map(str, args))}' {reason}; retrying in {delay:.1f}s "
+                                f"(retry {attempt + 1} of {retries})."))
+                await asyncio.sleep(delay)
+        finally:
+            report(None)
+
+    @staticmethod
+    async def _attempt(args, cwd, env, timeout, interactive, chunks, capture, report):
+        loop = asyncio.get_running_loop()
+        if chunks is not None:
+            stdin = subprocess.PIPE
+        else:
+            stdin = None if interactive else subprocess.DEVNULL
+        # Everything but interactive commands gets its own session, so a timeout stops the whole process tree
+        # (npm and uv workers, the shells of npm scripts). sudo needs the terminal, and it forwards signals itself.
+        process = subprocess.Popen(args, cwd=cwd, env=env, stdin=stdin, stdout=subprocess.PIPE,
+                                   stderr=subprocess.STDOUT if capture in (None, 'merged') else subprocess.PIPE,
+                                   start_new_session=not interactive)
+        group = not interactive
+        if group:
+            CommandRunner._groups.add(process.pid)
+
+        readers = []
+        relay_pipe = process.stderr if capture == 'stdout' else (None if capture == 'merged' else process.stdout)
+        if relay_pipe is not None:
+            readers.append(await CommandRunner._read_pipe(loop, relay_pipe, lambda text: report(('output', text))))
+        captured = []
+        if capture is not None:
+            readers.append(await CommandRunner._read_pipe(loop, process.stdout, captured.append, decode=False))
+        if chunks is not None:
+            threading.Thread(target=CommandRunner._feed, args=(process.stdin, chunks), daemon=True).start()
+        reaped = loop.run_in_executor(CommandRunner._reaper, CommandRunner._reap, process)
+
+        timed_out = False
+        try:
+            child_cpu_time = await asyncio.wait_for(asyncio.shield(reaped), timeout)
+        except TimeoutError:
+            timed_out = True
+            CommandRunner._signal(process, signal.SIGTERM, group)
+            try:
+                child_cpu_time = await asyncio.wait_for(asyncio.shield(reaped), CommandRunner.KILL_GRACE)
+            except TimeoutError:
+                CommandRunner._signal(process, signal.SIGKILL, group)
+                child_cpu_time = await reaped
+            # Members of the group that ignored SIGTERM would keep the pipes open.
+            CommandRunner._signal(process, signal.SIGKILL, group)
+        finally:
+            CommandRunner._groups.discard(process.pid)
+
+        # Background processes the command started may keep the pipes open; stop reading after a grace period.
+        tasks = [task for task, _ in readers]
+        if tasks:
+            await asyncio.wait(tasks, timeout=CommandRunner.DRAIN_GRACE)
+        for task, transport in readers:
+            task.cancel()
+            transport.close()
+        stdout = b''.join(captured) if capture is not None else None
+        return process.returncode, child_cpu_time, timed_out, stdout
+
+    @staticmethod
+    async def _read_pipe(loop, pipe, deliver, decode=True):
+        """Start relaying ``pipe`` to ``deliver``, as text when ``decode`` is set; return ``(task, transport)``."""
+        reader = asyncio.StreamReader()
+        transport, _ = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), pipe)
+        return asyncio.ensure_future(CommandRunner._relay(reader, deliver, decode)), transport
+
+    @staticmethod
+    async def _relay(reader, deliver, decode):
+        # Incremental, so a character split across two reads still decodes.
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='surrogateescape') if decode else None
+        while True:
+            chunk = await reader.read(65536)
+            data = decoder.decode(chunk, final=not chunk) if decoder else chunk
+            if data:
+                deliver(data)
+            if not chunk:
+                return
+
+    @staticmethod
+    def _feed(pipe, chunks):
+        """Write ``chunks`` to the command's stdin from a plain thread, so the loop never blocks on it."""
+        try:
+            for chunk in chunks:
+                pipe.write(chunk)
+        except BrokenPipeError:
+            pass  # the command exited early; its exit code says why
+        finally:
+            try:
+                pipe.close()
+            except BrokenPipeError:
+                pass
+
+    @staticmethod
+    def _signal(process, signum, group):
+        # os.kill/killpg rather than Popen.send_signal, which polls and could reap the child under the reaper thread.
+        try:
+            if group:
+                os.killpg(process.pid, signum)
+            else:
+                os.kill(process.pid, signum)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    @staticmethod
+    def _stop_running():
+        for pgid in list(CommandRunner._groups):
+            try:
+                os.killpg(pgid, signal.SIGTERM)
+            except (ProcessLookupError, PermissionError):
+                pass
+
+    @staticmethod
+    def _reap(process):
+        """Wait for ``process``, set its returncode and return its CPU time."""
+        try:
+            # wait4 reaps the child and reports its own resource usage, unlike process-wide RUSAGE_CHILDREN.
+            _, status, usage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+            return usage.ru_utime + usage.ru_stime
+        except (AttributeError, ChildProcessError):
+            process.wait()
+            return 0.0
@@ -1,26 +1,160 @@
+import json
 import os
+import shutil
 import sys
+import threading
+from generation_journal import GenerationJournal
+from trace_recorder import TraceRecorder
 
 class DirectoryManager:
     """Handles directory-related operations."""
-    
+
+    disallowed_names = {'test', 'django', 'site', 'admin', 'main', 'manage', 'static', 'templates', 'media'}
+
     @staticmethod
     def prompt_for_directory():
         """Prompt user for the installation directory and ensure it is correctly returned."""
-        disallowed_names = {'test', 'django', 'site', 'admin', 'main', 'manage', 'static', 'templates', 'media'}
-        
         while True:
             directory = input("Enter the installation directory (relative or absolute path) for your Django project: ").strip()
-            directory = os.path.abspath(directory)  # Ensure we get an absolute path
-            directory_name = os.path.basename(directory)
+            try:
+                return DirectoryManager.prepare_directory(directory)
+            except ValueError as e:
+                print(e)
+            except Exception as e:
+                print(f"Error creating or accessing the directory: {e}")
+
+    @staticmethod
+    def validate_directory(directory):
+        """Return the absolute installation path, raising ValueError if its name is reserved."""
+        directory = os.path.abspath(directory)  # Ensure we get an absolute path
+        directory_name = os.path.basename(directory)
+
+        if directory_name.lower() in DirectoryManager.disallowed_names:
+            raise ValueError(f"The directory name '{directory_name}' is reserved. Please choose another name.")
+        return directory
+
+    @staticmethod
+    def prepare_directory(directory):
+        """Validate and create the installation directory, returning its absolute path without changing into it."""
+        directory = DirectoryManager.validate_directory(directory)
+        os.makedirs(directory, exist_ok=True)
+        print(f"Using installation directory {directory}")
+        return directory
+
+    @staticmethod
+    def cache_directory(*parts):
+        """Return (and create) a directory under the tool's local cache root.
+
+        The root is ``$DJANGO_SETUP_CACHE_DIR`` if set, otherwise ``$XDG_CACHE_HOME/django-setup``
+        (defaulting to ``~/.cache/django-setup``).
+        """
+        root = os.environ.get('DJANGO_SETUP_CACHE_DIR')
+        if not root:
+            xdg_cache = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+            root = os.path.join(xdg_cache, 'django-setup')
+        path = os.path.join(root, *parts)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    @staticmethod
+    def link_tree(source, target):
+        """Hardlink every file of ``source`` into ``target``, falling back to copying across filesystems.
+
+        Entries of an earlier link into ``target`` that still match are kept; differing ones are replaced.
+        """
+        def link(src, dst):
+            try:
+                os.link(src, dst)
+            except OSError:
+                shutil.copy2(src, dst)
+
+        def linked_already(directory, names):
+            destination = os.path.join(target, os.path.relpath(directory, source))
+            skip = set()
+            for name in names:
+                src, dst = os.path.join(directory, name), os.path.join(destination, name)
+                if not os.path.lexists(dst) or (os.path.isdir(src) and not os.path.islink(src)):
+                    continue
+                if os.path.islink(src):
+                    same = os.path.islink(dst) and os.readlink(dst) == os.readlink(src)
+                else:
+                    same = not os.path.islink(dst) and os.path.samefile(src, dst)
+                if same:
+                    skip.add(name)
+                else:
+                    os.remove(dst)
+            return skip
 
-            if directory_name.lower() in disallowed_names:
-                print(f"The directory name '{directory_name}' is reserved. Please choose another name.")
-            else:
+        shutil.copytree(source, target, symlinks=True, copy_function=link, ignore=linked_already, dirs_exist_ok=True)
+
+    @staticmethod
+    def tree_size(path):
+        """Return the total size in bytes of the files under ``path``."""
+        total = 0
+        for root, _, files in os.walk(path):
+            for name in files:
                 try:
-                    os.makedirs(directory, exist_ok=True)
-                    os.chdir(directory)
-                    print(f"Changed directory to {directory}")
-                    return directory  # Return the directory path after changing into it
-                except Exception as e:
-                    print(f"Error creating or accessing the directory: {e}")
+                    total += os.lstat(os.path.join(root, name)).st_size
+                except OSError:
+                    pass
+        return total
+
+    @staticmethod
+    def write_file(path, content, merge=False):
+        """Atomically write a generated text file, unless the project's journal says to keep the existing one.
+
+        Pass ``merge`` when ``content`` extends the file's current content rather than replacing it.
+        Returns True if the file was written.
+        """
+        data = content.encode('utf-8')
+        journal = GenerationJournal.for_path(path)
+        if journal is not None:
+            reason = journal.check(path, data, merge)
+            if reason is not None:
+                if reason != 'unchanged':
+                    print(journal.describe(path, reason))
+                return False
+
+        created = not os.path.exists(path)
+        DirectoryManager.replace_file(path, data)
+        TraceRecorder.record_write(len(data), created)
+        if journal is not None:
+            journal.record_file(path, data)
+        return True
+
+    @staticmethod
+    def replace_file(path, data, mode=None):
+        """Write ``data`` (bytes, or an iterable of bytes chunks) to a temporary file and rename it over ``path``.
+
+        Other threads and processes reading ``path`` see either the old or the new file, never a partial one.
+        If writing fails, including an exception raised by the chunk iterable, ``path`` is left untouched.
+        """
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                for chunk in [data] if isinstance(data, bytes) else data:
+                    f.write(chunk)
+            if mode is not None:
+                os.chmod(temp_path, mode)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+    @staticmethod
+    def write_json(path, data, indent=None, sort_keys=False):
+        """Atomically replace ``path`` with ``data`` serialized as JSON."""
+        DirectoryManager.replace_file(path, json.dumps(data, indent=indent, sort_keys=sort_keys).encode())
+
+    @staticmethod
+    def write_files(files):
+        """Write many ``(path, content)`` pairs in one pass, creating each parent directory once.
+
+        Returns the paths that were written.
+        """
+        for parent in sorted({os.path.dirname(path) for path, _ in files}):
+            os.makedirs(parent, exist_ok=True)
+        return [path for path, content in files if DirectoryManager.write_file(path, content)]
@@ -1,155 +1,375 @@
 import os
+import re
+import shutil
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from command_runner import CommandRunner
+from directory_manager import DirectoryManager
+from node_store import NodeModulesStore
+from django_template_engine import DjangoTemplateEngine, TemplateEngineUnavailable
+from template_pack import TemplatePack
+from trace_recorder import TraceRecorder
 
 class DjangoProjectManager:
     """Manages the creation of Django projects and apps."""
 
+    # Rendered as the site pack's [[ tailwind_stylesheet ]], so only projects that build output.css link it.
+    TAILWIND_STYLESHEET = '    <link rel="stylesheet" href="{% static \'css/output.css\' %}">\n'
+    # URL paths, relative to each app, of the pages the default template pack routes.
+    LOAD_TEST_PAGES = ('', 'about/', 'contact/', 'privacy/', 'portfolio/')
+
     @staticmethod
-    def create_django_project(project_name, app_name=None):
-        """Create a Django project and optionally an app."""
-        try:
-            # Start Django project
-            subprocess.run(['uv', 'run', 'django-admin', 'startproject', project_name, '.'], check=True)
-            print(f"Django project '{project_name}' created successfully.")
+    def create_django_project(directory, project_name, app_names=(), in_process=True, template_pack='default', max_workers=4,
+                              tailwind=False):
+        """Create a Django project and its apps in the given directory, wired into settings and the root urlconf."""
+        DjangoProjectManager.start_project_and_apps(directory, project_name, app_names, in_process, max_workers)
 
-            # Create Django app if specified
-            if app_name:
-                manage_py_path = 'manage.py'
-                subprocess.run(['uv', 'run', 'python', manage_py_path, 'startapp', app_name], check=True)
-                print(f"Django app '{app_name}' created successfully.")
+        # Create additional folders and files
+        DjangoProjectManager.create_additional_folders(directory, app_names, project_name, template_pack, max_workers, tailwind)
+        DjangoProjectManager.register_apps(directory, project_name, app_names)
 
-            # Create additional folders and files
-            DjangoProjectManager.create_additional_folders(app_name)
+    @staticmethod
+    def start_project_and_apps(directory, project_name, app_names, in_process=True, max_workers=4):
+        """Create the Django project skeleton and its apps, in-process when possible."""
+        try:
+            if in_process:
+                DjangoProjectManager.render_django_templates(directory, project_name, app_names, max_workers)
+            else:
+                DjangoProjectManager.run_django_admin(directory, project_name, app_names)
         except subprocess.CalledProcessError as e:
             print(f"Failed to create Django project or app: {str(e)}")
             sys.exit(1)
 
     @staticmethod
-    def create_additional_folders(app_name):
+    def render_django_templates(directory, project_name, app_names, max_workers=4):
+        """Render the project and app templates in-process, falling back to django-admin for whatever it cannot do."""
+        django_dir = DjangoTemplateEngine.locate_django(directory)
+        if not django_dir:
+            print("Django not found in the project environment; using django-admin.")
+            DjangoProjectManager.run_django_admin(directory, project_name, app_names)
+            return
+
+        try:
+            DjangoTemplateEngine.start_project(directory, project_name, django_dir)
+            print(f"Django project '{project_name}' created successfully.")
+        except TemplateEngineUnavailable as e:
+            print(f"Falling back to django-admin: {e}")
+            DjangoProjectManager.run_django_admin(directory, project_name, app_names)
+            return
+
+        try:
+            DjangoTemplateEngine.start_apps(directory, app_names, django_dir, max_workers)
+            for app_name in app_names:
+                print(f"Django app '{app_name}' created successfully.")
+        except TemplateEngineUnavailable as e:
+            print(f"Falling back to manage.py startapp: {e}")
+            DjangoProjectManager.run_django_admin(directory, None, app_names)
+
+    @staticmethod
+    def run_django_admin(directory, project_name, app_names):
+        """Create the project (unless ``project_name`` is None) and apps by running django-admin and manage.py through uv."""
+        if project_name:
+            # Start Django project
+            CommandRunner.run(['uv', 'run', 'django-admin', 'startproject', project_name, '.'], check=True, cwd=directory)
+            print(f"Django project '{project_name}' created successfully.")
+
+        # Create Django apps if specified
+        manage_py_path = 'manage.py'
+        for app_name in app_names:
+            CommandRunner.run(['uv', 'run', 'python', manage_py_path, 'startapp', app_name], check=True, cwd=directory)
+            print(f"Django app '{app_name}' created successfully.")
+
+    @staticmethod
+    def create_additional_folders(directory, app_names, project_name=None, template_pack='default', max_workers=4, tailwind=False):
         """Create templates, static folders, initial files, and environment files in the installation directory."""
-        os.makedirs("templates/partials", exist_ok=True)
-        os.makedirs("static/css", exist_ok=True)
-        os.makedirs("static/js", exist_ok=True)
-        os.makedirs("static/img", exist_ok=True)
-
-        # Create base.html file with boilerplate content
-        with open("templates/base.html", 'w') as f:
-            f.write("""{% load static %}
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{% block title %}Home{% endblock title %}</title>
-    <meta name="description" content="{% block description %}Home Page{% endblock description %}">
-    <link rel="stylesheet" href="{% static 'css/output.css' %}">
-    <link rel="stylesheet" href="{% static 'css/style.css' %}">
-</head>
-<body>
-    {% block content %}{% endblock content %}
-</body>
-</html>""")
-            print("Created base.html in templates directory.")
-
-        # Create HTML files in app's templates directory if app is specified
-        if app_name:
-            app_template_path = f"{app_name}/templates/{app_name}"
-            os.makedirs(app_template_path, exist_ok=True)
-            html_files = {
-                "index.html": "{% extends 'base.html' %}\n{% block title %}Index{% endblock title %}\n{% block content %}Index Page{% endblock content %}",
-                "about.html": "{% extends 'base.html' %}\n{% block title %}About{% endblock title %}\n{% block content %}About Page{% endblock content %}",
-                "contact.html": "{% extends 'base.html' %}\n{% block title %}Contact{% endblock title %}\n{% block content %}Contact Page{% endblock content %}",
-                "privacy.html": "{% extends 'base.html' %}\n{% block title %}Privacy{% endblock title %}\n{% block content %}Privacy Policy{% endblock content %}",
-                "portfolio.html": "{% extends 'base.html' %}\n{% block title %}Portfolio{% endblock title %}\n{% block content %}Portfolio Page{% endblock content %}",
-            }
-
-            for filename, content in html_files.items():
-                with open(f"{app_template_path}/{filename}", 'w') as f:
-                    f.write(content)
-                    print(f"Created {filename} in {app_template_path}")
-
-            # Additional app files
-            open(f"{app_name}/urls.py", 'w').write("from django.urls import path\n\nurlpatterns = []\n")
-            open(f"{app_name}/forms.py", 'w').write("from django import forms\n\n# Define your forms here\n")
-            print(f"Additional folders and files created in '{app_name}'")
-
-        # Create .env and .env-template files
-        env_content = (
-            "# Environment variables\n"
-            "DEBUG=True\n"
-            "SECRET_KEY=your-secret-key\n"
-            "DATABASE_URL=your-database-url\n"
-        )
-        with open(".env", 'w') as f:
-            f.write(env_content)
-            print("Created .env in the installation directory.")
+        DjangoProjectManager.create_site_files(directory, project_name, template_pack, tailwind)
+        DjangoProjectManager.create_apps_files(directory, app_names, project_name, template_pack, max_workers)
+
+    @staticmethod
+    def create_site_files(directory, project_name=None, template_pack='default', tailwind=False):
+        """Create the project-wide static folders and render the template pack's site files."""
+        os.makedirs(os.path.join(directory, "templates/partials"), exist_ok=True)
+        os.makedirs(os.path.join(directory, "static/css"), exist_ok=True)
+        os.makedirs(os.path.join(directory, "static/js"), exist_ok=True)
+        os.makedirs(os.path.join(directory, "static/img"), exist_ok=True)
 
-        with open(".env-template", 'w') as f:
-            f.write(env_content)
-            print("Created .env-template in the installation directory.")
+        pack = TemplatePack.get(template_pack)
+        written = pack.write(directory, 'site', DjangoProjectManager.site_context(project_name, tailwind))
+        print(f"Created {len(written)} site files from template pack '{pack.name}'.")
 
     @staticmethod
-    def prompt_tailwind_installation(app_name):
-        """Prompt to install Tailwind CSS and set it up if confirmed."""
-        response = input("Do you want to install Tailwind CSS? [y/n]: ").strip().lower()
-        if response == 'y':
-            DjangoProjectManager.setup_tailwind(app_name)
+    def site_context(project_name=None, tailwind=False):
+        """Return the variables the template pack's site files are rendered with."""
+        return {
+            'project_name': project_name or '',
+            'tailwind_stylesheet': DjangoProjectManager.TAILWIND_STYLESHEET if tailwind else '',
+        }
+
+    @staticmethod
+    def create_app_files(directory, app_name, project_name=None, template_pack='default'):
+        """Render the template pack's app files (page templates, urls.py, forms.py) into an app created by startapp."""
+        pack = TemplatePack.get(template_pack)
+        context = {
+            'project_name': project_name or '',
+            'app_name': app_name,
+            'camel_case_app_name': DjangoTemplateEngine.camel_case(app_name),
+        }
+        written = pack.write(directory, 'app', context)
+        print(f"Created {len(written)} files in '{app_name}' from template pack '{pack.name}'.")
+
+    @staticmethod
+    def create_apps_files(directory, app_names, project_name=None, template_pack='default', max_workers=4):
+        """Render the template pack's app files into every app concurrently."""
+        if len(app_names) <= 1 or max_workers <= 1:
+            for app_name in app_names:
+                DjangoProjectManager.create_app_files(directory, app_name, project_name, template_pack)
+            return
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(app_names))) as pool:
+            create = TraceRecorder.bind(DjangoProjectManager.create_app_files)
+            futures = [pool.submit(create, directory, app_name, project_name, template_pack) for app_name in app_names]
+            for future in futures:
+                future.result()
+
+    @staticmethod
+    def register_apps(directory, project_name, app_names):
+        """Add every app to INSTALLED_APPS and include its urls.py in the root urlconf, rewriting each file once.
+
+        The site's templates directory is added to TEMPLATES' DIRS as well, so the app pages find base.html.
+        """
+        if not app_names:
+            return
+        # Registrations that could not be written, to be done by hand.
+        manual = []
+        settings_path = os.path.join(directory, project_name, "settings.py")
+        with open(settings_path, "r") as f:
+            settings = f.read()
+        original_settings = settings
+        settings = settings.replace("'DIRS': [],", "'DIRS': [BASE_DIR / 'templates'],", 1)
+        match = re.search(r"^INSTALLED_APPS = \[\n(.*?)^\]", settings, re.MULTILINE | re.DOTALL)
+        if not match:
+            print(f"Could not find INSTALLED_APPS in {settings_path}.")
+            manual.append(f"add {', '.join(app_names)} to INSTALLED_APPS in {settings_path}")
         else:
-            DjangoProjectManager.create_style_css()
-            print("Skipping Tailwind CSS installation. Only style.css has been created.")
+            missing = [name for name in app_names if f"'{name}'" not in match.group(1)]
+            if missing:
+                entries = ''.join(f"    '{name}',\n" for name in missing)
+                settings = settings[:match.end(1)] + entries + settings[match.end(1):]
+        if settings != original_settings and not DirectoryManager.write_file(settings_path, settings):
+            manual.append(f"add {', '.join(app_names)} to INSTALLED_APPS and BASE_DIR / 'templates' to TEMPLATES' DIRS in {settings_path}")
+
+        urls_path = os.path.join(directory, project_name, "urls.py")
+        with open(urls_path, "r") as f:
+            urls = f.read()
+        match = re.search(r"^urlpatterns = \[\n(.*?)^\]", urls, re.MULTILINE | re.DOTALL)
+        if not match:
+            print(f"Could not find urlpatterns in {urls_path}.")
+            manual.append(f"include the app urls in {urls_path}")
+        else:
+            missing = [name for name in app_names if f"include('{name}.urls')" not in match.group(1)]
+            if missing:
+                entries = ''.join(f"    path('{name}/', include('{name}.urls')),\n" for name in missing)
+                urls = urls[:match.end(1)] + entries + urls[match.end(1):]
+                urls = urls.replace("from django.urls import path\n", "from django.urls import include, path\n", 1)
+                if not DirectoryManager.write_file(urls_path, urls):
+                    manual.append(f"include {', '.join(f'{name}.urls' for name in missing)} in {urls_path}")
+        if manual:
+            print(f"App registration is incomplete; {'; '.join(manual)} by hand.")
+        else:
+            print(f"Registered {len(app_names)} apps in INSTALLED_APPS and the root urlconf.")
 
     @staticmethod
-    def create_style_css():
+    def configure_static_pipeline(directory, project_name, template_pack='default'):
+        """Render the template pack's static files storage and make collectstatic hash and precompress with it.
+
+        Packs without a ``static`` tree use the default pack's.
+        """
+        DjangoProjectManager.pack_with_section(template_pack, 'static').write(directory, 'static', {'project_name': project_name})
+
+        settings_path = os.path.join(directory, project_name, "settings.py")
+        with open(settings_path, "r") as f:
+            settings = f.read()
+        if re.search(r"^STORAGES\s*=", settings, re.MULTILINE):
+            print(f"{settings_path} already configures STORAGES; set the staticfiles backend to "
+                  f"'{project_name}.storage.PrecompressedManifestStaticFilesStorage' by hand.")
+            return
+        block = ("\n# collectstatic writes content-hashed copies of the static files, plus gzip and Brotli\n"
+                 "# siblings, to STATIC_ROOT; {% static %} then resolves the hashed names. See storage.py.\n")
+        if not re.search(r"^STATICFILES_DIRS\s*=", settings, re.MULTILINE):
+            block += "STATICFILES_DIRS = [BASE_DIR / 'static']\n"
+        if not re.search(r"^STATIC_ROOT\s*=", settings, re.MULTILINE):
+            block += "STATIC_ROOT = BASE_DIR / 'staticfiles'\n"
+        block += ("\nSTORAGES = {\n"
+                  "    'default': {\n        'BACKEND': 'django.core.files.storage.FileSystemStorage',\n    },\n"
+                  "    'staticfiles': {\n"
+                  f"        'BACKEND': '{project_name}.storage.PrecompressedManifestStaticFilesStorage',\n"
+                  "    },\n}\n")
+        DirectoryManager.write_file(settings_path, settings.rstrip('\n') + "\n" + block)
+        print("Configured hashed, precompressed static files for collectstatic.")
+
+    @staticmethod
+    def apply_production_profile(directory, project_name, template_pack='default'):
+        """Render the template pack's production files, with a fresh SECRET_KEY in .env, and point wsgi.py and asgi.py at them.
+
+        manage.py keeps the development settings, so runserver works before collectstatic has run.
+        Packs without a ``production`` tree use the default pack's.
+        """
+        pack = DjangoProjectManager.pack_with_section(template_pack, 'production')
+        cpu_count = DjangoProjectManager.cpu_count()
+        context = {'project_name': project_name, 'cpu_count': cpu_count, 'workers': 2 * cpu_count + 1,
+                   'secret_key': DjangoTemplateEngine.secret_key()}
+        written = pack.write(directory, 'production', context)
+
+        for path in (os.path.join(directory, project_name, 'wsgi.py'), os.path.join(directory, project_name, 'asgi.py')):
+            with open(path, 'r') as f:
+                content = f.read()
+            updated = content.replace(f"'{project_name}.settings'", f"'{project_name}.production'")
+            if updated != content:
+                DirectoryManager.write_file(path, updated)
+        print(f"Applied the production profile: {len(written)} files, {context['workers']} server workers.")
+
+    @staticmethod
+    def create_load_test(directory, project_name, app_names, template_pack='default'):
+        """Render the template pack's ``loadtest`` management command into the first app, aimed at every app's pages.
+
+        Packs without a ``loadtest`` tree use the default pack's.
+        """
+        if not app_names:
+            print("Skipping the load-test command; it needs an app to live in.")
+            return
+        paths = [f"/{app_name}/{page}" for app_name in app_names for page in DjangoProjectManager.LOAD_TEST_PAGES]
+        context = {'project_name': project_name, 'app_name': app_names[0], 'default_paths': repr(paths)}
+        DjangoProjectManager.pack_with_section(template_pack, 'loadtest').write(directory, 'loadtest', context)
+        print(f"Created the loadtest command in '{app_names[0]}'; run it with 'uv run python manage.py loadtest'.")
+
+    @staticmethod
+    def pack_with_section(template_pack, section):
+        """Return ``template_pack``, or the default pack if it has no ``section`` tree."""
+        pack = TemplatePack.get(template_pack)
+        return pack if pack.compiled(section) else TemplatePack.get('default')
+
+    @staticmethod
+    def cpu_count():
+        """Return the cores available to this process, honouring CPU affinity where the OS supports it."""
+        if hasattr(os, 'sched_getaffinity'):
+            return len(os.sched_getaffinity(0))
+        return os.cpu_count() or 1
+
+    @staticmethod
+    def confirm_tailwind_installation():
+        """Ask whether Tailwind CSS should be installed."""
+        response = input("Do you want to install Tailwind CSS? [y/n]: ").strip().lower()
+        return response == 'y'
+
+    @staticmethod
+    def create_style_css(directory):
         """Create a default style.css file in the static/css directory."""
-        with open("static/css/style.css", 'w') as f:
-            f.write("/* Custom styles */\n")
-        print("Created style.css in static/css directory.")
+        if DirectoryManager.write_file(os.path.join(directory, "static/css/style.css"), "/* Custom styles */\n"):
+            print("Created style.css in static/css directory.")
 
     @staticmethod
-    def setup_tailwind(app_name):
+    def setup_tailwind(directory, app_names, tailwind_version=None, use_store=True):
         """Set up Tailwind CSS in the Django project."""
-        print("Initializing Tailwind CSS...")
+        DjangoProjectManager.install_tailwind_packages(directory, tailwind_version, use_store)
+        DjangoProjectManager.configure_tailwind(directory, app_names)
+        DjangoProjectManager.build_tailwind(directory)
 
-        subprocess.run(["npm", "init", "-y"], check=True)
-        subprocess.run(["npm", "install", "tailwindcss"], check=True)
-        subprocess.run(["npx", "tailwindcss", "init"], check=True)
+    @staticmethod
+    def install_tailwind_packages(directory, tailwind_version=None, use_store=True):
+        """Create package.json, install Tailwind CSS and generate its default config.
 
-        # Create tailwind.css for Tailwind input
-        with open("static/css/tailwind.css", "w") as f:
-            f.write("/* tailwind css */\n@tailwind base;\n@tailwind components;\n@tailwind utilities;\n")
+        With ``use_store``, all three come from the shared node_modules store instead of npm.
+        """
+        print("Initializing Tailwind CSS...")
+        if use_store and NodeModulesStore.install(directory, tailwind_version):
+            return
 
-        # Create style.css for custom CSS
-        DjangoProjectManager.create_style_css()
+        package = f"tailwindcss@{tailwind_version}" if tailwind_version else "tailwindcss"
+        CommandRunner.run(["npm", "init", "-y"], check=True, cwd=directory)
+        CommandRunner.run(["npm", "install", package], check=True, cwd=directory, retries=CommandRunner.network_retries)
+        CommandRunner.run(["npx", "tailwindcss", "init"], check=True, cwd=directory)
+
+    @staticmethod
+    def configure_tailwind(directory, app_names):
+        """Write the Tailwind input and custom stylesheets, npm scripts and content paths."""
+        DjangoProjectManager.create_tailwind_sources(directory)
 
         # Update package.json with Tailwind build, watch, and dev scripts
-        with open("package.json", "r") as f:
+        package_json_path = os.path.join(directory, "package.json")
+        with open(package_json_path, "r") as f:
             package_json = f.read()
         package_json = package_json.replace(
             '"scripts": {',
             '"scripts": {\n    "build": "npx tailwindcss -i ./static/css/tailwind.css -o ./static/css/output.css --minify",\n'
             '    "watch": "npx tailwindcss -i ./static/css/tailwind.css -o ./static/css/output.css --watch",\n'
-            '    "dev": "npx tailwindcss -i ./static/css/tailwind.css -o ./static/css/output.css --watch",'
+            '    "dev": "npx tailwindcss -i ./static/css/tailwind.css -o ./static/css/output.css --watch",\n'
+            '    "static": "npm run build && uv run python manage.py collectstatic --noinput",'
         )
-        with open("package.json", "w") as f:
-            f.write(package_json)
+        DirectoryManager.write_file(package_json_path, package_json)
 
         # Configure tailwind.config.js content paths
-        with open("tailwind.config.js", "r") as f:
+        config_path = os.path.join(directory, "tailwind.config.js")
+        with open(config_path, "r") as f:
             config_content = f.read()
         content_paths = [
             '"./templates/**/*.html",',
             '"./static/js/**/*.js",',
-            f'"./{app_name}/templates/{app_name}/**/*.html"'
-        ]
+        ] + [f'"./{app_name}/templates/{app_name}/**/*.html"' for app_name in app_names]
         config_content = config_content.replace(
             "content: []",
             f"content: [\n    {',\n    '.join(content_paths)}\n]"
         )
-        with open("tailwind.config.js", "w") as f:
-            f.write(config_content)
+        DirectoryManager.write_file(config_path, config_content)
         print("Configured Tailwind CSS content paths in tailwind.config.js")
 
+    @staticmethod
+    def create_tailwind_sources(directory):
+        """Write the Tailwind input stylesheet and the custom stylesheet."""
+        # Create tailwind.css for Tailwind input
+        DirectoryManager.write_file(os.path.join(directory, "static/css/tailwind.css"),
+                                    "/* tailwind css */\n@tailwind base;\n@tailwind components;\n@tailwind utilities;\n")
+
+        # Create style.css for custom CSS
+        DjangoProjectManager.create_style_css(directory)
+
+    @staticmethod
+    def configure_tailwind_standalone(directory, app_names, binary):
+        """Write the Tailwind sources, tailwind.config.js and a Makefile with the build/watch/dev commands."""
+        DjangoProjectManager.create_tailwind_sources(directory)
+
+        content_paths = ["./templates/**/*.html", "./static/js/**/*.js"]
+        content_paths += [f"./{app_name}/templates/{app_name}/**/*.html" for app_name in app_names]
+        DirectoryManager.write_file(os.path.join(directory, "tailwind.config.js"),
+                                    "/** @type {import('tailwindcss').Config} */\n"
+                                    "module.exports = {\n"
+                                    "  content: [\n" + ''.join(f'    "{path}",\n' for path in content_paths) + "  ],\n"
+                                    "  theme: {\n    extend: {},\n  },\n  plugins: [],\n}\n")
+
+        DirectoryManager.write_file(os.path.join(directory, "Makefile"),
+                                    "# Tailwind CSS with the standalone CLI. Put tailwindcss on PATH, or set TAILWIND\n"
+                                    "# (in the environment or as make TAILWIND=...) to the executable's path.\n"
+                                    "TAILWIND ?= tailwindcss\n"
+                                    "TAILWIND_ARGS = -i ./static/css/tailwind.css -o ./static/css/output.css\n\n"
+                                    ".PHONY: build watch dev static\n\n"
+                                    "build:\n\t$(TAILWIND) $(TAILWIND_ARGS) --minify\n\n"
+                                    "watch:\n\t$(TAILWIND) $(TAILWIND_ARGS) --watch\n\n"
+                                    "dev: watch\n\n"
+                                    "# Hash, precompress and collect the static files into STATIC_ROOT.\n"
+                                    "static: build\n\tuv run python manage.py collectstatic --noinput\n")
+        print("Configured Tailwind CSS content paths in tailwind.config.js and build commands in Makefile")
+        if shutil.which('tailwindcss') is None:
+            print(f"tailwindcss is not on PATH; run make with TAILWIND={binary} to use the executable the scaffolder used.")
+
+    @staticmethod
+    def build_tailwind_standalone(directory, binary):
+        """Build static/css/output.css with the standalone Tailwind executable."""
+        CommandRunner.run([binary, "-i", "./static/css/tailwind.css", "-o", "./static/css/output.css", "--minify"],
+                          check=True, cwd=directory)
+        print("Tailwind CSS setup complete.")
+
+    @staticmethod
+    def build_tailwind(directory):
+        """Build static/css/output.css from the configured sources."""
         # Run the build command to create output.css
-        subprocess.run(["npm", "run", "build"], check=True)
-        print("Tailwind CSS setup complete.")
\ No newline at end of file
+        CommandRunner.run(["npm", "run", "build"], check=True, cwd=directory)
+        print("Tailwind CSS setup complete.")
@@ -0,0 +1,245 @@
+import ast
+import glob
+import os
+import re
+import secrets
+import shutil
+import stat
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from generation_journal import GenerationJournal
+from trace_recorder import TraceRecorder
+
+class TemplateEngineUnavailable(Exception):
+    """Raised when the in-process engine cannot reproduce django-admin's output and the subprocess path must be used."""
+
+class DjangoTemplateEngine:
+    """Renders Django's startproject/startapp templates in-process, mirroring django-admin's TemplateCommand.
+
+    The templates are read from the Django package installed in the project's environment, so the
+    output matches what that Django version's CLI would produce, without spawning an interpreter.
+    File modes follow the same version's TemplateCommand: the template's mode with the umask applied,
+    or copied unchanged by releases that predate ``apply_umask``.
+    """
+
+    SECRET_KEY_CHARS = 'abcdefghijklmnopqrstuvwxyz0123456789!@#$%^&*(-_=+)'
+    SECRET_KEY_INSECURE_PREFIX = 'django-insecure-'
+    TEMPLATE_SUFFIXES = (('.py-tpl', '.py'),)
+    VARIABLE_PATTERN = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+
+    _umask = None
+    _umask_lock = threading.Lock()
+
+    @staticmethod
+    def locate_django(directory):
+        """Return the Django package directory of the environment serving ``directory``, or None.
+
+        Honours ``UV_PROJECT_ENVIRONMENT`` and otherwise walks up to the nearest ``.venv``,
+        which covers uv workspaces whose environment lives at the workspace root.
+        """
+        candidates = []
+        if os.environ.get('UV_PROJECT_ENVIRONMENT'):
+            candidates.append(os.path.join(directory, os.environ['UV_PROJECT_ENVIRONMENT']))
+        current = os.path.abspath(directory)
+        while True:
+            candidates.append(os.path.join(current, '.venv'))
+            parent = os.path.dirname(current)
+            if parent == current:
+                break
+            current = parent
+
+        for venv in candidates:
+            patterns = [os.path.join(venv, 'lib', 'python*', 'site-packages', 'django'),
+                        os.path.join(venv, 'Lib', 'site-packages', 'django')]
+            for pattern in patterns:
+                for match in sorted(glob.glob(pattern)):
+                    if os.path.isfile(os.path.join(match, '__init__.py')):
+                        return match
+        return None
+
+    @staticmethod
+    def read_version(django_dir):
+        """Return ``(django_version, docs_version)`` as Django's get_version/get_docs_version would compute them."""
+        with open(os.path.join(django_dir, '__init__.py'), encoding='utf-8') as f:
+            module = ast.parse(f.read())
+
+        version = None
+        for node in module.body:
+            if isinstance(node, ast.Assign) and any(getattr(t, 'id', None) == 'VERSION' for t in node.targets):
+                version = ast.literal_eval(node.value)
+        if not version or len(version) != 5:
+            raise TemplateEngineUnavailable("Could not read Django's VERSION tuple.")
+
+        major, minor, micro, release, serial = version
+        if release == 'alpha' and serial == 0:
+            # Development checkouts append a git changeset that only Django itself can compute.
+            raise TemplateEngineUnavailable("Development versions of Django are not supported in-process.")
+
+        main = f"{major}.{minor}" if micro == 0 else f"{major}.{minor}.{micro}"
+        sub = '' if release == 'final' else {'alpha': 'a', 'beta': 'b', 'rc': 'rc'}[release] + str(serial)
+        docs_version = f"{major}.{minor}" if release == 'final' else 'dev'
+        return main + sub, docs_version
+
+    @staticmethod
+    def start_project(directory, project_name, django_dir):
+        """Equivalent of ``django-admin startproject <project_name> .`` run in ``directory``."""
+        DjangoTemplateEngine._validate_name(project_name, django_dir)
+        django_version, docs_version = DjangoTemplateEngine.read_version(django_dir)
+        top_dir = os.path.abspath(directory)
+        context = {
+            'project_name': project_name,
+            'project_directory': top_dir,
+            'camel_case_project_name': DjangoTemplateEngine.camel_case(project_name),
+            'docs_version': docs_version,
+            'django_version': django_version,
+            'secret_key': DjangoTemplateEngine.SECRET_KEY_INSECURE_PREFIX + DjangoTemplateEngine.secret_key(),
+        }
+        template_dir = os.path.join(django_dir, 'conf', 'project_template')
+        files = DjangoTemplateEngine._plan(template_dir, top_dir, 'project_name', project_name)
+        return DjangoTemplateEngine._emit(files, context, DjangoTemplateEngine._mode_mask(django_dir))
+
+    @staticmethod
+    def start_apps(directory, app_names, django_dir, max_workers=4):
+        """Equivalent of ``manage.py startapp <name>`` for every app, emitting the apps concurrently."""
+        django_version, docs_version = DjangoTemplateEngine.read_version(django_dir)
+        template_dir = os.path.join(django_dir, 'conf', 'app_template')
+
+        # Plan every app before writing anything so a conflict leaves the tree untouched.
+        planned = []
+        for app_name in app_names:
+            DjangoTemplateEngine._validate_name(app_name, django_dir)
+            top_dir = os.path.join(os.path.abspath(directory), app_name)
+            if os.path.exists(top_dir):
+                raise TemplateEngineUnavailable(f"'{top_dir}' already exists.")
+            context = {
+                'app_name': app_name,
+                'app_directory': top_dir,
+                'camel_case_app_name': DjangoTemplateEngine.camel_case(app_name),
+                'docs_version': docs_version,
+                'django_version': django_version,
+            }
+            planned.append((DjangoTemplateEngine._plan(template_dir, top_dir, 'app_name', app_name), context))
+
+        mask = DjangoTemplateEngine._mode_mask(django_dir)
+        if len(planned) <= 1 or max_workers <= 1:
+            return [path for files, context in planned for path in DjangoTemplateEngine._emit(files, context, mask)]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(planned))) as pool:
+            results = list(pool.map(TraceRecorder.bind(lambda item: DjangoTemplateEngine._emit(*item, mask)), planned))
+        return [path for paths in results for path in paths]
+
+    @staticmethod
+    def _plan(template_dir, top_dir, base_name, name):
+        """Return ``(source, target, render)`` triples for a template tree, following TemplateCommand's walk rules."""
+        if not os.path.isdir(template_dir):
+            raise TemplateEngineUnavailable(f"Template directory '{template_dir}' not found.")
+
+        files = []
+        for root, dirs, filenames in os.walk(template_dir):
+            relative_dir = root[len(template_dir):].lstrip(os.sep)
+            if base_name in relative_dir:
+                relative_dir = relative_dir.replace(base_name, name)
+
+            for dirname in dirs[:]:
+                if dirname.startswith('.') or dirname == '__pycache__':
+                    dirs.remove(dirname)
+
+            for filename in filenames:
+                if filename.endswith(('.pyo', '.pyc', '.py.class')):
+                    continue
+                target = os.path.join(top_dir, relative_dir, filename.replace(base_name, name))
+                for old_suffix, new_suffix in DjangoTemplateEngine.TEMPLATE_SUFFIXES:
+                    if target.endswith(old_suffix):
+                        target = target[:-len(old_suffix)] + new_suffix
+                        break
+                if os.path.exists(target):
+                    raise TemplateEngineUnavailable(f"'{target}' already exists.")
+                files.append((os.path.join(root, filename), target, target.endswith('.py')))
+        return files
+
+    @staticmethod
+    def _emit(files, context, mask):
+        """Write planned files, rendering templates with ``context``; return the created paths.
+
+        Each file gets its template's mode with the bits in ``mask`` cleared, and is made writable by its owner.
+        """
+        rendered = {}
+        for source, target, render in files:
+            if render:
+                with open(source, encoding='utf-8') as f:
+                    rendered[target] = DjangoTemplateEngine._render(f.read(), context)
+
+        for source, target, render in files:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            if render:
+                data = rendered[target].encode('utf-8')
+                with open(target, 'w', encoding='utf-8') as f:
+                    f.write(rendered[target])
+            else:
+                shutil.copyfile(source, target)
+                with open(target, 'rb') as f:
+                    data = f.read()
+            TraceRecorder.record_write(len(data), True)
+            GenerationJournal.record(target, data)
+            mode = stat.S_IMODE(os.stat(source).st_mode) & ~mask
+            os.chmod(target, mode | stat.S_IWUSR)
+        return [target for _, target, _ in files]
+
+    @staticmethod
+    def _render(content, context):
+        """Substitute ``{{ variable }}`` placeholders; anything needing the full template language is rejected."""
+        rendered = DjangoTemplateEngine.VARIABLE_PATTERN.sub(lambda m: str(context.get(m.group(1), '')), content)
+        remaining = DjangoTemplateEngine.VARIABLE_PATTERN.sub('', content)
+        if '{%' in remaining or '{{' in remaining or '{#' in remaining:
+            raise TemplateEngineUnavailable("Template uses tags or filters that require Django's template engine.")
+        return rendered
+
+    @staticmethod
+    def _validate_name(name, django_dir):
+        """Apply django-admin's name checks, deferring to the CLI (and its error message) for anything it would reject."""
+        if not name or not name.isidentifier():
+            raise TemplateEngineUnavailable(f"'{name}' is not a valid identifier.")
+
+        site_packages = os.path.dirname(django_dir)
+        clashes = (
+            name in sys.stdlib_module_names
+            or name in sys.builtin_module_names
+            or os.path.exists(os.path.join(site_packages, name))
+            or glob.glob(os.path.join(site_packages, name + '.*'))
+        )
+        if clashes:
+            raise TemplateEngineUnavailable(f"'{name}' conflicts with an existing Python module.")
+
+    @staticmethod
+    def camel_case(name):
+        """Mirror TemplateCommand's camel-casing of project and app names."""
+        return ''.join(x for x in name.title() if x != '_')
+
+    @staticmethod
+    def secret_key():
+        """Equivalent of django.core.management.utils.get_random_secret_key."""
+        return ''.join(secrets.choice(DjangoTemplateEngine.SECRET_KEY_CHARS) for _ in range(50))
+
+    @staticmethod
+    def _mode_mask(django_dir):
+        """Return the mode bits the installed Django's TemplateCommand clears from a template's mode.
+
+        Releases with ``TemplateCommand.apply_umask`` clear the process umask; older ones copy the
+        mode unchanged with ``shutil.copymode``.
+        """
+        try:
+            with open(os.path.join(django_dir, 'core', 'management', 'templates.py'), encoding='utf-8') as f:
+                applies_umask = 'def apply_umask(' in f.read()
+        except OSError:
+            applies_umask = True
+        return DjangoTemplateEngine._current_umask() if applies_umask else 0
+
+    @staticmethod
+    def _current_umask():
+        """Read the process umask once; os.umask can only be read by setting it, which is unsafe across threads."""
+        with DjangoTemplateEngine._umask_lock:
+            if DjangoTemplateEngine._umask is None:
+                current = os.umask(0)
+                os.umask(current)
+                DjangoTemplateEngine._umask = current
+            return DjangoTemplateEngine._umask
@@ -1,9 +1,21 @@
+import contextlib
+import fnmatch
+import os
+import re
 import subprocess
 import sys
+import threading
+import tomllib
+from command_runner import CommandRunner
+from directory_manager import DirectoryManager
+from toolchain import Toolchain
 
 class EnvironmentManager:
     """Handles the setup and configuration of the environment, including checking and installing necessary tools."""
 
+    _workspace_locks = {}
+    _workspace_locks_guard = threading.Lock()
+
     @staticmethod
     def check_and_install_uv():
         """Check if 'uv' is installed, and if not, prompt the user to install it."""
@@ -17,13 +29,11 @@ class EnvironmentManager:
     @staticmethod
     def check_uv_installed():
         """Check if 'uv' is installed."""
-        try:
-            subprocess.run(['uv', '--version'], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if Toolchain.get('uv').installed:
             print("'uv' is already installed.")
             return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            print("'uv' is not installed.")
-            return False
+        print("'uv' is not installed.")
+        return False
 
     @staticmethod
     def prompt_install_uv():
@@ -35,28 +45,142 @@ class EnvironmentManager:
     def install_uv_with_snap():
         """Install 'uv' using Snap with classic confinement."""
         try:
-            subprocess.run(['sudo', 'snap', 'install', 'astral-uv', '--classic'], check=True)
+            CommandRunner.run(['sudo', 'snap', 'install', 'astral-uv', '--classic'], check=True, retries=CommandRunner.network_retries,
+                              interactive=True)
+            Toolchain.forget('uv')
             print("UV installed successfully.")
         except subprocess.CalledProcessError:
             print("Failed to install 'uv'. Please check your Snap setup.")
             sys.exit(1)
 
     @staticmethod
-    def initialize_uv():
-        """Initialize UV."""
+    def initialize_uv(directory, python_version=None, workspace_root=None):
+        """Initialize UV in the given directory, optionally pinning the Python version.
+
+        With ``workspace_root``, the project is also registered as a member of that uv workspace.
+        """
+        command = ['uv', 'init']
+        if python_version:
+            command += ['--python', python_version]
         try:
-            subprocess.run(['uv', 'init'], check=True)
+            with EnvironmentManager._workspace_lock(workspace_root):
+                # Not retried: a failed 'uv init' can leave pyproject.toml behind, and a second one then refuses to run.
+                CommandRunner.run(command, check=True, cwd=directory)
+                if workspace_root:
+                    EnvironmentManager.register_workspace_member(workspace_root, directory)
             print("Initialized UV environment.")
         except subprocess.CalledProcessError:
             print("Failed to initialize UV environment.")
             sys.exit(1)
 
     @staticmethod
-    def add_django():
-        """Add Django to the environment using UV."""
+    def add_django(directory, django_version=None, workspace_root=None, packages=()):
+        """Add Django (optionally a pinned version) and ``packages`` to the UV environment in the given directory.
+
+        In a workspace, packages are hardlinked from uv's cache into the shared environment. If the
+        workspace lock already has a matching Django, uv runs offline, so nothing is downloaded.
+        """
+        requirement = f"django=={django_version}" if django_version else 'django'
+        command = ['uv', 'add', requirement, *packages]
         try:
-            subprocess.run(['uv', 'add', 'django'], check=True)
+            if not workspace_root:
+                CommandRunner.run(command, check=True, cwd=directory, retries=CommandRunner.network_retries)
+            else:
+                command += ['--link-mode', 'hardlink']
+                with EnvironmentManager._workspace_lock(workspace_root):
+                    locked = EnvironmentManager.locked_version(workspace_root, 'django')
+                    if locked and django_version in (None, locked):
+                        if CommandRunner.run(command + ['--offline'], check=False, cwd=directory).returncode == 0:
+                            print(f"Django {locked} added from the workspace lock.")
+                            return
+                    CommandRunner.run(command, check=True, cwd=directory, retries=CommandRunner.network_retries)
             print("Django added to the UV environment.")
         except subprocess.CalledProcessError:
             print("Failed to add Django to the UV environment.")
-            sys.exit(1)
\ No newline at end of file
+            sys.exit(1)
+
+    @staticmethod
+    def find_workspace_root(directory):
+        """Return the nearest directory above ``directory`` whose pyproject.toml declares a uv workspace, or None."""
+        current = os.path.dirname(os.path.abspath(directory))
+        while True:
+            if EnvironmentManager._workspace_config(current) is not None:
+                return current
+            parent = os.path.dirname(current)
+            if parent == current:
+                return None
+            current = parent
+
+    @staticmethod
+    def validate_workspace(workspace_root, directory):
+        """Return the absolute workspace root for a project in ``directory``, raising ValueError if it can't hold it."""
+        root = EnvironmentManager.find_workspace_root(directory) if not workspace_root else os.path.abspath(workspace_root)
+        if root is None:
+            raise ValueError(f"No uv workspace (a pyproject.toml with [tool.uv.workspace]) found above {directory}.")
+        if EnvironmentManager._workspace_config(root) is None:
+            raise ValueError(f"{root} has no pyproject.toml with a [tool.uv.workspace] table.")
+        if os.path.commonpath([root, os.path.abspath(directory)]) != root or os.path.abspath(directory) == root:
+            raise ValueError(f"{directory} is not inside the uv workspace at {root}.")
+        return root
+
+    @staticmethod
+    def register_workspace_member(workspace_root, directory):
+        """Add ``directory`` to the workspace's ``members`` unless an existing member glob already covers it."""
+        member = os.path.relpath(os.path.abspath(directory), workspace_root).replace(os.sep, '/')
+        config = EnvironmentManager._workspace_config(workspace_root) or {}
+        if any(fnmatch.fnmatchcase(member, pattern) for pattern in config.get('members', [])):
+            if not any(fnmatch.fnmatchcase(member, pattern) for pattern in config.get('exclude', [])):
+                return
+
+        pyproject_path = os.path.join(workspace_root, 'pyproject.toml')
+        with open(pyproject_path) as f:
+            content = f.read()
+        header = re.search(r'^\[tool\.uv\.workspace\][^\n]*\n', content, re.MULTILINE)
+        if header is None:
+            print(f"Could not find a [tool.uv.workspace] table in {pyproject_path}; add \"{member}\" to members by hand.")
+            return
+        members = re.compile(r'^(members\s*=\s*\[)(.*?)(\])', re.MULTILINE | re.DOTALL)
+        match = members.search(content, header.end())
+        next_table = re.compile(r'^\[', re.MULTILINE).search(content, header.end())
+        if match and (next_table is None or match.start() < next_table.start()):
+            body = match.group(2)
+            if '\n' in body:
+                body = body.rstrip()
+                body = (body if body.endswith((',', '[')) or not body.strip() else body + ',') + f'\n    "{member}",\n'
+            else:
+                body = f'{body.strip().rstrip(",")}, "{member}"' if body.strip() else f'"{member}"'
+            content = content[:match.start(2)] + body + content[match.end(2):]
+        else:
+            content = content[:header.end()] + f'members = ["{member}"]\n' + content[header.end():]
+        DirectoryManager.write_file(pyproject_path, content)
+        print(f"Registered {member} as a member of the uv workspace at {workspace_root}.")
+
+    @staticmethod
+    def locked_version(workspace_root, package):
+        """Return the version of ``package`` pinned in the workspace's uv.lock, or None."""
+        try:
+            with open(os.path.join(workspace_root, 'uv.lock'), 'rb') as f:
+                lock = tomllib.load(f)
+        except (OSError, tomllib.TOMLDecodeError):
+            return None
+        for entry in lock.get('package', []):
+            if entry.get('name') == package:
+                return entry.get('version')
+        return None
+
+    @staticmethod
+    def _workspace_config(directory):
+        """Return the ``[tool.uv.workspace]`` table of ``directory``'s pyproject.toml, or None."""
+        try:
+            with open(os.path.join(directory, 'pyproject.toml'), 'rb') as f:
+                return tomllib.load(f).get('tool', {}).get('uv', {}).get('workspace')
+        except (OSError, tomllib.TOMLDecodeError):
+            return None
+
+    @staticmethod
+    def _workspace_lock(workspace_root):
+        """Serialize uv commands that rewrite a workspace's pyproject.toml and uv.lock; a no-op outside workspaces."""
+        if not workspace_root:
+            return contextlib.nullcontext()
+        with EnvironmentManager._workspace_locks_guard:
+            return EnvironmentManager._workspace_locks.setdefault(workspace_root, threading.Lock())
\ No newline at end of file
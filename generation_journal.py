@@ -0,0 +1,204 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from trace_recorder import TraceRecorder
+
+class GenerationJournal:
+    """Records which scaffold steps finished and the hash of every file the scaffolder wrote.
+
+    The journal lives in the project directory, so a rerun can skip finished steps and resume at
+    the one that failed. Generated files are only rewritten if they still hold exactly what the
+    scaffolder last wrote for the same inputs; each file records the step and the inputs'
+    signature that produced it. Files the user edited, files written for other inputs, and files
+    that existed before the first run (listed when the journal is created), are left alone. A
+    completed project is never regenerated with different inputs.
+    """
+
+    FILENAME = '.django-setup-journal.json'
+    # Not walked when listing preexisting files: the scaffolder writes nothing inside them.
+    UNSCANNED_NAMES = {'.git', '.venv', 'node_modules', '__pycache__'}
+
+    _open = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, directory, signature, scan=True):
+        self.directory = os.path.abspath(directory)
+        self.path = os.path.join(self.directory, GenerationJournal.FILENAME)
+        self._lock = threading.Lock()
+
+        data = {}
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+        # Each file maps to {'hash', 'step', 'signature'}; journals from before provenance was recorded hold bare hashes.
+        self.files = {path: entry if isinstance(entry, dict) else {'hash': entry}
+                      for path, entry in data.get('files', {}).items()}
+        # Files that were in the directory before the first run belong to the user and are never rewritten.
+        # ``scan=False`` is for read-only uses, such as planning, that never check files.
+        if 'preexisting' in data:
+            self.preexisting = set(data['preexisting'])
+        else:
+            self.preexisting = self._scan() if scan else set()
+        same_inputs = data.get('signature') == signature
+        self.steps = data.get('steps', {}) if same_inputs else {}
+        self.failed = data.get('failed') if same_inputs else None
+        self.completed = data.get('completed') if same_inputs else None
+        # A project finished with other inputs is not regenerated over; see ``conflict``.
+        self.completed_with_other_inputs = bool(data.get('completed')) and not same_inputs
+        self.signature = signature
+
+    @staticmethod
+    def open(directory, signature):
+        """Load (or start) the journal for ``directory`` and make it the target of ``record``/``check`` calls there."""
+        journal = GenerationJournal(directory, signature)
+        conflict = journal.conflict()
+        if conflict:
+            print(f"Refusing to scaffold into {journal.directory}: {conflict}")
+            sys.exit(1)
+        if not os.path.exists(journal.path):
+            journal.save()  # pin the list of preexisting files even if this run dies early
+        with GenerationJournal._registry_lock:
+            GenerationJournal._open[journal.directory] = journal
+        if journal.failed:
+            print(f"Resuming: step '{journal.failed['step']}' failed last time ({journal.failed['error']}).")
+        return journal
+
+    def close(self):
+        """Save the journal and stop routing writes under its directory to it."""
+        self.save()
+        with GenerationJournal._registry_lock:
+            if GenerationJournal._open.get(self.directory) is self:
+                del GenerationJournal._open[self.directory]
+
+    @staticmethod
+    def for_path(path):
+        """Return the open journal whose directory contains ``path``, or None."""
+        path = os.path.abspath(path)
+        with GenerationJournal._registry_lock:
+            for directory, journal in GenerationJournal._open.items():
+                if path.startswith(directory + os.sep):
+                    return journal
+        return None
+
+    def conflict(self):
+        """Return why the directory must not be scaffolded with this journal's inputs, or None."""
+        if self.completed_with_other_inputs:
+            return ("it holds a completed project generated with different options (project or app names, "
+                    "Tailwind, versions, template pack, profile or load test). Rerun with the original options, "
+                    "or use a new directory.")
+        return None
+
+    def mark_complete(self):
+        """Record that every step finished, so the project is never regenerated with other inputs."""
+        with self._lock:
+            self.completed = time.time()
+        self.save()
+
+    def is_done(self, step):
+        with self._lock:
+            return step in self.steps
+
+    def mark_done(self, step):
+        with self._lock:
+            self.steps[step] = time.time()
+            if self.failed and self.failed['step'] == step:
+                self.failed = None
+        self.save()
+
+    def mark_failed(self, step, error):
+        with self._lock:
+            self.failed = {'step': step, 'error': str(error) or type(error).__name__}
+        self.save()
+
+    def check(self, path, data, merge=False):
+        """Return why ``data`` should not be written to ``path`` ('unchanged', 'modified', 'preexisting'), or None to write it.
+
+        ``merge`` means ``data`` is the file's current content plus the scaffolder's additions, so it
+        may update a preexisting or edited file without losing anything.
+        """
+        try:
+            with open(path, 'rb') as f:
+                current = GenerationJournal._hash(f.read())
+        except FileNotFoundError:
+            return None
+
+        relative = self._relative(path)
+        with self._lock:
+            recorded = self.files.get(relative)
+        if current == GenerationJournal._hash(data):
+            return 'unchanged'
+        if merge:
+            return None
+        if recorded is not None:
+            if recorded['hash'] != current:
+                return 'modified'
+            # Unedited, but rendered from other inputs (say, the production .env): differing output is no reason to replace it.
+            if recorded.get('signature', self.short_signature) != self.short_signature:
+                return 'other-inputs'
+            return None
+        # Not written by us: only files produced during this generation (e.g. by npm init) may be updated.
+        return 'preexisting' if relative in self.preexisting else None
+
+    def record_file(self, path, data):
+        span = TraceRecorder.current()
+        with self._lock:
+            self.files[self._relative(path)] = {'hash': GenerationJournal._hash(data), 'step': span and span.name,
+                                                'signature': self.short_signature}
+
+    def describe(self, path, reason):
+        """Return the message reporting that ``path`` is kept because of ``reason``, as returned by ``check``."""
+        relative = self._relative(path)
+        if reason == 'other-inputs':
+            with self._lock:
+                step = self.files[relative].get('step')
+            writer = f"step '{step}'" if step else "an earlier run"
+            return f"Keeping {relative}, written by {writer} with different options."
+        return f"Keeping {reason} file {relative}."
+
+    @property
+    def short_signature(self):
+        return self.signature[:16]
+
+    @staticmethod
+    def record(path, data):
+        """Record a file written under an open journal's directory; no-op elsewhere."""
+        journal = GenerationJournal.for_path(path)
+        if journal is not None:
+            journal.record_file(path, data)
+
+    def save(self):
+        """Write the journal atomically."""
+        with self._lock:
+            data = {
+                'signature': self.signature,
+                'preexisting': sorted(self.preexisting),
+                'steps': dict(self.steps),
+                'failed': self.failed,
+                'completed': self.completed,
+                'files': dict(sorted(self.files.items())),
+            }
+        # Imported here: directory_manager imports this module to route generated writes through the journal.
+        from directory_manager import DirectoryManager
+        DirectoryManager.write_json(self.path, data, indent=2)
+
+    def _scan(self):
+        """Return the relative paths of the files already in the directory."""
+        found = set()
+        for root, dirs, files in os.walk(self.directory):
+            dirs[:] = [name for name in dirs if name not in GenerationJournal.UNSCANNED_NAMES]
+            found.update(self._relative(os.path.join(root, name)) for name in files)
+        found.discard(GenerationJournal.FILENAME)
+        return found
+
+    def _relative(self, path):
+        return os.path.relpath(os.path.abspath(path), self.directory)
+
+    @staticmethod
+    def _hash(data):
+        return hashlib.sha256(data).hexdigest()
@@ -0,0 +1,112 @@
+import os
+import subprocess
+from command_runner import CommandRunner
+from generation_journal import GenerationJournal
+
+class InitialCommit:
+    """Creates a project's first commit by streaming its generated files into ``git fast-import``.
+
+    Only files the scaffolder knows it produced are considered, so node_modules and the rest of the
+    tree are never walked; the generated .gitignore is honoured through one ``git check-ignore`` call.
+    """
+
+    MESSAGE = "Initial commit"
+    # Files made by uv and npm, or merged into rather than written by the scaffolder, committed when present.
+    TOOL_FILES = ('.gitignore', 'pyproject.toml', 'uv.lock', '.python-version', 'README.md', 'main.py', 'hello.py',
+                  'package.json', 'package-lock.json', 'tailwind.config.js')
+
+    @staticmethod
+    def create(directory, generated, package_dirs=(), message=MESSAGE):
+        """Commit ``generated`` (paths relative to ``directory``), the tool files and ``package_dirs`` as the first commit; return the number of files."""
+        git_dir = os.path.join(directory, '.git')
+        if not os.path.isdir(git_dir):
+            print("Skipping the initial commit: the project has no Git repository of its own.")
+            return 0
+        ref = InitialCommit._head_ref(git_dir)
+        if ref is None:
+            print("Skipping the initial commit: HEAD is detached.")
+            return 0
+        if CommandRunner.capture(['git', 'rev-parse', '--verify', '--quiet', ref], cwd=directory, check=False).returncode == 0:
+            print("Skipping the initial commit: the repository already has commits.")
+            return 0
+        identity = CommandRunner.capture(['git', 'var', 'GIT_COMMITTER_IDENT'], cwd=directory, check=False)
+        if identity.returncode:
+            print("Skipping the initial commit: set user.name and user.email with 'git config' first.")
+            return 0
+        identity = identity.stdout.decode().strip()
+
+        paths = InitialCommit.candidates(directory, generated, package_dirs)
+        ignored = InitialCommit.ignored(directory, paths)
+        paths = [path for path in paths if path not in ignored]
+        if not paths:
+            print("Skipping the initial commit: no files to commit.")
+            return 0
+
+        CommandRunner.capture(['git', 'fast-import', '--quiet', '--done'], cwd=directory,
+                              input=InitialCommit._stream(directory, paths, ref, identity, message))
+        # fast-import only writes objects and the ref; bring the index up to date so the tree is clean.
+        CommandRunner.run(['git', 'reset', '--quiet'], cwd=directory)
+        print(f"Created the initial commit with {len(paths)} files.")
+        return len(paths)
+
+    @staticmethod
+    def candidates(directory, generated, package_dirs=()):
+        """Return the sorted, '/'-separated paths of the files that may go into the commit."""
+        paths = {path.replace(os.sep, '/') for path in generated}
+        paths.update(InitialCommit.TOOL_FILES)
+        # django-admin run as a subprocess writes the packages without recording them, so list those small trees too.
+        for package in package_dirs:
+            for root, dirs, files in os.walk(os.path.join(directory, package)):
+                dirs[:] = [name for name in dirs if name != '__pycache__']
+                relative = os.path.relpath(root, directory).replace(os.sep, '/')
+                paths.update(f"{relative}/{name}" for name in files)
+        return sorted(path for path in paths
+                      if path != GenerationJournal.FILENAME and path.split('/')[0] != '.git'
+                      and os.path.lexists(os.path.join(directory, path))
+                      and not os.path.isdir(os.path.join(directory, path)))
+
+    @staticmethod
+    def ignored(directory, paths):
+        """Return the subset of ``paths`` that the repository's ignore rules exclude."""
+        result = CommandRunner.capture(['git', 'check-ignore', '--stdin', '-z'], cwd=directory, check=False,
+                                       input=''.join(f"{path}\0" for path in paths).encode())
+        # Exit code 1 means no path is ignored; anything above it is an error.
+        if result.returncode > 1:
+            raise subprocess.CalledProcessError(result.returncode, result.args)
+        return {path for path in result.stdout.decode().split('\0') if path}
+
+    @staticmethod
+    def _head_ref(git_dir):
+        """Return the branch ref HEAD points at, e.g. 'refs/heads/main', or None when detached."""
+        with open(os.path.join(git_dir, 'HEAD')) as f:
+            head = f.read().strip()
+        return head[len('ref: '):] if head.startswith('ref: ') else None
+
+    @staticmethod
+    def _stream(directory, paths, ref, identity, message):
+        """Yield the fast-import stream: one blob per file, then a commit referencing them by mark."""
+        modes = []
+        for mark, path in enumerate(paths, 1):
+            full_path = os.path.join(directory, path)
+            if os.path.islink(full_path):
+                mode, data = '120000', os.readlink(full_path).encode()
+            else:
+                mode = '100755' if os.access(full_path, os.X_OK) else '100644'
+                with open(full_path, 'rb') as f:
+                    data = f.read()
+            modes.append(mode)
+            yield b'blob\nmark :%d\ndata %d\n' % (mark, len(data)) + data + b'\n'
+
+        message = message.encode()
+        yield (f"commit {ref}\nauthor {identity}\ncommitter {identity}\n".encode()
+               + b'data %d\n' % len(message) + message + b'\n')
+        for mark, (path, mode) in enumerate(zip(paths, modes), 1):
+            yield f"M {mode} :{mark} {InitialCommit._quote(path)}\n".encode()
+        yield b'done\n'
+
+    @staticmethod
+    def _quote(path):
+        """Quote ``path`` the way fast-import expects when it contains a newline, quote or backslash."""
+        if '\n' in path or '"' in path or '\\' in path:
+            return '"' + path.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+        return path
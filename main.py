@@ -1,56 +1,549 @@
 import os
-import subprocess
 import argparse
+import hashlib
+import json
+import subprocess
+import sys
+from command_runner import CommandRunner
 from directory_manager import DirectoryManager
+from generation_journal import GenerationJournal
+from initial_commit import InitialCommit
+from node_store import NodeModulesStore
 from package_manager import PackageManager
+from prewarm import Prewarm
 from environment_manager import EnvironmentManager
 from django_project_manager import DjangoProjectManager
+from project_spec import ProjectSpec
+from run_planner import RunPlanner
+from scaffold_server import ScaffoldClient, ScaffoldServer
+from batch_manager import BatchManager
+from snapshot_cache import SnapshotCache
+from step_scheduler import StepScheduler
+from tailwind_standalone import TailwindStandalone
+from template_pack import TemplatePack
+from toolchain import Toolchain
+from trace_recorder import TraceRecorder
 
 class Application:
     """Main class to orchestrate the setup of the Django project using the above classes."""
 
+    # Entries the scaffolder adds to every project's .gitignore; .env files hold the generated SECRET_KEY.
+    GITIGNORE_ENTRIES = ('*.pyc', '__pycache__/', '.venv/', '.env', '.env-template', 'node_modules/', 'static/css/output.css',
+                         'staticfiles/', GenerationJournal.FILENAME)
+
     @staticmethod
-    def initialize_git(directory):
-        """Initialize Git repository in the specified directory if not already initialized."""
-        os.chdir(directory)
-        if not os.path.exists('.git'):
-            subprocess.run(['git', 'init'])
-            with open('.gitignore', 'w') as f:
-                f.write("*.pyc\n__pycache__/\n.env\n.env-template\nnode_modules/\nstatic/css/output.css\n")
+    def initialize_git(directory, workspace_root=None):
+        """Initialize Git repository in the specified directory if not already initialized.
+
+        ``uv init`` usually creates the repository and a .gitignore of its own, so the scaffolder's entries
+        are merged into whatever .gitignore exists. Members of a workspace that is already a Git repository
+        only get the .gitignore.
+        """
+        if workspace_root and os.path.exists(os.path.join(workspace_root, '.git')):
+            Application.update_gitignore(directory)
+            print("Project is part of the workspace's Git repository; updated .gitignore only.")
+        elif not os.path.exists(os.path.join(directory, '.git')):
+            CommandRunner.run(['git', 'init'], cwd=directory, check=False)
+            Application.update_gitignore(directory)
             print("Git repository initialized and .gitignore file created.")
         else:
-            print("Git repository already exists in the installation directory.")
+            Application.update_gitignore(directory)
+            print("Git repository already exists in the installation directory; added the scaffolder's entries to .gitignore.")
+
+    @staticmethod
+    def update_gitignore(directory):
+        """Add the missing ``GITIGNORE_ENTRIES`` to ``directory``'s .gitignore, keeping the entries already there."""
+        path = os.path.join(directory, '.gitignore')
+        try:
+            with open(path) as f:
+                existing = f.read()
+        except FileNotFoundError:
+            existing = ''
+        present = {line.strip() for line in existing.splitlines()}
+        missing = [entry for entry in Application.GITIGNORE_ENTRIES if entry not in present]
+        if not missing:
+            return
+        if existing and not existing.endswith('\n'):
+            existing += '\n'
+        # Merged: adding ignore rules to a .gitignore the user wrote never loses their entries.
+        DirectoryManager.write_file(path, existing + ''.join(f"{entry}\n" for entry in missing), merge=True)
+
+    @staticmethod
+    def create_initial_commit(spec, journal):
+        """Commit the files the scaffolder generated as the project's first commit."""
+        generated = list(journal.files) if journal is not None else []
+        InitialCommit.create(spec.directory, generated, [spec.project_name, *spec.app_names])
 
     @staticmethod
-    def run(project_name, app_name, install_tailwind):
+    def run(spec, offline=False):
         """Run the main setup process for creating the Django project and app."""
-        install_dir = DirectoryManager.prompt_for_directory()
-        PackageManager.check_and_install_snapd()
+        if spec.directory is None:
+            spec.directory = DirectoryManager.prompt_for_directory()
+        else:
+            spec.directory = DirectoryManager.prepare_directory(spec.directory)
+
+        try:
+            TemplatePack.get(spec.template_pack)
+        except ValueError as e:
+            print(f"{e} Available packs: {', '.join(TemplatePack.available())}.")
+            sys.exit(1)
+        if spec.workspace is not None:
+            try:
+                spec.workspace = EnvironmentManager.validate_workspace(spec.workspace, spec.directory)
+            except ValueError as e:
+                print(e)
+                sys.exit(1)
+        if offline:
+            Application.check_offline([spec])
+
+        if spec.install_tailwind:
+            spec.install_tailwind = DjangoProjectManager.confirm_tailwind_installation()
+        Application.check_toolchain([spec])
+        try:
+            Application.scaffold(spec)
+        except subprocess.CalledProcessError as e:
+            print(e)
+            sys.exit(1)
+
+    @staticmethod
+    def run_batch(manifest_path, max_workers=None, use_snapshot_cache=False, offline=False):
+        """Scaffold every project listed in a manifest concurrently and report per-project results."""
+        try:
+            specs, manifest_workers = BatchManager.load_manifest(manifest_path)
+            for spec in specs:
+                spec.use_snapshot_cache = spec.use_snapshot_cache or use_snapshot_cache
+            for spec in specs:
+                DirectoryManager.validate_directory(spec.directory)
+                TemplatePack.get(spec.template_pack)
+                if spec.workspace is not None:
+                    spec.workspace = EnvironmentManager.validate_workspace(spec.workspace, spec.directory)
+        except (OSError, ValueError) as e:
+            print(f"Invalid manifest: {e}")
+            return False
+
+        if offline:
+            Application.check_offline(specs)
+        for spec in specs:
+            DirectoryManager.prepare_directory(spec.directory)
+
+        # Tool checks may prompt, so they run once up front rather than in the workers.
+        Application.check_toolchain(specs)
+        CommandRunner.show_project = len(specs) > 1
 
-        # Check and initialize UV environment only if not already initialized
-        if not os.path.exists(os.path.join(install_dir, 'pyproject.toml')):
-            EnvironmentManager.initialize_uv()
+        results = BatchManager.run(specs, Application.scaffold, max_workers or manifest_workers)
+        return BatchManager.print_report(results)
+
+    @staticmethod
+    def serve(socket_path, workers, queue_size, history, use_snapshot_cache=False, offline=False, template_packs=('default',)):
+        """Run the scaffold server, probing the tools and loading the template packs once for every job."""
+        try:
+            packs = [TemplatePack.get(name) for name in template_packs]
+        except ValueError as e:
+            print(f"{e} Available packs: {', '.join(TemplatePack.available())}.")
+            sys.exit(1)
+        # Jobs must never prompt, so missing tools are offered for installation now, before any job runs.
+        Application.check_toolchain([])
+        Toolchain.probe(['npm', 'npx'])
+        for pack in packs:
+            pack.digest()
+            for section in TemplatePack.SECTIONS:
+                pack.compiled(section)
+
+        def scaffold(spec):
+            spec.use_snapshot_cache = spec.use_snapshot_cache or use_snapshot_cache
+            Application.run_job(spec, offline)
+
+        ScaffoldServer(socket_path, scaffold, workers, queue_size, history).serve_forever()
+
+    @staticmethod
+    def run_job(spec, offline=False):
+        """Scaffold one project submitted to the server: like ``run``, but without any prompt."""
+        try:
+            spec.directory = DirectoryManager.validate_directory(spec.directory)
+            TemplatePack.get(spec.template_pack)
+            if spec.workspace is not None:
+                spec.workspace = EnvironmentManager.validate_workspace(spec.workspace, spec.directory)
+        except ValueError as e:
+            print(e)
+            sys.exit(1)
+        if offline:
+            Application.check_offline([spec])
+        DirectoryManager.prepare_directory(spec.directory)
+        Application.check_toolchain([spec])
+        Application.scaffold(spec)
+
+    @staticmethod
+    def plan(specs, output_format='text'):
+        """Report what scaffolding ``specs`` would do and any conflicts with their targets; return True if there are none."""
+        reports = []
+        for spec in specs:
+            try:
+                spec.directory = DirectoryManager.validate_directory(spec.directory)
+                TemplatePack.get(spec.template_pack)
+                if spec.workspace is not None:
+                    spec.workspace = EnvironmentManager.validate_workspace(spec.workspace, spec.directory)
+            except ValueError as e:
+                reports.append({'project': spec.label, 'directory': spec.directory, 'conflicts': [str(e)]})
+                continue
+            reports.append(RunPlanner.preflight(spec, Application.build_steps(spec), Application.signature(spec)))
+
+        if output_format == 'json':
+            RunPlanner.print_json(reports)
         else:
-            print("Project is already initialized with UV environment.")
+            for report in reports:
+                if 'steps' in report:
+                    RunPlanner.print_report(report)
+                else:
+                    print(f"Plan for {report['project']}: {report['conflicts'][0]}")
+        return not any(report['conflicts'] for report in reports)
+
+    @staticmethod
+    def check_offline(specs):
+        """Exit before any work starts if one of the projects would need the network."""
+        problems = Prewarm.check_offline(specs)
+        if problems:
+            print("Cannot scaffold offline:")
+            for problem in problems:
+                print(f"  {problem}")
+            print("Run 'python main.py prewarm' with the same versions while online first.")
+            sys.exit(1)
+
+    @staticmethod
+    def check_toolchain(specs):
+        """Probe every tool the given projects need in one concurrent pass, then offer to install missing ones."""
+        needs_npm = any(spec.install_tailwind and spec.tailwind_mode == 'npm' for spec in specs)
+        tools = Toolchain.probe(['snap', 'uv', 'git'] + (['npm', 'npx'] if needs_npm else []))
+
+        PackageManager.check_and_install_snapd()
+        EnvironmentManager.check_and_install_uv()
+        PackageManager.check_and_install_git()
+        if needs_npm and not (tools['npm'].installed and tools['npx'].installed):
+            print("Tailwind CSS setup requires Node.js and npm. Install them or use --no-tailwind.")
+            sys.exit(1)
 
-        EnvironmentManager.check_uv_installed()
-        Application.initialize_git(install_dir)
-        EnvironmentManager.add_django()
-        DjangoProjectManager.create_django_project(project_name, app_name)
+    @staticmethod
+    def scaffold(spec):
+        """Create one project in ``spec.directory`` without touching the process-wide working directory."""
+        recorder = TraceRecorder.instance()
+        journal = GenerationJournal.open(spec.directory, Application.signature(spec))
+        try:
+            resuming_snapshot = journal.is_done('snapshot_materialize')
+            if spec.use_snapshot_cache and spec.workspace:
+                print("The snapshot cache is not used for uv workspace members; building the project instead.")
+            if spec.use_snapshot_cache and not spec.workspace and (resuming_snapshot or SnapshotCache.is_fresh_target(spec.directory)):
+                if not resuming_snapshot:
+                    snapshot = SnapshotCache.ensure(spec, Application.build_project)
+                    with recorder.step('snapshot_materialize', spec.label):
+                        SnapshotCache.materialize(snapshot, spec.directory, spec.project_name, spec.app_names)
+                    journal.mark_done('snapshot_materialize')
+                if not journal.is_done('git_init'):
+                    with recorder.step('git_init', spec.label):
+                        Application.initialize_git(spec.directory)
+                    journal.mark_done('git_init')
+                if spec.initial_commit and not journal.is_done('git_commit'):
+                    with recorder.step('git_commit', spec.label):
+                        Application.create_initial_commit(spec, journal)
+                    journal.mark_done('git_commit')
+                SnapshotCache.evict()
+            else:
+                Application.build_project(spec, journal)
+            journal.mark_complete()
+            if spec.profile == 'production':
+                print(f"manage.py still uses the development settings; pass --settings={spec.project_name}.production "
+                      "to collectstatic, migrate and other production commands.")
+        finally:
+            journal.close()
+
+    @staticmethod
+    def signature(spec):
+        """Identify the inputs that shape the generated tree; a journal from different inputs is not resumed."""
+        fields = [spec.project_name, spec.app_names, spec.install_tailwind and spec.tailwind_mode, spec.django_version, spec.python_version,
+                  TemplatePack.get(spec.template_pack).digest(), spec.tailwind_version, spec.profile, spec.load_test]
+        return hashlib.sha256(json.dumps(fields).encode()).hexdigest()
+
+    @staticmethod
+    def build_project(spec, journal=None):
+        """Create one project by running its scaffold steps, overlapping the ones that don't depend on each other."""
+        scheduler = Application.build_steps(spec, journal)
+        scheduler.run()
+        scheduler.print_critical_path()
+
+    @staticmethod
+    def build_steps(spec, journal=None):
+        """Declare the scaffold steps for ``spec`` as a dependency graph of named artifacts."""
+        install_dir = spec.directory
+        app_names = spec.app_names
+        scheduler = StepScheduler(spec.step_workers, TraceRecorder.instance(), spec.label, journal)
+
+        def initialize_uv():
+            # Check and initialize UV environment only if not already initialized
+            if not os.path.exists(os.path.join(install_dir, 'pyproject.toml')):
+                EnvironmentManager.initialize_uv(install_dir, spec.python_version, spec.workspace)
+            else:
+                print("Project is already initialized with UV environment.")
 
-        if install_tailwind:
-            DjangoProjectManager.prompt_tailwind_installation(app_name)
+        scheduler.add('uv_init', initialize_uv, outputs=['pyproject'])
+        # uv init may create the repository itself, so git init waits for it to keep the same outcome.
+        scheduler.add('git_init', lambda: Application.initialize_git(install_dir, spec.workspace), inputs=['pyproject'], outputs=['git'])
+        scheduler.add('add_django', lambda: EnvironmentManager.add_django(install_dir, spec.django_version, spec.workspace, spec.packages),
+                      inputs=['pyproject'], outputs=['django'])
+        scheduler.add('startproject', lambda: DjangoProjectManager.start_project_and_apps(
+                          install_dir, spec.project_name, app_names, spec.in_process_templates, spec.step_workers),
+                      inputs=['django'], outputs=['project', 'apps'])
+        scheduler.add('site_files', lambda: DjangoProjectManager.create_site_files(
+                          install_dir, spec.project_name, spec.template_pack, spec.install_tailwind),
+                      outputs=['site_templates', 'static_dirs'])
+        scheduler.add('app_files', lambda: DjangoProjectManager.create_apps_files(
+                          install_dir, app_names, spec.project_name, spec.template_pack, spec.step_workers),
+                      inputs=['apps'], outputs=['app_templates'])
+        scheduler.add('register_apps', lambda: DjangoProjectManager.register_apps(install_dir, spec.project_name, app_names),
+                      inputs=['project', 'apps'], outputs=['app_registry'])
+        # Waits for register_apps, which also rewrites settings.py.
+        scheduler.add('static_pipeline', lambda: DjangoProjectManager.configure_static_pipeline(
+                          install_dir, spec.project_name, spec.template_pack),
+                      inputs=['project', 'app_registry'], outputs=['static_storage'])
+        if spec.load_test:
+            scheduler.add('load_test', lambda: DjangoProjectManager.create_load_test(
+                              install_dir, spec.project_name, app_names, spec.template_pack),
+                          inputs=['apps'], outputs=['load_test_command'])
+        if spec.profile == 'production':
+            # Runs after the site files because it replaces their .env and .env-template.
+            scheduler.add('production_profile', lambda: DjangoProjectManager.apply_production_profile(
+                              install_dir, spec.project_name, spec.template_pack),
+                          inputs=['project', 'site_templates'], outputs=['production_settings'])
+
+        if spec.install_tailwind and spec.tailwind_mode == 'standalone':
+            # ensure() is a cache lookup after the first call, so every step can ask for the binary; resumed runs skip steps.
+            binary = lambda: TailwindStandalone.ensure(spec.tailwind_version)
+            scheduler.add('tailwind_binary', binary, outputs=['tailwind_cli'])
+            scheduler.add('tailwind_configure', lambda: DjangoProjectManager.configure_tailwind_standalone(
+                              install_dir, app_names, binary()),
+                          inputs=['tailwind_cli', 'static_dirs'], outputs=['tailwind_sources'])
+            scheduler.add('tailwind_build', lambda: DjangoProjectManager.build_tailwind_standalone(install_dir, binary()),
+                          inputs=['tailwind_cli', 'tailwind_sources', 'site_templates', 'app_templates'],
+                          outputs=['output_css'])
+        elif spec.install_tailwind:
+            scheduler.add('tailwind_install', lambda: DjangoProjectManager.install_tailwind_packages(
+                              install_dir, spec.tailwind_version, spec.use_node_store),
+                          outputs=['node_modules', 'tailwind_config'])
+            scheduler.add('tailwind_configure', lambda: DjangoProjectManager.configure_tailwind(install_dir, app_names),
+                          inputs=['tailwind_config', 'static_dirs'], outputs=['tailwind_sources'])
+            scheduler.add('tailwind_build', lambda: DjangoProjectManager.build_tailwind(install_dir),
+                          inputs=['node_modules', 'tailwind_sources', 'site_templates', 'app_templates'],
+                          outputs=['output_css'])
         else:
-            print("Skipping Tailwind CSS installation. Only style.css has been created.")
+            def create_style_css():
+                DjangoProjectManager.create_style_css(install_dir)
+                print("Skipping Tailwind CSS installation. Only style.css has been created.")
+            scheduler.add('style_css', create_style_css, inputs=['static_dirs'], outputs=['style_css'])
+
+        if spec.initial_commit:
+            # Last step: it commits what every other step produced.
+            outputs = [output for step in scheduler.steps.values() for output in step.outputs]
+            scheduler.add('git_commit', lambda: Application.create_initial_commit(spec, journal), inputs=outputs, outputs=['initial_commit'])
+
+        return scheduler
+
+def prewarm(argv):
+    parser = argparse.ArgumentParser(prog='main.py prewarm', description="Cache Django and Tailwind locally so later scaffolds can run with --offline.")
+    parser.add_argument('--django-version', help="Django version to cache (default: latest)")
+    parser.add_argument('--python-version', help="Python version to resolve for")
+    parser.add_argument('--with', dest='packages', action='append', default=[], metavar='PACKAGE', help="Also cache this package (repeatable)")
+    parser.add_argument('--profile', choices=ProjectSpec.PROFILES, default='development', help="Also cache the packages this scaffold profile adds")
+    parser.add_argument('--tailwind', choices=ProjectSpec.TAILWIND_MODES + ('none',), default='npm', help="Tailwind install to cache, matching the scaffold's --tailwind")
+    parser.add_argument('--tailwind-version', help="Tailwind CSS version, range or dist-tag to cache (default: latest)")
+    args = parser.parse_args(argv)
+
+    Toolchain.probe(['uv'] + (['npm', 'npx'] if args.tailwind == 'npm' else []))
+    EnvironmentManager.check_and_install_uv()
+    packages = [*ProjectSpec.PROFILE_PACKAGES[args.profile], *args.packages]
+    Prewarm.run(args.django_version, args.python_version, packages,
+                None if args.tailwind == 'none' else args.tailwind, args.tailwind_version)
+
+def add_command_arguments(parser):
+    parser.add_argument('--command-timeout', type=float, default=CommandRunner.timeout, metavar='SECONDS', help="Stop an external command (uv, npm, git, ...) that runs longer than this; 0 waits forever")
+    parser.add_argument('--retries', type=int, default=CommandRunner.network_retries, help="Times a failed network command (uv add, npm install, ...) is retried with backoff")
+    parser.add_argument('--max-commands', type=int, default=CommandRunner.max_concurrent, help="Number of external commands run at the same time across all steps and projects")
+
+def apply_command_arguments(args):
+    CommandRunner.timeout = args.command_timeout
+    CommandRunner.network_retries = max(args.retries, 0)
+    CommandRunner.max_concurrent = max(args.max_commands, 1)
+
+def serve(argv):
+    parser = argparse.ArgumentParser(prog='main.py serve', description="Scaffold projects submitted over a local socket, keeping tools and template packs warm between jobs.")
+    parser.add_argument('--socket', default=ScaffoldServer.default_socket_path(), help="Unix socket to listen on")
+    parser.add_argument('--workers', type=int, default=2, help="Number of projects scaffolded at the same time")
+    parser.add_argument('--queue-size', type=int, default=16, help="Number of jobs that may wait for a worker; further submissions are rejected")
+    parser.add_argument('--history', type=int, default=100, help="Number of finished jobs kept for 'jobs' and 'jobs --watch'")
+    parser.add_argument('--template-pack', dest='template_packs', action='append', metavar='PACK', help="Template pack to load up front (repeatable; default: default)")
+    parser.add_argument('--snapshot-cache', action='store_true', help="Materialize every job from the snapshot cache when possible")
+    parser.add_argument('--offline', action='store_true', help="Never touch the network; jobs fail unless 'prewarm' has cached what they need")
+    add_command_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.workers < 1 or args.queue_size < 1:
+        parser.error("--workers and --queue-size must be at least 1")
+
+    apply_command_arguments(args)
+    if args.offline:
+        Prewarm.enable_offline()
+    Application.serve(args.socket, args.workers, args.queue_size, args.history, args.snapshot_cache, args.offline,
+                      args.template_packs or ['default'])
+
+def submit(argv):
+    parser = argparse.ArgumentParser(prog='main.py submit', description="Scaffold a project on the running scaffold server and stream its progress.")
+    parser.add_argument('project_name', help="Name of the Django project to create")
+    parser.add_argument('app_names', nargs='*', metavar='app_name', help="(Optional) Names of the Django apps to create, space- or comma-separated")
+    parser.add_argument('--directory', required=True, help="Installation directory")
+    parser.add_argument('--no-tailwind', action='store_true', help="Skip Tailwind CSS installation")
+    parser.add_argument('--tailwind', choices=ProjectSpec.TAILWIND_MODES, default='npm', help="Install Tailwind CSS with npm or the standalone executable")
+    parser.add_argument('--tailwind-version', help="Tailwind CSS version, range or dist-tag to install")
+    parser.add_argument('--django-version', help="Pin the Django version added to the environment")
+    parser.add_argument('--python-version', help="Python version passed to 'uv init'")
+    parser.add_argument('--profile', choices=ProjectSpec.PROFILES, default='development', help="Settings profile to generate")
+    parser.add_argument('--load-test', action='store_true', help="Add the 'loadtest' management command")
+    parser.add_argument('--initial-commit', action='store_true', help="Commit the generated files as the repository's first commit")
+    parser.add_argument('--template-pack', default='default', help="Built-in template pack name, or path to a pack directory")
+    parser.add_argument('--workspace', nargs='?', const='', metavar='ROOT', help="Add the project to an existing uv workspace")
+    parser.add_argument('--snapshot-cache', action='store_true', help="Materialize the project from the snapshot cache when possible")
+    parser.add_argument('--detach', action='store_true', help="Print the job number and return instead of streaming its progress")
+    parser.add_argument('--json', action='store_true', help="Print the server's events as JSON lines")
+    parser.add_argument('--socket', default=ScaffoldServer.default_socket_path(), help="Unix socket of the server")
+    args = parser.parse_args(argv)
+
+    # The server resolves paths in its own working directory, so they are made absolute here.
+    template_pack = args.template_pack
+    if os.sep in template_pack or template_pack.startswith('.'):
+        template_pack = os.path.abspath(template_pack)
+    project = {
+        'name': args.project_name,
+        'apps': args.app_names,
+        'directory': os.path.abspath(args.directory),
+        'tailwind': False if args.no_tailwind else args.tailwind,
+        'tailwind_version': args.tailwind_version,
+        'django': args.django_version,
+        'python': args.python_version,
+        'profile': args.profile,
+        'load_test': args.load_test,
+        'initial_commit': args.initial_commit,
+        'template_pack': template_pack,
+        'workspace': True if args.workspace == '' else args.workspace and os.path.abspath(args.workspace),
+        'snapshot_cache': args.snapshot_cache,
+    }
+    sys.exit(0 if ScaffoldClient.submit(args.socket, project, not args.detach, args.json) else 1)
+
+def jobs(argv):
+    parser = argparse.ArgumentParser(prog='main.py jobs', description="List the scaffold server's jobs, follow one, or stop the server.")
+    parser.add_argument('--watch', type=int, metavar='JOB', help="Stream a job's output until it finishes")
+    parser.add_argument('--stop', action='store_true', help="Stop the server once its running jobs finish")
+    parser.add_argument('--json', action='store_true', help="Print the server's events as JSON lines")
+    parser.add_argument('--socket', default=ScaffoldServer.default_socket_path(), help="Unix socket of the server")
+    args = parser.parse_args(argv)
+
+    if args.stop:
+        ScaffoldClient.shutdown(args.socket)
+    elif args.watch is not None:
+        sys.exit(0 if ScaffoldClient.watch(args.socket, args.watch, args.json) else 1)
+    else:
+        ScaffoldClient.print_jobs(args.socket, args.json)
 
 def main():
+    commands = {'prewarm': prewarm, 'serve': serve, 'submit': submit, 'jobs': jobs}
+    if sys.argv[1:2] and sys.argv[1] in commands:
+        commands[sys.argv[1]](sys.argv[2:])
+        sys.exit(0)
+
     parser = argparse.ArgumentParser(description="Setup Django project with optional Tailwind CSS.")
-    parser.add_argument('project_name', help="Name of the Django project to create")
-    parser.add_argument('app_name', nargs='?', help="(Optional) Name of the Django app to create")
+    parser.add_argument('project_name', nargs='?', help="Name of the Django project to create")
+    parser.add_argument('app_names', nargs='*', metavar='app_name', help="(Optional) Names of the Django apps to create, space- or comma-separated")
     parser.add_argument('--no-tailwind', action='store_true', help="Skip Tailwind CSS installation")
+    parser.add_argument('--tailwind', choices=ProjectSpec.TAILWIND_MODES, default='npm', help="Install Tailwind CSS with npm, or use the standalone Tailwind executable without Node.js")
+    parser.add_argument('--directory', help="Installation directory (skips the interactive prompt)")
+    parser.add_argument('--manifest', help="TOML manifest listing many projects to scaffold concurrently")
+    parser.add_argument('--workers', type=int, help="Number of projects to scaffold in parallel with --manifest")
+    parser.add_argument('--step-workers', type=int, default=4, help="Number of independent scaffold steps to run concurrently per project")
+    parser.add_argument('--trace', metavar='PATH', help="Write per-step timings as a Chrome trace to PATH and a JSON summary next to it")
+    parser.add_argument('--django-version', help="Pin the Django version added to the environment")
+    parser.add_argument('--python-version', help="Python version passed to 'uv init'")
+    parser.add_argument('--tailwind-version', help="Tailwind CSS version, range or dist-tag to install (default: latest)")
+    parser.add_argument('--no-node-store', action='store_true', help="Run npm in the project instead of linking node_modules from the shared store")
+    parser.add_argument('--node-store-gc', action='store_true', help="Remove Tailwind versions unused for --node-store-max-age days from the shared store, then exit")
+    parser.add_argument('--node-store-max-age', type=int, default=NodeModulesStore.max_age_days, help="Age in days after which --node-store-gc removes an unused version")
+    parser.add_argument('--workspace', nargs='?', const='', metavar='ROOT', help="Add the project to an existing uv workspace (found above --directory unless ROOT is given), sharing its lock and environment")
+    parser.add_argument('--plan', nargs='?', const='text', choices=('text', 'json'), help="Print the files, commands and estimated time of the run and check the target for conflicts, without running anything; exits 1 on conflicts")
+    parser.add_argument('--offline', action='store_true', help="Never touch the network; fail before starting unless 'prewarm' has cached everything needed")
+    parser.add_argument('--profile', choices=ProjectSpec.PROFILES, default='development', help="'production' adds settings tuned for serving (cached templates, persistent connections, caching, SQLite WAL) and a gunicorn config")
+    parser.add_argument('--initial-commit', action='store_true', help="Commit the generated files (minus anything .gitignore excludes) as the repository's first commit")
+    parser.add_argument('--load-test', action='store_true', help="Add a 'loadtest' management command that measures the generated pages' latency and throughput")
+    parser.add_argument('--template-pack', default='default', help="Built-in template pack name, or path to a pack directory, used for the generated pages and files")
+    parser.add_argument('--snapshot-cache', action='store_true', help="Materialize the project from a local snapshot cache when possible")
+    parser.add_argument('--django-admin-subprocess', action='store_true', help="Run django-admin/manage.py through uv instead of rendering Django's templates in-process")
+    parser.add_argument('--snapshot-cache-max-mb', type=int, default=SnapshotCache.max_bytes // 1024 ** 2, help="Evict snapshots beyond this total size")
+    parser.add_argument('--snapshot-cache-max-age', type=int, default=SnapshotCache.max_age_days, help="Evict snapshots unused for this many days")
+    add_command_arguments(parser)
     args = parser.parse_args()
 
-    Application.run(args.project_name, args.app_name, not args.no_tailwind)
+    SnapshotCache.max_bytes = args.snapshot_cache_max_mb * 1024 ** 2
+    SnapshotCache.max_age_days = args.snapshot_cache_max_age
+    apply_command_arguments(args)
+
+    if args.node_store_gc:
+        NodeModulesStore.gc(args.node_store_max_age)
+        sys.exit(0)
+
+    if args.manifest and args.project_name:
+        parser.error("project_name cannot be combined with --manifest")
+    if not args.manifest and not args.project_name:
+        parser.error("project_name is required unless --manifest is given")
+
+    if args.manifest and args.app_names:
+        parser.error("app names cannot be combined with --manifest")
+
+    if args.offline:
+        Prewarm.enable_offline()
+
+    if args.plan:
+        if not args.manifest and not args.directory:
+            parser.error("--plan needs --directory or --manifest")
+        try:
+            specs = BatchManager.load_manifest(args.manifest)[0] if args.manifest else [None]
+        except (OSError, ValueError) as e:
+            print(f"Invalid manifest: {e}")
+            sys.exit(1)
+
+    try:
+        if args.manifest:
+            if args.plan:
+                sys.exit(0 if Application.plan(specs, args.plan) else 1)
+            sys.exit(0 if Application.run_batch(args.manifest, args.workers, args.snapshot_cache, args.offline) else 1)
+        try:
+            spec = ProjectSpec(
+                args.project_name,
+                args.app_names,
+                directory=args.directory,
+                install_tailwind=not args.no_tailwind,
+                django_version=args.django_version,
+                python_version=args.python_version,
+                use_snapshot_cache=args.snapshot_cache,
+                in_process_templates=not args.django_admin_subprocess,
+                step_workers=args.step_workers,
+                template_pack=args.template_pack,
+                tailwind_version=args.tailwind_version,
+                tailwind_mode=args.tailwind,
+                workspace=args.workspace,
+                use_node_store=not args.no_node_store,
+                profile=args.profile,
+                load_test=args.load_test,
+                initial_commit=args.initial_commit,
+            )
+        except ValueError as e:
+            parser.error(str(e))
+        if args.plan:
+            sys.exit(0 if Application.plan([spec], args.plan) else 1)
+        Application.run(spec, args.offline)
+    finally:
+        if args.trace:
+            TraceRecorder.instance().write(args.trace)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,265 @@
+import hashlib
+import json
+import os
+import platform
+import re
+import shutil
+import sys
+import threading
+import time
+import uuid
+from command_runner import CommandRunner
+from directory_manager import DirectoryManager
+
+class NodeModulesStore:
+    """Shared store of Tailwind installs, linked into projects instead of running npm in every one.
+
+    Each entry is the result of ``npm init -y``, ``npm install tailwindcss@<version>`` and
+    ``npx tailwindcss init`` for one resolved Tailwind version on one platform, stored under a
+    hash of those inputs. Projects receive hardlinks to the entry's node_modules and copies of its
+    package.json, lockfile and tailwind.config.js. Once a version is stored, linking it needs no
+    network, and resolving "latest" falls back to the newest stored version when npm is unreachable.
+    """
+
+    PACKAGE = 'tailwindcss'
+    # How long a resolved range such as "latest" is trusted before asking the registry again.
+    RESOLUTION_TTL = 24 * 3600
+    # Seconds ``npm view`` may take before the registry counts as unreachable.
+    VIEW_TIMEOUT = 30
+    STAGING_PREFIX = '.staging-'
+
+    max_age_days = 30
+    # Set by --offline: never ask the registry, only use what is stored.
+    offline = False
+
+    _key_locks = {}
+    _key_locks_guard = threading.Lock()
+    _resolutions_lock = threading.Lock()
+
+    @staticmethod
+    def store_directory():
+        """Return the directory holding the store's entries."""
+        return DirectoryManager.cache_directory('node_modules')
+
+    @staticmethod
+    def key(version):
+        """Return the store key for an exact Tailwind version on this platform."""
+        parts = {'package': NodeModulesStore.PACKAGE, 'version': version,
+                 'platform': sys.platform, 'machine': platform.machine()}
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()[:16]
+
+    @staticmethod
+    def install(directory, requested_version=None):
+        """Link Tailwind into ``directory`` from the store, building the entry first if needed.
+
+        Returns False if no version could be resolved (offline with an empty store), so the caller
+        can fall back to a plain npm install.
+        """
+        version = NodeModulesStore.resolve_version(requested_version)
+        if version is None:
+            return False
+
+        entry = NodeModulesStore.ensure(version)
+        name = NodeModulesStore._package_name(directory)
+        for filename in ('package.json', 'package-lock.json'):
+            source = os.path.join(entry, filename)
+            if os.path.exists(source):
+                with open(source) as f:
+                    data = json.load(f)
+                data['name'] = name
+                if filename == 'package-lock.json' and '' in data.get('packages', {}):
+                    data['packages']['']['name'] = name
+                DirectoryManager.write_file(os.path.join(directory, filename), json.dumps(data, indent=2) + "\n")
+        with open(os.path.join(entry, 'tailwind.config.js')) as f:
+            DirectoryManager.write_file(os.path.join(directory, 'tailwind.config.js'), f.read())
+        DirectoryManager.link_tree(os.path.join(entry, 'node_modules'), os.path.join(directory, 'node_modules'))
+
+        NodeModulesStore._touch(entry)
+        print(f"Linked {NodeModulesStore.PACKAGE} {version} from the shared node_modules store.")
+        return True
+
+    @staticmethod
+    def resolve_version(requested=None):
+        """Return the exact Tailwind version for ``requested`` (a version, range or dist-tag; default latest).
+
+        Exact versions are returned as-is. Ranges are resolved through ``npm view`` and remembered
+        for RESOLUTION_TTL. If npm can't be reached, the newest stored version is used instead, or
+        None if the store is empty.
+        """
+        if requested and re.fullmatch(r'\d+\.\d+\.\d+(?:[-+][\w.-]+)?', requested):
+            return requested
+
+        spec = requested or 'latest'
+        resolutions = NodeModulesStore._load_resolutions()
+        cached = resolutions.get(spec)
+        if cached and time.time() - cached['resolved'] < NodeModulesStore.RESOLUTION_TTL:
+            return cached['version']
+
+        version = None if NodeModulesStore.offline else NodeModulesStore._npm_view(spec)
+        if version is not None:
+            with NodeModulesStore._resolutions_lock:
+                resolutions = NodeModulesStore._load_resolutions()
+                resolutions[spec] = {'version': version, 'resolved': time.time()}
+                NodeModulesStore._save_resolutions(resolutions)
+            return version
+
+        stored = NodeModulesStore.stored_versions()
+        if cached and cached['version'] in stored:
+            version = cached['version']
+        elif stored and spec == 'latest':
+            version = stored[-1]
+        else:
+            print(f"Could not resolve {NodeModulesStore.PACKAGE}@{spec} and no matching version is stored.")
+            return None
+        if not NodeModulesStore.offline:
+            print(f"npm registry unreachable; using stored {NodeModulesStore.PACKAGE} {version}.")
+        return version
+
+    @staticmethod
+    def stored_versions():
+        """Return the Tailwind versions in the store for this platform, oldest first."""
+        versions = {meta['version'] for _, meta in NodeModulesStore._entries()
+                    if meta.get('key') == NodeModulesStore.key(meta.get('version'))}
+        return sorted(versions, key=NodeModulesStore._version_key)
+
+    @staticmethod
+    def ensure(version):
+        """Return the store entry for ``version``, installing it on a miss."""
+        key = NodeModulesStore.key(version)
+        path = os.path.join(NodeModulesStore.store_directory(), key)
+        with NodeModulesStore._lock_for(key):
+            if os.path.isfile(os.path.join(path, 'meta.json')):
+                return path
+            if NodeModulesStore.offline:
+                print(f"{NodeModulesStore.PACKAGE} {version} is not in the node_modules store and --offline forbids installing it.")
+                sys.exit(1)
+            print(f"Installing {NodeModulesStore.PACKAGE} {version} into the shared node_modules store.")
+            return NodeModulesStore.build(key, version)
+
+    @staticmethod
+    def build(key, version):
+        """Run npm in a staging directory and move the result into the store atomically."""
+        store = NodeModulesStore.store_directory()
+        staging = os.path.join(store, f"{NodeModulesStore.STAGING_PREFIX}{uuid.uuid4().hex}")
+        os.makedirs(staging)
+        try:
+            CommandRunner.run(["npm", "init", "-y"], check=True, cwd=staging)
+            CommandRunner.run(["npm", "install", f"{NodeModulesStore.PACKAGE}@{version}"], check=True, cwd=staging,
+                              retries=CommandRunner.network_retries)
+            CommandRunner.run(["npx", "tailwindcss", "init"], check=True, cwd=staging)
+
+            now = time.time()
+            meta = {'key': key, 'package': NodeModulesStore.PACKAGE, 'version': version, 'created': now,
+                    'last_used': now, 'size': DirectoryManager.tree_size(staging)}
+            with open(os.path.join(staging, 'meta.json'), 'w') as f:
+                json.dump(meta, f)
+
+            path = os.path.join(store, key)
+            try:
+                os.rename(staging, path)
+            except OSError:
+                # Another process stored the same version first; keep theirs.
+                shutil.rmtree(staging, ignore_errors=True)
+            return path
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+    @staticmethod
+    def gc(max_age_days=None):
+        """Remove versions unused for ``max_age_days`` and abandoned staging directories; return the bytes freed.
+
+        The most recently used version is always kept so the store can still serve offline runs.
+        """
+        max_age_days = NodeModulesStore.max_age_days if max_age_days is None else max_age_days
+        cutoff = time.time() - max_age_days * 86400
+        store = NodeModulesStore.store_directory()
+        freed = 0
+
+        entries = sorted(NodeModulesStore._entries(), key=lambda item: item[1].get('last_used', 0))
+        for path, meta in entries[:-1]:
+            if meta.get('last_used', 0) < cutoff:
+                freed += meta.get('size', 0)
+                shutil.rmtree(path, ignore_errors=True)
+                print(f"Removed {meta.get('package')} {meta.get('version')} from the node_modules store.")
+
+        for name in os.listdir(store):
+            path = os.path.join(store, name)
+            if name.startswith(NodeModulesStore.STAGING_PREFIX) and os.path.getmtime(path) < time.time() - 86400:
+                freed += DirectoryManager.tree_size(path)
+                shutil.rmtree(path, ignore_errors=True)
+
+        print(f"node_modules store: freed {freed / 1024 ** 2:.1f} MB, {len(NodeModulesStore._entries())} versions kept.")
+        return freed
+
+    @staticmethod
+    def _entries():
+        """Return ``(path, meta)`` for every complete entry in the store."""
+        store = NodeModulesStore.store_directory()
+        entries = []
+        for name in os.listdir(store):
+            if name.startswith('.'):
+                continue
+            try:
+                with open(os.path.join(store, name, 'meta.json')) as f:
+                    entries.append((os.path.join(store, name), json.load(f)))
+            except (OSError, ValueError):
+                continue
+        return entries
+
+    @staticmethod
+    def _npm_view(spec):
+        """Ask the registry which version ``spec`` resolves to; None if npm or the network is unavailable."""
+        try:
+            result = CommandRunner.capture(["npm", "view", f"{NodeModulesStore.PACKAGE}@{spec}", "version", "--json"],
+                                           check=False, timeout=NodeModulesStore.VIEW_TIMEOUT)
+            output = result.stdout.decode(errors='replace')
+            versions = json.loads(output) if result.returncode == 0 and output.strip() else None
+        except (OSError, ValueError):
+            return None
+        if isinstance(versions, list):
+            return max(versions, key=NodeModulesStore._version_key) if versions else None
+        return versions
+
+    @staticmethod
+    def _version_key(version):
+        return tuple(int(part) if part.isdigit() else 0 for part in re.split(r'[.+-]', version or ''))
+
+    @staticmethod
+    def _package_name(directory):
+        """Derive the package name ``npm init -y`` would give a project in ``directory``."""
+        name = re.sub(r'[^a-z0-9._~-]+', '-', os.path.basename(os.path.abspath(directory)).lower())
+        return name.lstrip('._') or 'project'
+
+    @staticmethod
+    def _resolutions_path():
+        return os.path.join(NodeModulesStore.store_directory(), '.resolutions.json')
+
+    @staticmethod
+    def _load_resolutions():
+        try:
+            with open(NodeModulesStore._resolutions_path()) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _save_resolutions(resolutions):
+        DirectoryManager.write_json(NodeModulesStore._resolutions_path(), resolutions, indent=2)
+
+    @staticmethod
+    def _touch(entry):
+        """Record that an entry was just used, for garbage collection."""
+        meta_path = os.path.join(entry, 'meta.json')
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            meta['last_used'] = time.time()
+            DirectoryManager.write_json(meta_path, meta)
+        except (OSError, ValueError) as e:
+            print(f"Could not update node_modules store metadata: {e}", file=sys.stderr)
+
+    @staticmethod
+    def _lock_for(key):
+        with NodeModulesStore._key_locks_guard:
+            return NodeModulesStore._key_locks.setdefault(key, threading.Lock())
@@ -1,5 +1,7 @@
 import subprocess
 import sys
+from command_runner import CommandRunner
+from toolchain import Toolchain
 
 class PackageManager:
     """Handles package management tasks like checking and installing necessary packages."""
@@ -17,13 +19,11 @@ class PackageManager:
     @staticmethod
     def check_snapd_installed():
         """Check if 'snapd' is installed."""
-        try:
-            subprocess.run(['snap', '--version'], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if Toolchain.get('snap').installed:
             print("'snapd' is already installed.")
             return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            print("'snapd' is not installed.")
-            return False
+        print("'snapd' is not installed.")
+        return False
 
     @staticmethod
     def prompt_install_snapd():
@@ -35,22 +35,32 @@ class PackageManager:
     def install_snapd():
         """Install 'snapd' using apt."""
         try:
-            subprocess.run(['sudo', 'apt', 'install', 'snapd', '-y'], check=True)
+            CommandRunner.run(['sudo', 'apt', 'install', 'snapd', '-y'], check=True, retries=CommandRunner.network_retries,
+                              interactive=True)
+            Toolchain.forget('snap')
             print("Snapd installed successfully.")
         except subprocess.CalledProcessError:
             print("Failed to install 'snapd'. Please check your system's package manager setup.")
             sys.exit(1)
 
+    @staticmethod
+    def check_and_install_git():
+        """Check if git is installed; if not, prompt the user to install it."""
+        if not PackageManager.check_git_installed():
+            if PackageManager.prompt_install_git():
+                PackageManager.install_git()
+            else:
+                print("Git installation skipped.")
+                sys.exit(1)
+
     @staticmethod
     def check_git_installed():
         """Check if 'git' is installed."""
-        try:
-            subprocess.run(['git', '--version'], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if Toolchain.get('git').installed:
             print("'git' is already installed.")
             return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            print("'git' is not installed.")
-            return False
+        print("'git' is not installed.")
+        return False
 
     @staticmethod
     def prompt_install_git():
@@ -62,7 +72,9 @@ class PackageManager:
     def install_git():
         """Install 'git' using apt."""
         try:
-            subprocess.run(['sudo', 'apt', 'install', 'git', '-y'], check=True)
+            CommandRunner.run(['sudo', 'apt', 'install', 'git', '-y'], check=True, retries=CommandRunner.network_retries,
+                              interactive=True)
+            Toolchain.forget('git')
             print("Git installed successfully.")
         except subprocess.CalledProcessError:
             print("Failed to install 'git'. Please check your system's package manager setup.")
@@ -0,0 +1,147 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+from command_runner import CommandRunner
+from directory_manager import DirectoryManager
+from environment_manager import EnvironmentManager
+from node_store import NodeModulesStore
+from tailwind_standalone import TailwindStandalone
+
+class Prewarm:
+    """Fills the local caches a scaffold needs, so that later runs can work with ``--offline``.
+
+    Django and any extra packages are resolved once in a throwaway uv project, which leaves their
+    wheels in uv's cache. Tailwind goes into the node_modules store or the standalone
+    binary cache. A record of what was prewarmed lets offline runs pin those exact versions and
+    fail before starting if something is missing.
+    """
+
+    # Key in the record for runs that leave the Python version to uv.
+    DEFAULT_PYTHON = 'default'
+
+    _record_lock = threading.Lock()
+
+    @staticmethod
+    def run(django_version=None, python_version=None, packages=(), tailwind_mode='npm', tailwind_version=None):
+        """Resolve and cache Django, ``packages`` and (unless ``tailwind_mode`` is None) Tailwind; return the record."""
+        project_dir = os.path.join(DirectoryManager.cache_directory('prewarm'), 'project')
+        shutil.rmtree(project_dir, ignore_errors=True)
+        os.makedirs(project_dir)
+
+        requirement = f"django=={django_version}" if django_version else 'django'
+        init_command = ['uv', 'init', '--bare', '--name', 'django-setup-prewarm']
+        if python_version:
+            init_command += ['--python', python_version]
+        try:
+            CommandRunner.run(init_command, check=True, cwd=project_dir)
+            CommandRunner.run(['uv', 'add', requirement, *packages], check=True, cwd=project_dir, retries=CommandRunner.network_retries)
+        except subprocess.CalledProcessError:
+            print("Failed to resolve Django with uv; check the network connection and try again.")
+            sys.exit(1)
+
+        resolved = EnvironmentManager.locked_version(project_dir, 'django') or django_version
+        with Prewarm._record_lock:
+            record = Prewarm.load()
+            Prewarm._add(record, 'django', resolved)
+            Prewarm._add(record, 'python', python_version)
+            # Which Django 'latest' meant for each Python, so offline runs pin one that resolves with it.
+            if django_version is None and resolved:
+                record.setdefault('latest_django', {})[python_version or Prewarm.DEFAULT_PYTHON] = resolved
+            for package in packages:
+                Prewarm._add(record, 'packages', package)
+            Prewarm._save(record)
+        print(f"Cached Django {resolved} in uv's cache.")
+
+        if tailwind_mode == 'npm':
+            version = NodeModulesStore.resolve_version(tailwind_version)
+            if version is None:
+                sys.exit(1)
+            NodeModulesStore.ensure(version)
+            print(f"Cached tailwindcss {version} in the node_modules store.")
+        elif tailwind_mode == 'standalone':
+            path = TailwindStandalone.ensure(tailwind_version)
+            print(f"Cached the standalone Tailwind executable at {path}.")
+        return record
+
+    @staticmethod
+    def load():
+        """Return what has been prewarmed so far."""
+        try:
+            with open(Prewarm._record_path()) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def enable_offline():
+        """Make every later uv and npm call, and every cache lookup, stay off the network."""
+        os.environ['UV_OFFLINE'] = '1'
+        os.environ['npm_config_offline'] = 'true'
+        NodeModulesStore.offline = True
+        TailwindStandalone.offline = True
+        # Offline failures are not transient, so there is nothing to retry.
+        CommandRunner.network_retries = 0
+
+    @staticmethod
+    def check_offline(specs):
+        """Pin each spec to prewarmed versions, returning a list of problems that would need the network."""
+        record = Prewarm.load()
+        problems = []
+        for spec in specs:
+            django_versions = record.get('django', [])
+            if spec.django_version is None and django_versions:
+                spec.django_version = Prewarm.latest_django(record, spec.python_version)
+            if spec.django_version not in django_versions:
+                problems.append(f"{spec.label}: Django {spec.django_version or '(latest)'} has not been prewarmed.")
+            if spec.python_version and spec.python_version not in record.get('python', []):
+                problems.append(f"{spec.label}: Python {spec.python_version} has not been prewarmed.")
+            for package in spec.packages:
+                if package not in record.get('packages', []):
+                    problems.append(f"{spec.label}: {package} has not been prewarmed.")
+
+            if not spec.install_tailwind:
+                continue
+            if spec.tailwind_mode == 'standalone':
+                if not os.path.exists(TailwindStandalone.resolve_path(spec.tailwind_version)):
+                    problems.append(f"{spec.label}: the standalone Tailwind executable has not been prewarmed.")
+            elif not spec.use_node_store:
+                problems.append(f"{spec.label}: offline Tailwind installs need the node_modules store (drop --no-node-store).")
+            else:
+                version = NodeModulesStore.resolve_version(spec.tailwind_version)
+                if version is None or version not in NodeModulesStore.stored_versions():
+                    problems.append(f"{spec.label}: tailwindcss {spec.tailwind_version or '(latest)'} has not been prewarmed.")
+                else:
+                    spec.tailwind_version = version
+        return problems
+
+    @staticmethod
+    def latest_django(record, python_version=None):
+        """Return the prewarmed Django an unpinned offline run should use with ``python_version``.
+
+        That is the version 'latest' resolved to when prewarming for the same Python, or else the
+        highest prewarmed final release (the record lists versions in the order they were added).
+        """
+        latest = record.get('latest_django', {}).get(python_version or Prewarm.DEFAULT_PYTHON)
+        if latest in record.get('django', []):
+            return latest
+        releases = [version for version in record.get('django', []) if re.fullmatch(r'\d+(?:\.\d+)*', version)]
+        if releases:
+            return max(releases, key=lambda version: tuple(map(int, version.split('.'))))
+        return record['django'][-1]
+
+    @staticmethod
+    def _add(record, key, value):
+        if value and value not in record.setdefault(key, []):
+            record[key].append(value)
+
+    @staticmethod
+    def _record_path():
+        return os.path.join(DirectoryManager.cache_directory('prewarm'), 'prewarm.json')
+
+    @staticmethod
+    def _save(record):
+        DirectoryManager.write_json(Prewarm._record_path(), record, indent=2)
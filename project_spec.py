@@ -0,0 +1,113 @@
+import os
+
+class ProjectSpec:
+    """Describes a single project to scaffold: its names, target directory and options."""
+
+    TAILWIND_MODES = ('npm', 'standalone')
+    PROFILES = ('development', 'production')
+    # Packages each profile adds to the project's environment alongside Django.
+    PROFILE_PACKAGES = {'development': (), 'production': ('gunicorn', 'brotli')}
+
+    def __init__(self, project_name, app_names=(), directory=None, install_tailwind=True,
+                 django_version=None, python_version=None, use_snapshot_cache=False,
+                 in_process_templates=True, step_workers=4, label=None, template_pack='default',
+                 tailwind_version=None, use_node_store=True, tailwind_mode='npm', workspace=None,
+                 profile='development', load_test=False, initial_commit=False):
+        self.project_name = project_name
+        self.app_names = ProjectSpec.parse_app_names(project_name, app_names)
+        self.directory = directory
+        self.install_tailwind = install_tailwind
+        self.django_version = django_version
+        self.python_version = python_version
+        self.use_snapshot_cache = use_snapshot_cache
+        self.in_process_templates = in_process_templates
+        self.step_workers = step_workers
+        self.template_pack = template_pack
+        self.tailwind_version = tailwind_version
+        self.use_node_store = use_node_store
+        if tailwind_mode not in ProjectSpec.TAILWIND_MODES:
+            raise ValueError(f"Unknown Tailwind mode '{tailwind_mode}'; use one of {', '.join(ProjectSpec.TAILWIND_MODES)}.")
+        self.tailwind_mode = tailwind_mode
+        if profile not in ProjectSpec.PROFILES:
+            raise ValueError(f"Unknown profile '{profile}'; use one of {', '.join(ProjectSpec.PROFILES)}.")
+        self.profile = profile
+        self.load_test = load_test
+        self.initial_commit = initial_commit
+        # Root of the uv workspace the project joins; '' means "find it above the project directory".
+        self.workspace = workspace
+        # Name under which this project's steps are traced and reported.
+        self.label = label or project_name
+
+    @property
+    def app_name(self):
+        """The first app, or None."""
+        return self.app_names[0] if self.app_names else None
+
+    @property
+    def packages(self):
+        """Packages added to the environment besides Django."""
+        return list(ProjectSpec.PROFILE_PACKAGES[self.profile])
+
+    @staticmethod
+    def parse_app_names(project_name, app_names):
+        """Normalize a name, a comma-separated string or a list of app names, rejecting duplicates and clashes."""
+        if not app_names:
+            return []
+        if isinstance(app_names, str):
+            app_names = [app_names]
+        names = [name.strip() for value in app_names for name in value.split(',') if name.strip()]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"App names must be unique; {', '.join(duplicates)} given more than once.")
+        if project_name in names:
+            raise ValueError(f"App '{project_name}' has the same name as the project.")
+        return names
+
+    @staticmethod
+    def from_dict(data, defaults=None, base_dir=None):
+        """Build a spec from a manifest entry, applying manifest-level defaults and resolving relative directories."""
+        merged = dict(defaults or {})
+        merged.update(data)
+
+        if 'name' not in merged:
+            raise ValueError("Manifest project entry is missing the required 'name' key.")
+
+        directory = merged.get('directory', merged['name'])
+        if base_dir and not os.path.isabs(directory):
+            directory = os.path.join(base_dir, directory)
+
+        # ``tailwind`` is either a bool or the installation mode.
+        tailwind = merged.get('tailwind', True)
+        tailwind_mode = tailwind if isinstance(tailwind, str) else 'npm'
+
+        # ``workspace`` is true (find the workspace above the project) or the workspace root.
+        workspace = merged.get('workspace')
+        if workspace is True:
+            workspace = ''
+        elif workspace is False:
+            workspace = None
+        elif workspace and base_dir and not os.path.isabs(workspace):
+            workspace = os.path.join(base_dir, workspace)
+
+        return ProjectSpec(
+            project_name=merged['name'],
+            app_names=merged.get('apps', merged.get('app')),
+            directory=os.path.abspath(directory),
+            install_tailwind=bool(tailwind),
+            django_version=merged.get('django'),
+            python_version=merged.get('python'),
+            use_snapshot_cache=merged.get('snapshot_cache', False),
+            in_process_templates=merged.get('in_process_templates', True),
+            step_workers=merged.get('step_workers', 4),
+            template_pack=merged.get('template_pack', 'default'),
+            tailwind_version=merged.get('tailwind_version'),
+            use_node_store=merged.get('node_store', True),
+            tailwind_mode=tailwind_mode,
+            workspace=workspace,
+            profile=merged.get('profile', 'development'),
+            load_test=merged.get('load_test', False),
+            initial_commit=merged.get('initial_commit', False),
+        )
+
+    def __repr__(self):
+        return f"ProjectSpec({self.project_name!r}, apps={self.app_names!r}, directory={self.directory!r})"
@@ -0,0 +1,308 @@
+import json
+import os
+import time
+from django_project_manager import DjangoProjectManager
+from django_template_engine import DjangoTemplateEngine
+from environment_manager import EnvironmentManager
+from generation_journal import GenerationJournal
+from node_store import NodeModulesStore
+from snapshot_cache import SnapshotCache
+from tailwind_standalone import TailwindStandalone
+from template_pack import TemplatePack
+
+class RunPlanner:
+    """Works out what a scaffold would create and checks it against the target, without running anything.
+
+    The plan comes from the same step graph a real run executes. Each step contributes the paths it
+    produces and the commands it would start. The target is then scanned once, descending only
+    into directories the plan touches, so an existing tree of any size costs about as much as an
+    empty one. Paths are classified by how the step treats an existing entry:
+
+    - ``create``: made by django-admin, which refuses to overwrite, so an existing one is a conflict.
+    - ``write``: written through the journal, which keeps files the user made or edited.
+    - ``replace``: rebuilt on every run (the CSS build, linked node_modules, the virtualenv).
+    - ``reuse``: the step is skipped if it already exists (pyproject.toml, .git).
+    - ``dir``: a directory that is fine to share.
+    """
+
+    # Typical seconds per step on a cold machine; pass --trace to a real run for measured timings.
+    STEP_SECONDS = {
+        'uv_init': 0.3, 'git_init': 0.05, 'add_django': 3.0, 'startproject': 0.05, 'site_files': 0.01,
+        'app_files': 0.01, 'register_apps': 0.01, 'static_pipeline': 0.01, 'load_test': 0.01,
+        'production_profile': 0.01, 'tailwind_binary': 10.0, 'tailwind_install': 20.0,
+        'tailwind_configure': 0.01, 'tailwind_build': 1.0, 'style_css': 0.01, 'git_commit': 0.1,
+    }
+    NETWORK_STEPS = ('add_django', 'tailwind_binary', 'tailwind_install')
+    UV_FILES = ('.python-version', 'README.md', 'main.py')
+    PROJECT_FILES = ('__init__.py', 'settings.py', 'urls.py', 'asgi.py', 'wsgi.py')
+    APP_FILES = ('__init__.py', 'admin.py', 'apps.py', 'models.py', 'tests.py', 'views.py', 'migrations/__init__.py')
+
+    @staticmethod
+    def preflight(spec, scheduler, signature):
+        """Plan ``spec``'s run from its step ``scheduler`` and check the plan against ``spec.directory``."""
+        # The journal is only read for its steps and files, so the directory is not walked.
+        journal = GenerationJournal(spec.directory, signature, scan=False)
+        steps = scheduler.resolve()
+        paths = {}
+        commands = []
+        durations = {}
+        for step in steps:
+            if journal.steps and step.name in journal.steps:
+                durations[step.name] = 0.0
+                continue
+            for path, kind in RunPlanner.step_paths(spec, step.name):
+                paths.setdefault(path, (kind, step.name))
+            commands += RunPlanner.step_commands(spec, step.name)
+            durations[step.name] = RunPlanner.estimate(spec, step.name)
+
+        started = time.perf_counter()
+        existing, other_entries = RunPlanner.scan(spec.directory, paths)
+        scan_ms = (time.perf_counter() - started) * 1000
+
+        conflicts, overwrites, kept, reused = [], [], [], []
+        if journal.conflict():
+            conflicts.append(f"{GenerationJournal.FILENAME}: {journal.conflict()}")
+        for path, found in sorted(existing.items()):
+            kind, step = paths[path]
+            planned_dir = kind == 'dir' or path.endswith('/')
+            if found == 'unreadable':
+                conflicts.append(f"{path or '.'}: cannot be read")
+            elif planned_dir != (found == 'dir') and kind != 'reuse':
+                wanted = 'directory' if planned_dir else 'file'
+                conflicts.append(f"{path}: {step} needs a {wanted} here, but a {found} exists")
+            elif kind == 'create':
+                conflicts.append(f"{path}: {step} refuses to overwrite an existing {found}")
+            elif kind == 'replace':
+                overwrites.append(f"{path} ({step})")
+            elif kind == 'reuse':
+                reused.append(f"{path} ({step} is skipped)")
+            elif kind == 'write':
+                if path.rstrip('/') in journal.files:
+                    overwrites.append(f"{path} ({step}, regenerated unless you edited it)")
+                else:
+                    kept.append(f"{path} ({step})")
+
+        path, seconds = scheduler.critical_path(durations)
+        estimate = {
+            'critical_path': [step.name for step in path if durations.get(step.name)],
+            'seconds': round(seconds, 2),
+            'network_steps': [name for name in RunPlanner.NETWORK_STEPS if durations.get(name)],
+        }
+        snapshot = RunPlanner.snapshot_note(spec, existing)
+        if snapshot == 'hit':
+            critical_path = ['snapshot_materialize', 'git_init'] + (['git_commit'] if spec.initial_commit else [])
+            estimate.update({'critical_path': critical_path, 'seconds': 0.5, 'network_steps': []})
+
+        return {
+            'project': spec.label,
+            'directory': spec.directory,
+            'steps': [step.name for step in steps],
+            'resumed_steps': sorted(name for name in durations if journal.steps and name in journal.steps),
+            'snapshot': snapshot,
+            'files': sorted(path for path, (kind, _) in paths.items() if kind != 'dir' and not path.endswith('/')),
+            'directories': sorted(path.rstrip('/') for path, (kind, _) in paths.items() if kind == 'dir' or path.endswith('/')),
+            'commands': commands,
+            'conflicts': conflicts,
+            'overwrites': overwrites,
+            'kept': kept,
+            'reused': reused,
+            'other_entries': other_entries,
+            'estimate': estimate,
+            'scan_ms': round(scan_ms, 3),
+        }
+
+    @staticmethod
+    def step_paths(spec, name):
+        """Return ``(relative_path, kind)`` for everything step ``name`` would create; directories end with '/'."""
+        project, apps = spec.project_name, spec.app_names
+        pack = TemplatePack.get(spec.template_pack)
+        if name == 'uv_init':
+            return [('pyproject.toml', 'reuse')] + [(path, 'write') for path in RunPlanner.UV_FILES]
+        if name == 'git_init':
+            workspace_git = spec.workspace and os.path.exists(os.path.join(spec.workspace, '.git'))
+            return [('.gitignore', 'write')] + ([] if workspace_git else [('.git/', 'reuse')])
+        if name == 'add_django':
+            return [] if spec.workspace else [('uv.lock', 'replace'), ('.venv/', 'dir')]
+        if name == 'startproject':
+            paths = [('manage.py', 'create'), (f'{project}/', 'dir')]
+            paths += [(f'{project}/{filename}', 'create') for filename in RunPlanner.PROJECT_FILES]
+            for app_name in apps:
+                paths += [(f'{app_name}/', 'create')]
+                paths += [(f'{app_name}/{filename}', 'create') for filename in RunPlanner.APP_FILES]
+            return paths
+        if name == 'site_files':
+            paths = [(f'{path}/', 'dir') for path in ('templates', 'templates/partials', 'static', 'static/css', 'static/js', 'static/img')]
+            return paths + RunPlanner.pack_paths(pack, 'site', DjangoProjectManager.site_context(project, spec.install_tailwind))
+        if name == 'app_files':
+            paths = []
+            for app_name in apps:
+                context = {'project_name': project, 'app_name': app_name,
+                           'camel_case_app_name': DjangoTemplateEngine.camel_case(app_name)}
+                paths += RunPlanner.pack_paths(pack, 'app', context)
+            return paths
+        if name == 'static_pipeline':
+            return RunPlanner.pack_paths(DjangoProjectManager.pack_with_section(spec.template_pack, 'static'), 'static',
+                                         {'project_name': project})
+        if name == 'load_test' and apps:
+            return RunPlanner.pack_paths(DjangoProjectManager.pack_with_section(spec.template_pack, 'loadtest'), 'loadtest',
+                                         {'project_name': project, 'app_name': apps[0], 'default_paths': '[]'})
+        if name == 'production_profile':
+            return RunPlanner.pack_paths(DjangoProjectManager.pack_with_section(spec.template_pack, 'production'), 'production',
+                                         {'project_name': project, 'cpu_count': 1, 'workers': 3, 'secret_key': ''})
+        if name == 'tailwind_install':
+            return [('package.json', 'write'), ('package-lock.json', 'write'), ('tailwind.config.js', 'write'),
+                    ('node_modules/', 'replace')]
+        if name == 'tailwind_configure':
+            paths = [('static/css/tailwind.css', 'write'), ('static/css/style.css', 'write')]
+            if spec.tailwind_mode == 'standalone':
+                paths += [('tailwind.config.js', 'write'), ('Makefile', 'write')]
+            return paths
+        if name == 'tailwind_build':
+            return [('static/css/output.css', 'replace')]
+        if name == 'style_css':
+            return [('static/css/style.css', 'write')]
+        return []
+
+    @staticmethod
+    def pack_paths(pack, section, context):
+        """Return the paths ``pack`` renders for ``section``, without writing them."""
+        return [(relative_path.replace(os.sep, '/'), 'write') for relative_path, _ in pack.render(section, context)]
+
+    @staticmethod
+    def step_commands(spec, name):
+        """Return the external commands step ``name`` would run, as shell-like strings."""
+        if name == 'uv_init':
+            return ['uv init' + (f' --python {spec.python_version}' if spec.python_version else '')]
+        if name == 'git_init':
+            if spec.workspace and os.path.exists(os.path.join(spec.workspace, '.git')):
+                return []
+            return ['git init']
+        if name == 'add_django':
+            requirement = f'django=={spec.django_version}' if spec.django_version else 'django'
+            command = ' '.join(['uv add', requirement, *spec.packages])
+            return [command + (' --link-mode hardlink' if spec.workspace else '')]
+        if name == 'startproject' and not spec.in_process_templates:
+            return ([f'uv run django-admin startproject {spec.project_name} .']
+                    + [f'uv run python manage.py startapp {app_name}' for app_name in spec.app_names])
+        if name == 'tailwind_install':
+            if spec.use_node_store and RunPlanner.node_store_ready(spec):
+                return []
+            package = f'tailwindcss@{spec.tailwind_version}' if spec.tailwind_version else 'tailwindcss'
+            return ['npm init -y', f'npm install {package}', 'npx tailwindcss init']
+        if name == 'tailwind_binary' and not os.path.exists(TailwindStandalone.resolve_path(spec.tailwind_version)):
+            return [f'download standalone tailwindcss {spec.tailwind_version or TailwindStandalone.DEFAULT_VERSION}']
+        if name == 'tailwind_build':
+            if spec.tailwind_mode == 'standalone':
+                return [f'{TailwindStandalone.resolve_path(spec.tailwind_version)} -i ./static/css/tailwind.css '
+                        '-o ./static/css/output.css --minify']
+            return ['npm run build']
+        if name == 'git_commit':
+            return ['git check-ignore --stdin', 'git fast-import', 'git reset']
+        return []
+
+    @staticmethod
+    def estimate(spec, name):
+        """Return the estimated seconds for step ``name``, lowered where the local caches already have what it needs."""
+        seconds = RunPlanner.STEP_SECONDS.get(name, 0.01)
+        if name == 'startproject' and not spec.in_process_templates:
+            seconds = 1.5 + 0.5 * len(spec.app_names)
+        elif name == 'add_django' and spec.workspace and EnvironmentManager.locked_version(spec.workspace, 'django'):
+            seconds = 1.0
+        elif name == 'tailwind_install' and spec.use_node_store and RunPlanner.node_store_ready(spec):
+            seconds = 0.3
+        elif name == 'tailwind_binary' and os.path.exists(TailwindStandalone.resolve_path(spec.tailwind_version)):
+            seconds = 0.0
+        elif name == 'app_files':
+            seconds *= max(1, len(spec.app_names))
+        return seconds
+
+    @staticmethod
+    def node_store_ready(spec):
+        """Return True if the node_modules store can serve ``spec``'s Tailwind version without npm."""
+        stored = NodeModulesStore.stored_versions()
+        if spec.tailwind_version:
+            return spec.tailwind_version in stored
+        return bool(stored)
+
+    @staticmethod
+    def snapshot_note(spec, existing):
+        """Return 'hit' or 'miss' if the run would go through the snapshot cache, else None."""
+        if not spec.use_snapshot_cache or spec.workspace:
+            return None
+        if any(marker in existing for marker in ('pyproject.toml', 'manage.py', 'package.json')):
+            return None
+        key = SnapshotCache.key_for(spec)
+        return 'hit' if key and SnapshotCache.lookup(key) else 'miss'
+
+    @staticmethod
+    def scan(directory, paths):
+        """Return which of ``paths`` already exist under ``directory`` and how many other top-level entries it has.
+
+        The result maps each existing path to 'file', 'dir' or 'unreadable'. Directories are listed
+        with one scandir each, and only those on the way to a planned path are entered.
+        """
+        tree = {}
+        for path in paths:
+            node = tree
+            for part in path.rstrip('/').split('/'):
+                node = node.setdefault(part, {})
+            node[None] = path
+
+        existing = {}
+        other_entries = 0
+        if os.path.isfile(directory):
+            return {'': 'file'}, 0
+        stack = [(directory, tree, True)]
+        while stack:
+            current, node, top_level = stack.pop()
+            try:
+                entries = os.scandir(current)
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            except PermissionError:
+                existing[os.path.relpath(current, directory).replace(os.sep, '/')] = 'unreadable'
+                continue
+            with entries:
+                for entry in entries:
+                    child = node.get(entry.name)
+                    if child is None:
+                        other_entries += top_level
+                        continue
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if None in child:
+                        existing[child[None]] = 'dir' if is_dir else 'file'
+                    if is_dir and len(child) > (None in child):
+                        stack.append((entry.path, child, False))
+        return existing, other_entries
+
+    @staticmethod
+    def print_report(report):
+        """Print one project's plan and preflight findings."""
+        print(f"Plan for {report['project']} in {report['directory']}:")
+        if report['resumed_steps']:
+            print(f"  Resuming; already done: {', '.join(report['resumed_steps'])}")
+        if report['snapshot']:
+            print(f"  Snapshot cache {report['snapshot']}: "
+                  + ("files are copied from the snapshot." if report['snapshot'] == 'hit' else "a snapshot is built first."))
+        print(f"  Steps: {', '.join(report['steps'])}")
+        print(f"  Creates {len(report['files'])} files in {len(report['directories'])} directories")
+        for command in report['commands']:
+            print(f"  $ {command}")
+        estimate = report['estimate']
+        network = f"; network: {', '.join(estimate['network_steps'])}" if estimate['network_steps'] else ''
+        print(f"  Estimated time: {estimate['seconds']:.1f}s along {' -> '.join(estimate['critical_path']) or 'nothing'}{network}")
+        for label, key in (('Conflict', 'conflicts'), ('Overwrites', 'overwrites'), ('Keeps existing', 'kept'), ('Reuses', 'reused')):
+            for item in report[key]:
+                print(f"  {label}: {item}")
+        if report['other_entries']:
+            print(f"  The directory also holds {report['other_entries']} other entries, which are left alone.")
+        status = f"{len(report['conflicts'])} conflicts" if report['conflicts'] else "no conflicts"
+        print(f"  Preflight: {status} (scan took {report['scan_ms']:.1f} ms)")
+
+    @staticmethod
+    def print_json(reports):
+        """Print the reports of every planned project as one JSON document."""
+        print(json.dumps(reports, indent=2))
@@ -0,0 +1,417 @@
+import collections
+import json
+import os
+import queue
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from directory_manager import DirectoryManager
+from project_spec import ProjectSpec
+from trace_recorder import TraceRecorder
+
+class ScaffoldJob:
+    """One project submitted to the scaffold server, with the events it has produced so far."""
+
+    # Events kept per job for late watchers; older output is dropped first.
+    MAX_EVENTS = 2000
+
+    def __init__(self, job_id, spec):
+        self.id = job_id
+        self.spec = spec
+        self.status = 'queued'
+        self.error = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.ahead = 0
+        self.events = collections.deque(maxlen=ScaffoldJob.MAX_EVENTS)
+        self._count = 0
+        self._partial = ''
+        self._condition = threading.Condition()
+
+    @property
+    def done(self):
+        return self.finished is not None
+
+    def emit(self, event):
+        """Append ``event`` to the job's stream and wake its watchers."""
+        with self._condition:
+            self.events.append(event)
+            self._count += 1
+            self._condition.notify_all()
+
+    def write(self, text):
+        """Turn printed text into one 'output' event per line."""
+        with self._condition:
+            lines = (self._partial + text).split('\n')
+            self._partial = lines.pop()
+        for line in lines:
+            self.emit({'event': 'output', 'job': self.id, 'line': line})
+
+    def start(self):
+        self.status = 'running'
+        self.started = time.time()
+        self.emit({'event': 'started', 'job': self.id})
+
+    def finish(self, status, error=None):
+        """Flush pending output and send the final event; watchers stop after it."""
+        with self._condition:
+            partial, self._partial = self._partial, ''
+        if partial:
+            self.emit({'event': 'output', 'job': self.id, 'line': partial})
+        with self._condition:
+            self.status = status
+            self.error = error
+            self.finished = time.time()
+            elapsed = self.finished - (self.started or self.submitted)
+            self.events.append({'event': 'finished', 'job': self.id, 'status': status, 'error': error,
+                                'elapsed': round(elapsed, 3)})
+            self._count += 1
+            self._condition.notify_all()
+
+    def follow(self):
+        """Yield the job's events from the oldest one kept until it finishes."""
+        position = 0
+        while True:
+            with self._condition:
+                while position >= self._count and not self.done:
+                    self._condition.wait()
+                first = self._count - len(self.events)
+                batch = list(self.events)[max(position - first, 0):]
+                position = self._count
+                finished = self.done
+            yield from batch
+            if finished:
+                return
+
+    def as_dict(self):
+        return {
+            'job': self.id,
+            'project': self.spec.project_name,
+            'directory': self.spec.directory,
+            'status': self.status,
+            'error': self.error,
+            'submitted': self.submitted,
+            'started': self.started,
+            'finished': self.finished,
+        }
+
+class JobOutput:
+    """A ``sys.stdout`` replacement that sends each thread's output to the job it works for.
+
+    The thread running a job is bound to it directly; step worker threads are found through their
+    trace span, whose project label is unique per job. Anything else goes to the server's own stdout.
+    """
+
+    encoding = 'utf-8'
+
+    def __init__(self, fallback, jobs_by_label):
+        self.fallback = fallback
+        self.jobs_by_label = jobs_by_label
+        self._local = threading.local()
+
+    def bind(self, job):
+        self._local.job = job
+
+    def release(self):
+        self._local.job = None
+
+    def target(self):
+        job = getattr(self._local, 'job', None)
+        if job is None:
+            span = TraceRecorder.current()
+            if span is not None:
+                job = self.jobs_by_label.get(span.project)
+        return job
+
+    def write(self, text):
+        job = self.target()
+        if job is None:
+            return self.fallback.write(text)
+        job.write(text)
+        return len(text)
+
+    def flush(self):
+        self.fallback.flush()
+
+    def isatty(self):
+        return False
+
+class ScaffoldServer:
+    """Scaffolds projects submitted over a Unix domain socket, keeping tool probes and template packs warm.
+
+    Clients send one JSON request per connection and read newline-delimited JSON events back. Jobs
+    wait in a bounded queue for a fixed pool of workers; when the queue is full, a submission is
+    rejected instead of piling up.
+    """
+
+    def __init__(self, socket_path, scaffold, workers=2, queue_size=16, history=100):
+        self.socket_path = socket_path
+        self.scaffold = scaffold
+        self.workers = workers
+        self.history = history
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.jobs = collections.OrderedDict()
+        self.jobs_by_label = {}
+        self.output = JobOutput(sys.stdout, self.jobs_by_label)
+        self._next_id = 1
+        self._lock = threading.Lock()
+        self._server = None
+
+    @staticmethod
+    def default_socket_path():
+        """``$DJANGO_SETUP_SOCKET``, or ``scaffold.sock`` in the tool's cache directory."""
+        return os.environ.get('DJANGO_SETUP_SOCKET') or os.path.join(DirectoryManager.cache_directory('server'), 'scaffold.sock')
+
+    def serve_forever(self):
+        """Listen until SIGINT, SIGTERM or a 'shutdown' request; running jobs finish, queued ones are cancelled."""
+        if os.path.exists(self.socket_path):
+            if ScaffoldClient.is_listening(self.socket_path):
+                print(f"A scaffold server is already listening on {self.socket_path}.")
+                sys.exit(1)
+            os.unlink(self.socket_path)  # left behind by a server that died
+
+        server = socketserver.ThreadingUnixStreamServer(self.socket_path, _RequestHandler, bind_and_activate=False)
+        server.daemon_threads = True
+        server.owner = self
+        self._server = server
+        previous_umask = os.umask(0o077)  # only the owner may connect
+        try:
+            server.server_bind()
+        finally:
+            os.umask(previous_umask)
+        server.server_activate()
+
+        threads = [threading.Thread(target=self._work, name=f'scaffold-worker-{n}', daemon=True) for n in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        unsubscribe = TraceRecorder.instance().subscribe(self._step_finished)
+        previous_handlers = {signum: signal.signal(signum, lambda *_: self.shutdown()) for signum in (signal.SIGINT, signal.SIGTERM)}
+        sys.stdout = self.output
+        print(f"Scaffold server listening on {self.socket_path} with {self.workers} workers "
+              f"and room for {self.queue.maxsize} queued jobs.", flush=True)
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            self._cancel_queued()
+            for _ in threads:
+                self.queue.put(None)
+            for thread in threads:
+                thread.join()
+            sys.stdout = self.output.fallback
+            unsubscribe()
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            print("Scaffold server stopped.")
+
+    def shutdown(self):
+        """Stop accepting requests; safe to call from a signal handler or a request thread."""
+        if self._server is not None:
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+
+    def submit(self, spec):
+        """Queue ``spec`` and return its job, raising ValueError when it cannot be accepted."""
+        with self._lock:
+            busy = [job for job in self.jobs.values() if not job.done and job.spec.directory == spec.directory]
+            if busy:
+                raise ValueError(f"Job {busy[0].id} is already scaffolding {spec.directory}.")
+            job = ScaffoldJob(self._next_id, spec)
+            # Step spans and routed output find the job by label, so it must be unique among the server's jobs.
+            spec.label = f"{spec.label}#{job.id}"
+            job.ahead = self.queue.qsize()
+            try:
+                self.queue.put_nowait(job)
+            except queue.Full:
+                raise ValueError(f"The job queue is full ({self.queue.maxsize} waiting); try again later.") from None
+            self._next_id += 1
+            self.jobs[job.id] = job
+            self._prune()
+        return job
+
+    def handle(self, request, send):
+        """Answer one client request by calling ``send(event)`` for each event."""
+        action = request.get('action')
+        if action == 'submit':
+            project = request.get('project') or {}
+            try:
+                if not os.path.isabs(str(project.get('directory', ''))):
+                    raise ValueError("The project needs an absolute 'directory'.")
+                spec = ProjectSpec.from_dict(project)
+                job = self.submit(spec)
+            except (TypeError, ValueError) as e:
+                send({'event': 'rejected', 'error': str(e)})
+                return
+            send({'event': 'queued', 'job': job.id, 'ahead': job.ahead})
+            if request.get('follow', True):
+                for event in job.follow():
+                    send(event)
+        elif action == 'watch':
+            with self._lock:
+                job = self.jobs.get(request.get('job'))
+            if job is None:
+                send({'event': 'error', 'error': f"No job {request.get('job')!r}."})
+                return
+            for event in job.follow():
+                send(event)
+        elif action == 'jobs':
+            with self._lock:
+                jobs = [job.as_dict() for job in self.jobs.values()]
+            send({'event': 'jobs', 'jobs': jobs, 'queued': self.queue.qsize(), 'workers': self.workers})
+        elif action == 'shutdown':
+            send({'event': 'stopping'})
+            self.shutdown()
+        else:
+            send({'event': 'error', 'error': f"Unknown action {action!r}; use submit, watch, jobs or shutdown."})
+
+    def _work(self):
+        while True:
+            job = self.queue.get()
+            if job is None:
+                return
+            self._run(job)
+
+    def _run(self, job):
+        with self._lock:
+            if job.done:  # cancelled while it waited
+                return
+            self.jobs_by_label[job.spec.label] = job
+        job.start()
+        self.output.bind(job)
+        status, error = 'ok', None
+        try:
+            self.scaffold(job.spec)
+        except SystemExit as e:
+            status, error = 'failed', f"exited with status {e.code}"
+        except Exception as e:
+            status, error = 'failed', str(e) or type(e).__name__
+        finally:
+            self.output.release()
+            with self._lock:
+                del self.jobs_by_label[job.spec.label]
+            TraceRecorder.instance().discard(job.spec.label)
+        job.finish(status, error)
+        print(f"Job {job.id} ({job.spec.project_name}) {status} in {job.finished - job.started:.2f}s.", flush=True)
+
+    def _step_finished(self, span):
+        job = self.jobs_by_label.get(span.project)
+        if job is not None:
+            step = span.as_dict()
+            del step['project']
+            job.emit({'event': 'step', 'job': job.id, **step})
+
+    def _cancel_queued(self):
+        while True:
+            try:
+                job = self.queue.get_nowait()
+            except queue.Empty:
+                return
+            if job is not None:
+                job.finish('cancelled', "the server stopped before the job started")
+
+    def _prune(self):
+        """Forget the oldest finished jobs beyond ``history``; called with the lock held."""
+        finished = [job_id for job_id, job in self.jobs.items() if job.done]
+        for job_id in finished[:max(len(self.jobs) - self.history, 0)]:
+            del self.jobs[job_id]
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        def send(event):
+            self.wfile.write(json.dumps(event).encode() + b'\n')
+            self.wfile.flush()
+
+        try:
+            request = json.loads(self.rfile.readline())
+            if not isinstance(request, dict):
+                raise ValueError("expected a JSON object")
+        except ValueError as e:
+            send({'event': 'error', 'error': f"Invalid request: {e}"})
+            return
+        try:
+            self.server.owner.handle(request, send)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client went away; its job keeps running
+
+class ScaffoldClient:
+    """Talks to a scaffold server and prints its events."""
+
+    @staticmethod
+    def is_listening(socket_path):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            try:
+                sock.connect(socket_path)
+            except OSError:
+                return False
+        return True
+
+    @staticmethod
+    def request(socket_path, message):
+        """Send one request and yield the server's events as they arrive."""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            sock.close()
+            print(f"No scaffold server is listening on {socket_path}; start one with 'python main.py serve'.")
+            sys.exit(1)
+        with sock, sock.makefile('rb') as events:
+            sock.sendall(json.dumps(message).encode() + b'\n')
+            for line in events:
+                yield json.loads(line)
+
+    @staticmethod
+    def submit(socket_path, project, follow=True, raw=False):
+        """Submit a manifest-style ``project`` entry and print its progress; return True unless it failed or was rejected."""
+        return ScaffoldClient.stream(socket_path, {'action': 'submit', 'project': project, 'follow': follow}, raw)
+
+    @staticmethod
+    def watch(socket_path, job_id, raw=False):
+        """Print a job's events until it finishes; return True if it succeeded."""
+        return ScaffoldClient.stream(socket_path, {'action': 'watch', 'job': job_id}, raw)
+
+    @staticmethod
+    def stream(socket_path, message, raw=False):
+        """Print the events answering ``message``; return False on rejection, error or failure."""
+        succeeded = True
+        for event in ScaffoldClient.request(socket_path, message):
+            if raw:
+                print(json.dumps(event), flush=True)
+            elif event['event'] == 'output':
+                print(event['line'], flush=True)
+            elif event['event'] == 'queued':
+                print(f"Job {event['job']} queued behind {event['ahead']} waiting jobs.", flush=True)
+            elif event['event'] == 'step' and event['status'] != 'ok':
+                print(f"Job {event['job']}: step '{event['name']}' {event['status']} after {event['wall_time']:.2f}s.", flush=True)
+            elif event['event'] == 'finished':
+                reason = f" ({event['error']})" if event['error'] else ''
+                print(f"Job {event['job']} {event['status']} in {event['elapsed']:.2f}s{reason}.")
+            elif event['event'] in ('rejected', 'error'):
+                print(f"Rejected: {event['error']}" if event['event'] == 'rejected' else event['error'])
+            if event['event'] in ('rejected', 'error') or (event['event'] == 'finished' and event['status'] != 'ok'):
+                succeeded = False
+        return succeeded
+
+    @staticmethod
+    def print_jobs(socket_path, raw=False):
+        """Print the server's recent jobs."""
+        for event in ScaffoldClient.request(socket_path, {'action': 'jobs'}):
+            if raw:
+                print(json.dumps(event))
+                continue
+            print(f"{event['workers']} workers, {event['queued']} queued.")
+            for job in event['jobs']:
+                elapsed = f"{job['finished'] - job['started']:.2f}s" if job['finished'] and job['started'] else ''
+                print(f"  {job['job']:>4}  {job['status']:<9}  {elapsed:>8}  {job['project']}  {job['directory']}"
+                      + (f"  ({job['error']})" if job['error'] else ''))
+
+    @staticmethod
+    def shutdown(socket_path):
+        for _ in ScaffoldClient.request(socket_path, {'action': 'shutdown'}):
+            pass
+        print("Scaffold server is stopping; running jobs finish first.")
@@ -0,0 +1,394 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import stat
+import sys
+import threading
+import time
+import uuid
+from directory_manager import DirectoryManager
+from django_template_engine import DjangoTemplateEngine
+from environment_manager import EnvironmentManager
+from generation_journal import GenerationJournal
+from tailwind_standalone import TailwindStandalone
+from template_pack import TemplatePack
+from trace_recorder import TraceRecorder
+
+class SnapshotCache:
+    """Local cache of fully scaffolded project trees, reused instead of re-running uv, django-admin and npm.
+
+    Snapshots are built once per key with placeholder names in a staging directory and later
+    materialized into a target directory by copying the tree and substituting the real names.
+    """
+
+    # Placeholder names used while building a snapshot; chosen so they never occur in Django's own files.
+    SENTINEL_SITE = 'dpsnapshotsite'
+    SENTINEL_PROJECT = 'dpsnapshotproject'
+    SENTINEL_APP = 'dpsnapshotapp'
+
+    # Never stored: .git is recreated per project and .venv contains absolute paths (uv recreates it on first `uv run`).
+    EXCLUDED_NAMES = {'.git', '.venv', '__pycache__'}
+    # Stored but hardlinked into projects rather than copied, since nobody edits these in place.
+    HARDLINKED_NAMES = {'node_modules'}
+
+    SECRET_KEY_PATTERN = re.compile(r"SECRET_KEY = 'django-insecure-[^'\n]*'")
+    # The production profile's .env holds a key of its own.
+    ENV_SECRET_KEY_PATTERN = re.compile(r"^SECRET_KEY='[^'\n]*'$", re.MULTILINE)
+
+    max_bytes = 2 * 1024 ** 3
+    max_age_days = 14
+    # How long the versions an unpinned request (latest Django, the default Python) was built with are
+    # trusted; after that the next run builds again and picks up new releases.
+    RESOLUTION_TTL = 24 * 3600
+    RESOLUTIONS_FILE = '.resolutions.json'
+
+    _key_locks = {}
+    _key_locks_guard = threading.Lock()
+    _resolutions_lock = threading.Lock()
+
+    @staticmethod
+    def key(django_version, python_version, install_tailwind, template_pack, app_count, tailwind_version=None,
+            profile='development', load_test=False):
+        """Return the cache key for a combination of scaffold inputs."""
+        parts = {
+            'django': django_version or 'latest',
+            'python': python_version or 'default',
+            'tailwind': install_tailwind or False,
+            'tailwind_version': tailwind_version or 'latest',
+            'template_pack': template_pack,
+            'apps': app_count,
+            'profile': profile,
+            'load_test': load_test,
+        }
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()[:16]
+
+    @staticmethod
+    def key_for(spec, versions=None):
+        """Return the cache key for a ProjectSpec built with ``versions``, or None if they are not known yet.
+
+        ``versions`` maps 'django', 'python' and 'tailwind' to exact versions and defaults to
+        ``resolve(spec)``, so snapshots are keyed on what was installed rather than on 'latest'.
+        """
+        versions = versions or SnapshotCache.resolve(spec)
+        if versions is None:
+            return None
+        return SnapshotCache.key(versions['django'], versions['python'], spec.install_tailwind and spec.tailwind_mode,
+                                 TemplatePack.get(spec.template_pack).digest(), len(spec.app_names),
+                                 versions['tailwind'], spec.profile, spec.load_test)
+
+    @staticmethod
+    def request_key(spec):
+        """Return the key of the versions as requested, under which their resolution is remembered."""
+        return SnapshotCache.key(spec.django_version, spec.python_version, spec.install_tailwind and spec.tailwind_mode,
+                                 TemplatePack.get(spec.template_pack).digest(), len(spec.app_names),
+                                 spec.tailwind_version, spec.profile, spec.load_test)
+
+    @staticmethod
+    def resolve(spec):
+        """Return the exact versions ``spec`` installs, or None if an unpinned one has no fresh resolution."""
+        pinned = SnapshotCache._pinned_versions(spec)
+        if None not in pinned.values():
+            return pinned
+        cached = SnapshotCache._load_resolutions().get(SnapshotCache.request_key(spec))
+        if cached and time.time() - cached['resolved'] < SnapshotCache.RESOLUTION_TTL:
+            return cached['versions']
+        return None
+
+    @staticmethod
+    def _pinned_versions(spec):
+        """Return the versions fixed by ``spec`` itself; unpinned ones are None."""
+        tailwind = ''
+        if spec.install_tailwind:
+            if spec.tailwind_mode == 'standalone':
+                tailwind = (spec.tailwind_version or TailwindStandalone.DEFAULT_VERSION).lstrip('v')
+            elif spec.tailwind_version and re.fullmatch(r'\d+\.\d+\.\d+(?:[-+][\w.-]+)?', spec.tailwind_version):
+                tailwind = spec.tailwind_version
+            else:
+                tailwind = None
+        # Django is added as django==<version>, and uv writes the requested Python to .python-version as given.
+        return {'django': spec.django_version, 'python': spec.python_version, 'tailwind': tailwind}
+
+    @staticmethod
+    def installed_versions(spec, directory):
+        """Return the versions a freshly built project in ``directory`` ended up with."""
+        versions = SnapshotCache._pinned_versions(spec)
+        if versions['django'] is None:
+            versions['django'] = EnvironmentManager.locked_version(directory, 'django')
+        if versions['python'] is None:
+            try:
+                with open(os.path.join(directory, '.python-version')) as f:
+                    versions['python'] = f.readline().strip() or None
+            except OSError:
+                pass
+        if versions['tailwind'] is None:
+            try:
+                with open(os.path.join(directory, 'node_modules', 'tailwindcss', 'package.json')) as f:
+                    versions['tailwind'] = json.load(f).get('version')
+            except (OSError, ValueError):
+                pass
+        return versions
+
+    @staticmethod
+    def sentinel_apps(count):
+        """Return the placeholder app names for a snapshot with ``count`` apps.
+
+        The index is zero-padded so no placeholder is a prefix of another.
+        """
+        return [f"{SnapshotCache.SENTINEL_APP}{index:03d}" for index in range(count)]
+
+    @staticmethod
+    def is_fresh_target(directory):
+        """Return True if the target holds no existing project that a snapshot would clobber."""
+        markers = ('pyproject.toml', 'manage.py', 'package.json')
+        return not any(os.path.exists(os.path.join(directory, marker)) for marker in markers)
+
+    @staticmethod
+    def snapshot_path(key):
+        """Return the on-disk location of a snapshot."""
+        return os.path.join(DirectoryManager.cache_directory('snapshots'), key)
+
+    @staticmethod
+    def lookup(key):
+        """Return the snapshot directory for ``key`` if a complete snapshot exists, else None."""
+        path = SnapshotCache.snapshot_path(key)
+        if os.path.isfile(os.path.join(path, 'meta.json')):
+            return path
+        return None
+
+    @staticmethod
+    def ensure(spec, builder):
+        """Return the snapshot directory for ``spec``, building it with ``builder(staging_spec)`` on a miss."""
+        with SnapshotCache._lock_for(SnapshotCache.request_key(spec)):
+            key = SnapshotCache.key_for(spec)
+            path = key and SnapshotCache.lookup(key)
+            if path:
+                print(f"Snapshot cache hit ({key}).")
+                return path
+
+            if key:
+                print(f"Snapshot cache miss ({key}); building snapshot.")
+            else:
+                print("Snapshot cache miss (versions not resolved recently); building snapshot.")
+            return SnapshotCache.build(spec, builder)
+
+    @staticmethod
+    def build(spec, builder):
+        """Scaffold a placeholder-named project in a staging directory and store it under the versions it installed."""
+        from project_spec import ProjectSpec
+
+        staging_root = os.path.join(DirectoryManager.cache_directory('snapshots'), f".staging-{uuid.uuid4().hex}")
+        staging_dir = os.path.join(staging_root, SnapshotCache.SENTINEL_SITE)
+        os.makedirs(staging_dir)
+        try:
+            builder(ProjectSpec(
+                project_name=SnapshotCache.SENTINEL_PROJECT,
+                app_names=SnapshotCache.sentinel_apps(len(spec.app_names)),
+                directory=staging_dir,
+                install_tailwind=spec.install_tailwind,
+                django_version=spec.django_version,
+                python_version=spec.python_version,
+                in_process_templates=spec.in_process_templates,
+                step_workers=spec.step_workers,
+                template_pack=spec.template_pack,
+                tailwind_version=spec.tailwind_version,
+                use_node_store=spec.use_node_store,
+                tailwind_mode=spec.tailwind_mode,
+                profile=spec.profile,
+                load_test=spec.load_test,
+                label=spec.label,
+            ))
+
+            versions = SnapshotCache.installed_versions(spec, staging_dir)
+            key = SnapshotCache.key_for(spec, versions)
+            SnapshotCache._record_resolution(spec, versions)
+
+            tree = os.path.join(staging_root, 'tree')
+            shutil.copytree(staging_dir, tree, symlinks=True,
+                            ignore=shutil.ignore_patterns(*SnapshotCache.EXCLUDED_NAMES))
+            size = DirectoryManager.tree_size(tree)
+            now = time.time()
+            with open(os.path.join(staging_root, 'meta.json'), 'w') as f:
+                json.dump({'key': key, 'versions': versions, 'created': now, 'last_used': now, 'size': size}, f)
+            shutil.rmtree(staging_dir)
+
+            path = SnapshotCache.snapshot_path(key)
+            try:
+                os.rename(staging_root, path)
+            except OSError:
+                # Another process, or an earlier run that resolved to the same versions, stored it first; keep theirs.
+                shutil.rmtree(staging_root, ignore_errors=True)
+                print(f"Snapshot {key} already stored; keeping it.")
+            return path
+        except BaseException:
+            shutil.rmtree(staging_root, ignore_errors=True)
+            raise
+
+    @staticmethod
+    def materialize(snapshot, directory, project_name, app_names):
+        """Copy a snapshot into ``directory``, renaming the placeholder project, app and site names.
+
+        Files already in ``directory`` are kept, as the project's journal decides, never overwritten.
+        """
+        replacements = SnapshotCache._replacements(directory, project_name, app_names)
+        tree = os.path.join(snapshot, 'tree')
+        kept = 0
+
+        for root, dirs, files in os.walk(tree):
+            rel_root = os.path.relpath(root, tree)
+            target_root = os.path.join(directory, SnapshotCache._rename_path(rel_root, replacements))
+            os.makedirs(target_root, exist_ok=True)
+
+            for name in [d for d in dirs if d in SnapshotCache.HARDLINKED_NAMES]:
+                dirs.remove(name)
+                DirectoryManager.link_tree(os.path.join(root, name), os.path.join(target_root, name))
+
+            for name in files:
+                source = os.path.join(root, name)
+                target = os.path.join(target_root, SnapshotCache._rename_path(name, replacements))
+                if os.path.islink(source):
+                    if os.path.lexists(target):
+                        print(f"Keeping preexisting file {os.path.relpath(target, directory)}.")
+                        kept += 1
+                    else:
+                        os.symlink(os.readlink(source), target)
+                    continue
+                if not SnapshotCache._copy_file(source, target, replacements, directory):
+                    kept += 1
+
+        SnapshotCache._touch(snapshot)
+        print(f"Materialized snapshot into {directory}" + (f", keeping {kept} existing files." if kept else "."))
+
+    @staticmethod
+    def evict(max_bytes=None, max_age_days=None):
+        """Drop snapshots unused for longer than ``max_age_days``, then the least recently used until under ``max_bytes``."""
+        max_bytes = SnapshotCache.max_bytes if max_bytes is None else max_bytes
+        max_age_days = SnapshotCache.max_age_days if max_age_days is None else max_age_days
+        snapshots_dir = DirectoryManager.cache_directory('snapshots')
+
+        entries = []
+        for name in os.listdir(snapshots_dir):
+            if name.startswith('.'):
+                continue  # staging directories of in-flight builds
+            meta_path = os.path.join(snapshots_dir, name, 'meta.json')
+            try:
+                with open(meta_path) as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                continue
+            entries.append((meta.get('last_used', 0), meta.get('size', 0), os.path.join(snapshots_dir, name)))
+
+        entries.sort()
+        cutoff = time.time() - max_age_days * 86400
+        total = sum(size for _, size, _ in entries)
+        for last_used, size, path in entries:
+            if last_used >= cutoff and total <= max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            print(f"Evicted snapshot {os.path.basename(path)}.")
+
+    @staticmethod
+    def _replacements(directory, project_name, app_names):
+        """Return the (placeholder, real name) pairs to substitute in paths and file contents."""
+        site_name = re.sub(r'[-_.\s]+', '-', os.path.basename(directory)).lower()
+        replacements = [
+            (SnapshotCache.SENTINEL_PROJECT, project_name),
+            (SnapshotCache.SENTINEL_SITE, site_name),
+        ]
+        for sentinel, app_name in zip(SnapshotCache.sentinel_apps(len(app_names)), app_names):
+            replacements.append((sentinel, app_name))
+            # startapp derives the AppConfig class name from the app name.
+            replacements.append((DjangoTemplateEngine.camel_case(sentinel), DjangoTemplateEngine.camel_case(app_name)))
+        return replacements
+
+    @staticmethod
+    def _rename_path(path, replacements):
+        """Substitute placeholder names in each component of a relative path."""
+        if path == os.curdir:
+            return path
+        parts = path.split(os.sep)
+        for old, new in replacements:
+            parts = [new if part == old else part for part in parts]
+        return os.sep.join(parts)
+
+    @staticmethod
+    def _copy_file(source, target, replacements, directory):
+        """Copy one file, rewriting placeholder names and the secret key in text files.
+
+        Returns False, leaving the target alone, if the journal (or, without one, the target's mere
+        existence) says the file in ``directory`` must be kept.
+        """
+        with open(source, 'rb') as f:
+            data = f.read()
+        try:
+            text = data.decode('utf-8')
+        except UnicodeDecodeError:
+            text = None
+
+        if text is not None:
+            rewritten = text
+            for old, new in replacements:
+                rewritten = rewritten.replace(old, new)
+            rewritten = SnapshotCache.SECRET_KEY_PATTERN.sub(SnapshotCache._new_secret_key_line, rewritten)
+            rewritten = SnapshotCache.ENV_SECRET_KEY_PATTERN.sub(
+                lambda match: f"SECRET_KEY='{DjangoTemplateEngine.secret_key()}'", rewritten)
+            if rewritten != text:
+                data = rewritten.encode('utf-8')
+
+        journal = GenerationJournal.for_path(target)
+        if journal is not None:
+            reason = journal.check(target, data)
+        else:
+            reason = 'preexisting' if os.path.lexists(target) else None
+        if reason is not None:
+            if reason != 'unchanged':
+                print(journal.describe(target, reason) if journal else f"Keeping {reason} file {os.path.relpath(target, directory)}.")
+                return False
+            return True
+
+        DirectoryManager.replace_file(target, data, mode=stat.S_IMODE(os.stat(source).st_mode))
+        TraceRecorder.record_write(len(data), True)
+        GenerationJournal.record(target, data)
+        return True
+
+    @staticmethod
+    def _new_secret_key_line(match):
+        """Return a fresh SECRET_KEY assignment so materialized projects never share a key."""
+        return f"SECRET_KEY = '{DjangoTemplateEngine.SECRET_KEY_INSECURE_PREFIX}{DjangoTemplateEngine.secret_key()}'"
+
+    @staticmethod
+    def _touch(snapshot):
+        """Record that a snapshot was just used, for LRU eviction."""
+        meta_path = os.path.join(snapshot, 'meta.json')
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            meta['last_used'] = time.time()
+            DirectoryManager.write_json(meta_path, meta)
+        except (OSError, ValueError) as e:
+            print(f"Could not update snapshot metadata: {e}", file=sys.stderr)
+
+    @staticmethod
+    def _record_resolution(spec, versions):
+        """Remember which versions ``spec``'s request resolved to, for RESOLUTION_TTL."""
+        with SnapshotCache._resolutions_lock:
+            resolutions = SnapshotCache._load_resolutions()
+            resolutions[SnapshotCache.request_key(spec)] = {'versions': versions, 'resolved': time.time()}
+            path = os.path.join(DirectoryManager.cache_directory('snapshots'), SnapshotCache.RESOLUTIONS_FILE)
+            DirectoryManager.write_json(path, resolutions, indent=2)
+
+    @staticmethod
+    def _load_resolutions():
+        try:
+            with open(os.path.join(DirectoryManager.cache_directory('snapshots'), SnapshotCache.RESOLUTIONS_FILE)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _lock_for(key):
+        """Return the in-process lock serializing builds of one key, so batch workers build it only once."""
+        with SnapshotCache._key_locks_guard:
+            return SnapshotCache._key_locks.setdefault(key, threading.Lock())
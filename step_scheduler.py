@@ -0,0 +1,166 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from command_runner import StepOutput
+
+class Step:
+    """A unit of scaffolding work with the named artifacts it consumes and produces."""
+
+    def __init__(self, name, action, inputs=(), outputs=()):
+        self.name = name
+        self.action = action
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.dependencies = set()
+        self.started = None
+        self.finished = None
+
+    @property
+    def duration(self):
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
+
+class StepScheduler:
+    """Runs a graph of steps, starting each one as soon as the steps producing its inputs have finished.
+
+    Independent steps run concurrently on a bounded thread pool. The first failure stops new
+    steps from being scheduled, waits for the ones already running, and re-raises the error.
+    With a ``journal``, steps it records as done are skipped and each step's outcome is recorded.
+    """
+
+    def __init__(self, max_workers=4, recorder=None, project=None, journal=None):
+        self.max_workers = max_workers
+        self.recorder = recorder
+        self.project = project
+        self.journal = journal
+        self.steps = {}
+
+    def add(self, name, action, inputs=(), outputs=()):
+        """Declare a step; ``action`` is called with no arguments when all of ``inputs`` are available."""
+        if name in self.steps:
+            raise ValueError(f"Step '{name}' is declared twice.")
+        self.steps[name] = Step(name, action, inputs, outputs)
+        return self.steps[name]
+
+    def resolve(self):
+        """Link every step to the producers of its inputs and return the steps in topological order."""
+        producers = {}
+        for step in self.steps.values():
+            for output in step.outputs:
+                if output in producers:
+                    raise ValueError(f"Output '{output}' is produced by both '{producers[output]}' and '{step.name}'.")
+                producers[output] = step.name
+
+        for step in self.steps.values():
+            missing = [i for i in step.inputs if i not in producers]
+            if missing:
+                raise ValueError(f"Step '{step.name}' needs {', '.join(missing)}, which no step produces.")
+            step.dependencies = {producers[i] for i in step.inputs}
+
+        order, visiting, done = [], set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Step '{name}' is part of a dependency cycle.")
+            visiting.add(name)
+            for dependency in sorted(self.steps[name].dependencies):
+                visit(dependency)
+            visiting.discard(name)
+            done.add(name)
+            order.append(self.steps[name])
+
+        for name in self.steps:
+            visit(name)
+        return order
+
+    def run(self):
+        """Execute all steps and return them in topological order; re-raises the first step failure."""
+        order = self.resolve()
+        # Concurrent steps print through one line-buffered sink, so their lines never interleave mid-line.
+        StepOutput.install()
+        pending = {step.name: set(step.dependencies) for step in order}
+        running = {}
+        failure = None
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while pending or running:
+                if failure is None:
+                    ready = [n for n, deps in pending.items() if not deps]
+                    while ready:
+                        name = ready.pop(0)
+                        del pending[name]
+                        if self.journal is not None and self.journal.is_done(name):
+                            print(f"Skipping step '{name}', already completed.")
+                            for other, deps in pending.items():
+                                deps.discard(name)
+                                if not deps and other not in ready:
+                                    ready.append(other)
+                            continue
+                        running[pool.submit(self._execute, self.steps[name], self.recorder, self.project)] = name
+
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        if self.journal is not None:
+                            self.journal.mark_failed(name, error)
+                        if failure is None:
+                            failure = error
+                            print(f"Step '{name}' failed; waiting for running steps and skipping the rest.")
+                        continue
+                    if self.journal is not None:
+                        self.journal.mark_done(name)
+                    for deps in pending.values():
+                        deps.discard(name)
+
+        if failure is not None:
+            if self.journal is not None:
+                print("Finished steps are recorded; run the same command again to retry from the failed step.")
+            raise failure
+        return order
+
+    def critical_path(self, durations=None):
+        """Return the chain of steps whose durations bound the run's wall time, and its total duration.
+
+        ``durations`` maps step names to estimated seconds, to plan a run instead of measuring one.
+        """
+        order = self.resolve()
+        longest = {}
+        for step in order:
+            previous = max(step.dependencies, key=lambda name: longest[name][0], default=None)
+            base_time, base_path = longest[previous] if previous else (0.0, [])
+            duration = step.duration if durations is None else durations.get(step.name, 0.0)
+            longest[step.name] = (base_time + duration, base_path + [step])
+        if not longest:
+            return [], 0.0
+        total, path = max(longest.values(), key=lambda item: item[0])
+        return path, total
+
+    def print_critical_path(self):
+        """Print the critical path of the last run, if any step ran."""
+        if all(step.started is None for step in self.steps.values()):
+            return
+        path, total = self.critical_path()
+        chain = ' -> '.join(f"{step.name} ({step.duration:.2f}s)" for step in path)
+        print(f"Critical path: {chain} = {total:.2f}s")
+
+    @staticmethod
+    def _execute(step, recorder, project):
+        step.started = time.perf_counter()
+        try:
+            if recorder is None:
+                step.action()
+            else:
+                with recorder.step(step.name, project):
+                    try:
+                        step.action()
+                    finally:
+                        StepOutput.end_line()
+        finally:
+            step.finished = time.perf_counter()
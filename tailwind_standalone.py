@@ -0,0 +1,125 @@
+import hashlib
+import os
+import platform
+import re
+import shutil
+import sys
+import threading
+import urllib.error
+import urllib.request
+from directory_manager import DirectoryManager
+
+class TailwindStandalone:
+    """Locates, and downloads once, the standalone Tailwind CSS executable, which needs no Node.js or npm.
+
+    Binaries are cached per version and platform under the tool's cache directory, so only the
+    first project on a machine touches the network. A download is only kept if its SHA-256 matches
+    the release's published checksums. ``$DJANGO_SETUP_TAILWIND_BINARY`` points at an existing
+    executable instead, for air-gapped machines.
+    """
+
+    RELEASE_URL = 'https://github.com/tailwindlabs/tailwindcss/releases/download'
+    # Published next to the executables in each release; downloads are checked against it.
+    CHECKSUMS_ASSET = 'sha256sums.txt'
+    # The generated tailwind.config.js and @tailwind directives follow Tailwind 3's configuration format.
+    DEFAULT_VERSION = '3.4.17'
+
+    offline = False
+
+    _lock = threading.Lock()
+
+    @staticmethod
+    def platform_suffix():
+        """Return the release asset suffix for this machine, e.g. ``linux-x64`` or ``macos-arm64``."""
+        system = {'linux': 'linux', 'darwin': 'macos', 'win32': 'windows'}.get(sys.platform)
+        machine = platform.machine().lower()
+        arch = {'x86_64': 'x64', 'amd64': 'x64', 'aarch64': 'arm64', 'arm64': 'arm64', 'armv7l': 'armv7'}.get(machine)
+        if system is None or arch is None:
+            raise ValueError(f"No standalone Tailwind CSS build for {sys.platform}/{machine}.")
+        return f"{system}-{arch}" + ('.exe' if system == 'windows' else '')
+
+    @staticmethod
+    def binary_path(version):
+        """Return where the executable for ``version`` is cached."""
+        return os.path.join(DirectoryManager.cache_directory('tailwind'),
+                            f"tailwindcss-{version}-{TailwindStandalone.platform_suffix()}")
+
+    @staticmethod
+    def resolve_path(version=None):
+        """Return where the executable for ``version`` (default DEFAULT_VERSION) is, or would be, cached."""
+        override = os.environ.get('DJANGO_SETUP_TAILWIND_BINARY')
+        if override:
+            return override
+
+        version = (version or TailwindStandalone.DEFAULT_VERSION).lstrip('v')
+        if not re.fullmatch(r'\d+\.\d+\.\d+(?:-[\w.]+)?', version):
+            print(f"--tailwind=standalone needs an exact Tailwind version, not '{version}'.")
+            sys.exit(1)
+        return TailwindStandalone.binary_path(version)
+
+    @staticmethod
+    def ensure(version=None):
+        """Return the path of the standalone executable for ``version``, downloading it on first use."""
+        path = TailwindStandalone.resolve_path(version)
+        with TailwindStandalone._lock:
+            if not os.path.exists(path):
+                if TailwindStandalone.offline:
+                    print(f"Standalone Tailwind CSS is not cached at {path} and --offline forbids downloading it.")
+                    sys.exit(1)
+                TailwindStandalone.download((version or TailwindStandalone.DEFAULT_VERSION).lstrip('v'), path)
+        return path
+
+    @staticmethod
+    def download(version, path):
+        """Download the release asset for ``version`` to ``path`` atomically, refusing it unless its SHA-256 matches."""
+        asset = f"tailwindcss-{TailwindStandalone.platform_suffix()}"
+        url = f"{TailwindStandalone.RELEASE_URL}/v{version}/{asset}"
+        expected = TailwindStandalone.expected_sha256(version, asset)
+        print(f"Downloading standalone Tailwind CSS {version}...")
+
+        def verified_chunks():
+            # Hashed while streaming; raising before the last chunk is written keeps the download out of place.
+            digest = hashlib.sha256()
+            with urllib.request.urlopen(url, timeout=60) as response:
+                while chunk := response.read(1024 * 1024):
+                    digest.update(chunk)
+                    yield chunk
+            if digest.hexdigest() != expected:
+                raise ValueError(f"its SHA-256 is {digest.hexdigest()}, expected {expected}")
+
+        try:
+            DirectoryManager.replace_file(path, verified_chunks(), mode=0o755)
+        except ValueError as e:
+            print(f"Refusing to use {url}: {e}.")
+            sys.exit(1)
+        except (urllib.error.URLError, OSError) as e:
+            print(f"Failed to download {url}: {e}")
+            sys.exit(1)
+
+    @staticmethod
+    def expected_sha256(version, asset):
+        """Return the SHA-256 that ``asset`` of release ``version`` must have.
+
+        ``$DJANGO_SETUP_TAILWIND_SHA256`` pins it; otherwise it is read from the checksums file
+        published with the release. Without either, the download is refused.
+        """
+        pinned = os.environ.get('DJANGO_SETUP_TAILWIND_SHA256')
+        if pinned:
+            return pinned.strip().lower()
+
+        url = f"{TailwindStandalone.RELEASE_URL}/v{version}/{TailwindStandalone.CHECKSUMS_ASSET}"
+        advice = (f"Set DJANGO_SETUP_TAILWIND_SHA256 to the SHA-256 of {asset}, "
+                  "or DJANGO_SETUP_TAILWIND_BINARY to an executable you trust.")
+        try:
+            with urllib.request.urlopen(url, timeout=60) as response:
+                checksums = response.read().decode()
+        except (urllib.error.URLError, OSError, UnicodeDecodeError) as e:
+            print(f"Could not fetch the checksums of Tailwind CSS {version} from {url}: {e}. {advice}")
+            sys.exit(1)
+        # sha256sum format: "<hex digest>  <name>", with "*" before the name for binary mode.
+        for line in checksums.splitlines():
+            fields = line.split()
+            if len(fields) == 2 and os.path.basename(fields[1].lstrip('*')) == asset:
+                return fields[0].lower()
+        print(f"The checksums of Tailwind CSS {version} do not list {asset}. {advice}")
+        sys.exit(1)
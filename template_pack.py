@@ -0,0 +1,133 @@
+import hashlib
+import os
+import re
+import threading
+from directory_manager import DirectoryManager
+
+class TemplatePack:
+    """A directory of files rendered into every generated project.
+
+    A pack has a ``site`` tree, rendered into the installation directory, an ``app`` tree,
+    rendered once per app, a ``static`` tree holding the static files storage, a ``loadtest`` tree
+    with the ``--load-test`` command, and a ``production`` tree, rendered over the site for
+    ``--profile production``. ``[[ variable ]]`` placeholders in file contents are substituted, and
+    path components named after a variable (such as ``app_name``) are renamed, as django-admin does.
+    Packs are loaded on first use, and each file is compiled once. Compiled packs are shared by
+    every project in the process, so a batch reads and parses each pack only once.
+    """
+
+    BUILTIN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'template_packs')
+    SECTIONS = ('site', 'app', 'static', 'loadtest', 'production')
+    VARIABLE_PATTERN = re.compile(r'\[\[\s*(\w+)\s*\]\]')
+
+    _packs = {}
+    _packs_lock = threading.Lock()
+
+    def __init__(self, name, path):
+        self.name = name
+        self.path = path
+        self._compiled = {}
+        self._digest = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get(name):
+        """Return the pack called ``name`` (a built-in pack or a path to a pack directory), loading it once."""
+        path = TemplatePack.resolve(name)
+        with TemplatePack._packs_lock:
+            if path not in TemplatePack._packs:
+                TemplatePack._packs[path] = TemplatePack(name, path)
+            return TemplatePack._packs[path]
+
+    @staticmethod
+    def resolve(name):
+        """Return the directory of pack ``name``, raising ValueError if there is none."""
+        if os.sep in name or (os.altsep and os.altsep in name) or name.startswith('.'):
+            path = os.path.abspath(os.path.expanduser(name))
+        else:
+            path = os.path.join(TemplatePack.BUILTIN_DIR, name)
+        if not os.path.isdir(path):
+            raise ValueError(f"Template pack '{name}' not found.")
+        return os.path.realpath(path)
+
+    @staticmethod
+    def available():
+        """Return the names of the built-in packs."""
+        if not os.path.isdir(TemplatePack.BUILTIN_DIR):
+            return []
+        return sorted(entry.name for entry in os.scandir(TemplatePack.BUILTIN_DIR) if entry.is_dir())
+
+    def render(self, section, context):
+        """Return ``(relative_path, content)`` for every file in ``section`` rendered with ``context``."""
+        rendered = []
+        for path_parts, content_parts in self.compiled(section):
+            relative_path = os.path.join(*(context.get(part, part) for part in path_parts))
+            rendered.append((relative_path, self._substitute(content_parts, context, relative_path)))
+        return rendered
+
+    def write(self, directory, section, context):
+        """Render ``section`` into ``directory`` in one pass; return the paths that were written."""
+        files = [(os.path.join(directory, relative_path), content)
+                 for relative_path, content in self.render(section, context)]
+        return DirectoryManager.write_files(files)
+
+    def compiled(self, section):
+        """Return the compiled files of ``section``, compiling them on first use."""
+        if section not in TemplatePack.SECTIONS:
+            raise ValueError(f"Unknown template pack section '{section}'.")
+        with self._lock:
+            if section not in self._compiled:
+                self._compiled[section] = self._compile_section(section)
+            return self._compiled[section]
+
+    def digest(self):
+        """Return a hash of every file in the pack, so caches keyed on the pack notice when it changes."""
+        with self._lock:
+            if self._digest is None:
+                digest = hashlib.sha256()
+                for relative_path in self._files(self.path):
+                    digest.update(relative_path.encode() + b'\0')
+                    with open(os.path.join(self.path, relative_path), 'rb') as f:
+                        digest.update(hashlib.sha256(f.read()).digest())
+                self._digest = digest.hexdigest()[:16]
+            return self._digest
+
+    def _compile_section(self, section):
+        root = os.path.join(self.path, section)
+        if not os.path.isdir(root):
+            return []
+        compiled = []
+        for relative_path in self._files(root):
+            with open(os.path.join(root, relative_path), encoding='utf-8') as f:
+                content = f.read()
+            compiled.append((tuple(relative_path.split(os.sep)), TemplatePack.compile(content)))
+        return compiled
+
+    @staticmethod
+    def compile(content):
+        """Split ``content`` into alternating literal text and variable names."""
+        return tuple(TemplatePack.VARIABLE_PATTERN.split(content))
+
+    def _substitute(self, parts, context, relative_path):
+        if len(parts) == 1:
+            return parts[0]
+        pieces = []
+        for index, part in enumerate(parts):
+            if index % 2 == 0:
+                pieces.append(part)
+            elif part in context:
+                pieces.append(str(context[part]))
+            else:
+                raise ValueError(f"Template pack '{self.name}' uses unknown variable '{part}' in {relative_path}.")
+        return ''.join(pieces)
+
+    @staticmethod
+    def _files(root):
+        """Return every file under ``root`` as a sorted list of relative paths, skipping hidden and cache directories."""
+        files = []
+        for current, dirs, filenames in os.walk(root):
+            dirs[:] = [d for d in dirs if not d.startswith('.') and d != '__pycache__']
+            for filename in filenames:
+                if not filename.endswith(('.pyc', '.pyo')):
+                    files.append(os.path.relpath(os.path.join(current, filename), root))
+        return sorted(files)
@@ -0,0 +1,3 @@
+from django import forms
+
+# Define your forms here
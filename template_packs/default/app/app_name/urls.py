@@ -0,0 +1,12 @@
+from django.urls import path
+from django.views.generic import TemplateView
+
+app_name = '[[ app_name ]]'
+
+urlpatterns = [
+    path('', TemplateView.as_view(template_name='[[ app_name ]]/index.html'), name='index'),
+    path('about/', TemplateView.as_view(template_name='[[ app_name ]]/about.html'), name='about'),
+    path('contact/', TemplateView.as_view(template_name='[[ app_name ]]/contact.html'), name='contact'),
+    path('privacy/', TemplateView.as_view(template_name='[[ app_name ]]/privacy.html'), name='privacy'),
+    path('portfolio/', TemplateView.as_view(template_name='[[ app_name ]]/portfolio.html'), name='portfolio'),
+]
@@ -0,0 +1,217 @@
+"""
+Load-test the pages of a running [[ project_name ]] server.
+
+Start the server first (`uv run python manage.py runserver --noreload`, or
+`uv run gunicorn` with the production profile), then run
+`uv run python manage.py loadtest`. Requests are made with plain asyncio
+sockets over keep-alive HTTP/1.1 connections, so the client adds little
+overhead of its own. Save results with --output and compare runs across
+settings profiles.
+"""
+
+import asyncio
+import json
+import math
+import os
+import platform
+import time
+from urllib.parse import urlsplit
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_PATHS = [[ default_paths ]]
+
+
+def percentile(sorted_values, percent):
+    """Return the nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies):
+    """Return latency statistics in milliseconds."""
+    values = sorted(latency * 1000 for latency in latencies)
+    if not values:
+        return {'count': 0}
+    return {
+        'count': len(values),
+        'min': round(values[0], 3),
+        'mean': round(sum(values) / len(values), 3),
+        'p50': round(percentile(values, 50), 3),
+        'p95': round(percentile(values, 95), 3),
+        'p99': round(percentile(values, 99), 3),
+        'max': round(values[-1], 3),
+    }
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection, reopened whenever the server closes it."""
+
+    def __init__(self, host, port, timeout):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.reader = None
+        self.writer = None
+
+    async def get(self, path):
+        """Send a GET for ``path`` and read the whole response; return the status code."""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port), self.timeout)
+        request = f"GET {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\nConnection: keep-alive\r\n\r\n"
+        self.writer.write(request.encode('latin-1'))
+        try:
+            return await asyncio.wait_for(self._read_response(), self.timeout)
+        except BaseException:
+            await self.close()
+            raise
+
+    async def _read_response(self):
+        head = await self.reader.readuntil(b'\r\n\r\n')
+        lines = head.decode('latin-1').split('\r\n')
+        version, status = lines[0].split(' ', 2)[:2]
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip().lower()
+
+        if headers.get('transfer-encoding') == 'chunked':
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        elif 'content-length' in headers:
+            await self.reader.readexactly(int(headers['content-length']))
+        else:
+            await self.reader.read()
+            headers['connection'] = 'close'
+
+        if headers.get('connection') == 'close' or version == 'HTTP/1.0':
+            await self.close()
+        return int(status)
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+
+class Command(BaseCommand):
+    help = "Load-test the generated pages of a running server and report latency percentiles and requests per second."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000', help="Base URL of the running server")
+        parser.add_argument('--paths', nargs='+', default=DEFAULT_PATHS, help="Paths to request, in rotation")
+        parser.add_argument('--concurrency', type=int, default=10, help="Number of concurrent connections")
+        parser.add_argument('--requests', type=int, default=1000, help="Total requests to make")
+        parser.add_argument('--duration', type=float, help="Run for this many seconds instead of a fixed number of requests")
+        parser.add_argument('--warmup', type=int, default=20, help="Requests made, and discarded, before measuring")
+        parser.add_argument('--timeout', type=float, default=10.0, help="Seconds before a request counts as failed")
+        parser.add_argument('--label', help="Name for this run in the JSON output (default: the settings module)")
+        parser.add_argument('--output', help="Write the results as JSON to this file")
+
+    def handle(self, *args, **options):
+        url = urlsplit(options['url'])
+        if url.scheme != 'http' or not url.hostname:
+            raise CommandError("--url must be an http:// URL; put TLS in front of the server separately.")
+        if options['concurrency'] < 1:
+            raise CommandError("--concurrency must be at least 1.")
+        prefix = url.path.rstrip('/')
+        paths = [prefix + '/' + path.lstrip('/') for path in options['paths']]
+
+        results = asyncio.run(self.run(url.hostname, url.port or 80, paths, options))
+        results.update({
+            'label': options['label'] or os.environ.get('DJANGO_SETTINGS_MODULE', ''),
+            'url': options['url'],
+            'settings': {'module': os.environ.get('DJANGO_SETTINGS_MODULE', ''), 'debug': settings.DEBUG},
+            'django': django.get_version(),
+            'python': platform.python_version(),
+            'timestamp': time.time(),
+        })
+        self.report(results)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(f"Wrote {options['output']}")
+
+    async def run(self, host, port, paths, options):
+        await self.load(host, port, paths, options['warmup'], None, options['concurrency'], options['timeout'])
+        started = time.perf_counter()
+        deadline = started + options['duration'] if options['duration'] else None
+        samples = await self.load(host, port, paths, options['requests'], deadline,
+                                  options['concurrency'], options['timeout'])
+        elapsed = time.perf_counter() - started
+
+        statuses = {}
+        errors = {}
+        by_path = {}
+        for path, status, latency, error in samples:
+            if error:
+                errors[error] = errors.get(error, 0) + 1
+                continue
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+            by_path.setdefault(path, []).append(latency)
+        ok = [latency for _, status, latency, error in samples if not error and status < 400]
+        return {
+            'concurrency': options['concurrency'],
+            'requests': len(samples),
+            'successful': len(ok),
+            'duration_s': round(elapsed, 3),
+            # Throughput counts successful responses only; failures are reported as the error rate.
+            'requests_per_second': round(len(ok) / elapsed, 1) if elapsed else None,
+            'error_rate': round(1 - len(ok) / len(samples), 4) if samples else None,
+            'latency_ms': summarize(ok),
+            'status_codes': statuses,
+            'errors': errors,
+            'paths': {path: summarize(latencies) for path, latencies in by_path.items()},
+        }
+
+    async def load(self, host, port, paths, count, deadline, concurrency, timeout):
+        """Make ``count`` requests (or keep going until ``deadline``) over ``concurrency`` connections."""
+        samples = []
+        issued = 0
+
+        async def worker():
+            nonlocal issued
+            connection = Connection(host, port, timeout)
+            try:
+                while (time.perf_counter() < deadline) if deadline else issued < count:
+                    path = paths[issued % len(paths)]
+                    issued += 1
+                    start = time.perf_counter()
+                    try:
+                        status = await connection.get(path)
+                        samples.append((path, status, time.perf_counter() - start, None))
+                    except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+                        samples.append((path, None, time.perf_counter() - start, type(e).__name__))
+            finally:
+                await connection.close()
+
+        if count or deadline:
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return samples
+
+    def report(self, results):
+        latency = results['latency_ms']
+        self.stdout.write(f"{results['requests']} requests over {results['concurrency']} connections "
+                          f"in {results['duration_s']}s: {results['requests_per_second']} successful requests/s")
+        if results['error_rate']:
+            self.stdout.write(f"error rate: {results['error_rate']:.2%} "
+                              f"({results['requests'] - results['successful']} failed or returned 4xx/5xx)")
+        if latency['count']:
+            self.stdout.write(f"latency ms: p50 {latency['p50']}  p95 {latency['p95']}  p99 {latency['p99']}  "
+                              f"max {latency['max']}")
+        self.stdout.write(f"status codes: {results['status_codes']}")
+        if results['errors']:
+            self.stderr.write(f"errors: {results['errors']}")
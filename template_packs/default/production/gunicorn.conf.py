@@ -0,0 +1,30 @@
+"""
+Gunicorn configuration for [[ project_name ]]; run with `uv run gunicorn`.
+
+Workers default to 2 x cores + 1 for the [[ cpu_count ]] cores this project was generated on.
+Override with WEB_CONCURRENCY, and set GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker
+(with uvicorn installed) to serve the ASGI application instead.
+"""
+
+import os
+
+wsgi_app = os.environ.get('GUNICORN_APP', '[[ project_name ]].wsgi:application')
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+
+workers = int(os.environ.get('WEB_CONCURRENCY', '[[ workers ]]'))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'sync')
+if worker_class.startswith('uvicorn') and wsgi_app == '[[ project_name ]].wsgi:application':
+    wsgi_app = '[[ project_name ]].asgi:application'
+threads = int(os.environ.get('GUNICORN_THREADS', '1'))
+
+# Recycle workers now and then to bound memory growth, staggered so they don't all restart at once.
+max_requests = 1000
+max_requests_jitter = 100
+keepalive = 5
+timeout = 30
+
+# Heartbeat files on tmpfs, so a slow disk can't make the arbiter kill healthy workers.
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+accesslog = '-'
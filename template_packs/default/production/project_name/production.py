@@ -0,0 +1,95 @@
+"""
+Production settings for [[ project_name ]].
+
+Imports the base settings, then overrides them with values from the environment
+and the .env file next to manage.py. wsgi.py and asgi.py load this module;
+manage.py keeps the development settings, so run management commands for
+production with --settings=[[ project_name ]].production, e.g.
+`uv run python manage.py collectstatic --settings=[[ project_name ]].production`.
+"""
+
+import os
+
+import django
+from django.core.exceptions import ImproperlyConfigured
+
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR, DATABASES, TEMPLATES
+
+
+def read_env(path):
+    """Return the KEY=value pairs of a .env file; real environment variables take precedence."""
+    values = {}
+    if path.exists():
+        for line in path.read_text().splitlines():
+            line = line.strip()
+            if line and not line.startswith('#') and '=' in line:
+                key, value = line.split('=', 1)
+                values[key.strip()] = value.strip().strip('\'"')
+    values.update(os.environ)
+    return values
+
+
+ENV = read_env(BASE_DIR / '.env')
+
+DEBUG = ENV.get('DEBUG', 'False').lower() in ('1', 'true', 'yes')
+
+# The key startproject wrote into settings.py is committed to Git, so it is never used here.
+SECRET_KEY = ENV.get('SECRET_KEY', '')
+if not SECRET_KEY or SECRET_KEY == 'your-secret-key' or SECRET_KEY.startswith('django-insecure-'):
+    raise ImproperlyConfigured(
+        "SECRET_KEY is missing or insecure. Set it in .env or the environment to a long random value, e.g. the "
+        "output of: uv run python -c 'from django.core.management.utils import get_random_secret_key as k; print(k())'"
+    )
+
+ALLOWED_HOSTS = [host.strip() for host in ENV.get('ALLOWED_HOSTS', 'localhost,127.0.0.1').split(',') if host.strip()]
+
+# Compile each template once per process instead of on every render.
+TEMPLATES[0]['APP_DIRS'] = False
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+
+# Keep database connections open between requests instead of reconnecting every time.
+DATABASES['default']['CONN_MAX_AGE'] = int(ENV.get('CONN_MAX_AGE', '60'))
+DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    # WAL lets reads proceed during a write; synchronous=NORMAL is safe in WAL mode and avoids an fsync per commit.
+    SQLITE_PRAGMAS = 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL; PRAGMA busy_timeout=5000;'
+    if django.VERSION >= (5, 1):
+        DATABASES['default'].setdefault('OPTIONS', {}).update({
+            'init_command': SQLITE_PRAGMAS,
+            'transaction_mode': 'IMMEDIATE',
+        })
+    else:
+        from django.db.backends.signals import connection_created
+
+        def set_sqlite_pragmas(sender, connection, **kwargs):
+            if connection.vendor == 'sqlite':
+                connection.connection.executescript(SQLITE_PRAGMAS)
+
+        connection_created.connect(set_sqlite_pragmas)
+
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'memcached': 'django.core.cache.backends.memcached.PyMemcacheCache',
+    'database': 'django.core.cache.backends.db.DatabaseCache',
+}
+CACHE_BACKEND = ENV.get('CACHE_BACKEND', 'locmem')
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS.get(CACHE_BACKEND, CACHE_BACKEND),
+        'LOCATION': ENV.get('CACHE_LOCATION', ''),
+        'TIMEOUT': int(ENV.get('CACHE_TIMEOUT', '300')),
+    }
+}
+
+# Read sessions from the cache and fall back to the database, so a cache flush doesn't log everyone out.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
@@ -0,0 +1,69 @@
+"""
+Static files storage for [[ project_name ]].
+
+collectstatic copies every file into STATIC_ROOT under a content-hashed name
+(css/output.css becomes css/output.1d2e3f4a5b6c.css) and records the mapping in
+staticfiles.json, which {% static %} reads when DEBUG is off. Text assets also
+get .gz and .br siblings so the web server or CDN can serve them precompressed.
+"""
+
+import gzip
+import os
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:  # .br files are only written when the brotli package is installed.
+    brotli = None
+
+
+class PrecompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Manifest storage that writes gzip and Brotli copies of compressible files.
+
+    A hashed name changes whenever the content does, so a hashed file whose
+    compressed copies exist is already up to date; only new content is compressed.
+    """
+
+    COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.mjs', '.map', '.json', '.svg', '.html', '.txt', '.xml')
+    # Below this size the compressed copy saves less than the extra lookup costs.
+    MIN_SIZE = 256
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        compressed = sum(self.compress(name) for name in set(self.hashed_files.values()))
+        if compressed:
+            print(f"Wrote {compressed} precompressed static files.")
+
+    def compress(self, name):
+        """Write the missing .gz and .br copies of ``name``; return how many were written."""
+        path = self.path(name)
+        if not name.endswith(self.COMPRESSIBLE_EXTENSIONS) or not os.path.isfile(path):
+            return 0
+        missing = [(suffix, compressor) for suffix, compressor in self.compressors()
+                   if not os.path.exists(path + suffix)]
+        if not missing or os.path.getsize(path) < self.MIN_SIZE:
+            return 0
+
+        with open(path, 'rb') as f:
+            content = f.read()
+        written = 0
+        for suffix, compressor in missing:
+            data = compressor(content)
+            if len(data) >= len(content):
+                continue
+            temp_path = f"{path}{suffix}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path + suffix)
+            written += 1
+        return written
+
+    @staticmethod
+    def compressors():
+        # mtime=0 keeps the gzip output identical for identical input.
+        yield '.gz', lambda content: gzip.compress(content, compresslevel=9, mtime=0)
+        if brotli is not None:
+            yield '.br', lambda content: brotli.compress(content, quality=11)
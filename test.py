@@ -1,46 +1,97 @@
+import asyncio
+import gzip
+import hashlib
+import importlib.util
+import json
 import os
 import shutil
+import socket
+import stat
 import subprocess
+import sys
+import tempfile
+import threading
 import time
+from contextlib import contextmanager
+from functools import partial
+from http.server import BaseHTTPRequestHandler, SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import benchmark
+from batch_manager import BatchManager
+from command_runner import CommandRunner, CommandTimeout
+from directory_manager import DirectoryManager
+from django_project_manager import DjangoProjectManager
+from generation_journal import GenerationJournal
+from node_store import NodeModulesStore
+from scaffold_server import ScaffoldClient
+from step_scheduler import StepScheduler
+from tailwind_standalone import TailwindStandalone
+from template_pack import TemplatePack
+from toolchain import Toolchain
+from trace_recorder import TraceRecorder
 
 # Define test variables
 PROJECT_NAME = "test_project"
 APP_NAME = "test_app"
-TEST_DIR = "app_test"
-INSTALL_DIR = os.path.join(os.getcwd(), TEST_DIR)
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+MAIN = os.path.join(ROOT_DIR, "main.py")
+TEST_ROOT = tempfile.mkdtemp(prefix="django-setup-test-")
+INSTALL_DIR = os.path.join(TEST_ROOT, "app_test")
 TIMEOUT = 60  # Timeout for each subprocess in seconds
 
+# The benchmark's fake uv, npm, git and snap stand in for the real, networked toolchain.
+REAL_GIT = shutil.which("git")
+BIN_DIR, FAKE_DJANGO = benchmark.create_fake_toolchain(os.path.join(TEST_ROOT, "toolchain"))
+
+def fake_env(cache_name="cache", **extra):
+    """Return an environment running main.py against the fake toolchain, with its own cache directory."""
+    env = benchmark.fake_environment(BIN_DIR, FAKE_DJANGO, os.path.join(TEST_ROOT, cache_name), 0.0, 0.0)
+    env.update(extra)
+    return env
+
+@contextmanager
+def environment(**values):
+    """Set environment variables for in-process tests, restoring the previous values afterwards."""
+    saved = {key: os.environ.get(key) for key in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
 def setup_test_environment():
     """Set up the initial directory structure for testing."""
-    os.makedirs(TEST_DIR, exist_ok=True)
-    os.chdir(TEST_DIR)
+    os.makedirs(INSTALL_DIR, exist_ok=True)
+    os.chdir(INSTALL_DIR)
     print(f"Setup test environment at: {INSTALL_DIR}")
 
 def cleanup_test_environment():
     """Remove the test environment directory."""
-    os.chdir("..")
-    shutil.rmtree(TEST_DIR)
+    os.chdir(TEST_ROOT)
+    shutil.rmtree(INSTALL_DIR)
     print("Test environment cleaned up.")
 
-def run_command(command, input_text=None, timeout=TIMEOUT):
-    """Run a shell command with automated directory input and Tailwind CSS prompt response."""
+def run_command(args, input_text=None, timeout=TIMEOUT, env=None):
+    """Run main.py with ``args``, answering the directory prompt (unless --directory is given) and the Tailwind prompt."""
+    command = [sys.executable, MAIN, *args]
+    input_text = f"{'y' if input_text is None else input_text}\n"  # Respond with 'y' to Tailwind prompt
+    if "--directory" not in args:
+        input_text = f"{INSTALL_DIR}\n{input_text}"
     try:
-        input_text = f"{INSTALL_DIR}\n{'y' if input_text is None else input_text}\n"  # Respond with 'y' to Tailwind prompt
-
-        process = subprocess.Popen(
-            command, shell=True, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-        )
-        stdout, stderr = process.communicate(input=input_text.encode(), timeout=timeout)
-
-        print(f"Command '{command}' completed with exit code {process.returncode}")
-        print(f"stdout:\n{stdout.decode()}")
-        print(f"stderr:\n{stderr.decode()}")
-
-        return process.returncode, stdout.decode(), stderr.decode()
+        result = subprocess.run(command, input=input_text, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                text=True, timeout=timeout, env=env or fake_env())
     except subprocess.TimeoutExpired:
-        process.kill()
-        print(f"Command '{command}' timed out.")
-        return 1, "", f"Command '{command}' timed out."
+        print(f"Command '{' '.join(command)}' timed out.")
+        return 1, "", f"Command '{' '.join(command)}' timed out."
+
+    print(f"Command '{' '.join(command)}' completed with exit code {result.returncode}")
+    print(f"stdout:\n{result.stdout}")
+    print(f"stderr:\n{result.stderr}")
+    return result.returncode, result.stdout, result.stderr
 
 def test_directory_structure():
     """Test the initial creation of the installation directory."""
@@ -52,8 +103,8 @@ def test_django_project_and_app_creation(with_tailwind):
     print(f"Testing Django project and app creation (with_tailwind={with_tailwind})...")
 
     # Command to create project and app
-    tailwind_option = "" if with_tailwind else "--no-tailwind"
-    returncode, stdout, stderr = run_command(f"python3 ../main.py {PROJECT_NAME} {APP_NAME} {tailwind_option}")
+    tailwind_option = [] if with_tailwind else ["--no-tailwind"]
+    returncode, stdout, stderr = run_command([PROJECT_NAME, APP_NAME, *tailwind_option])
     assert returncode == 0, f"Project setup failed with error: {stderr}"
 
     # Verify project and app directories within INSTALL_DIR
@@ -116,6 +167,826 @@ def test_tailwind_setup():
     assert '"watch": "npx tailwindcss -i ./static/css/tailwind.css -o ./static/css/output.css --watch"' in package_json_content, "Tailwind watch script not found in package.json."
     assert '"dev": "npx tailwindcss -i ./static/css/tailwind.css -o ./static/css/output.css --watch"' in package_json_content, "Tailwind dev script not found in package.json."
 
+def test_gitignore_merges_into_user_file():
+    """Test that the scaffolder's ignore rules are merged into a .gitignore the user wrote, keeping their entries."""
+    print("Testing .gitignore merge...")
+    directory = os.path.join(INSTALL_DIR, "ignored")
+    os.makedirs(directory)
+    subprocess.run(["git", "init"], cwd=directory, env=fake_env(), check=True)
+    with open(os.path.join(directory, ".gitignore"), 'w') as f:
+        f.write("secrets.txt")
+    returncode, stdout, stderr = run_command([PROJECT_NAME, APP_NAME, "--directory", directory, "--no-tailwind"])
+    assert returncode == 0, f"Project setup failed with error: {stderr}"
+    with open(os.path.join(directory, ".gitignore")) as f:
+        lines = f.read().splitlines()
+    assert lines[0] == "secrets.txt", "The user's .gitignore entries were lost."
+    for entry in (".env", "node_modules/", GenerationJournal.FILENAME):
+        assert lines.count(entry) == 1, f"'{entry}' was not added to .gitignore exactly once."
+    with open(os.path.join(directory, GenerationJournal.FILENAME)) as f:
+        journal = json.load(f)
+    assert ".gitignore" in journal["preexisting"] and ".gitignore" in journal["files"], \
+        "The merged .gitignore was not recorded in the journal."
+
+def test_journal_resume_keeps_edited_files():
+    """Test that a failed run resumes from the failed step and keeps files edited in between."""
+    print("Testing journal resume...")
+    # An empty node_modules store makes the run call npm, which the short timeout then stops.
+    env = fake_env("resume-cache", FAKE_NPM_LATENCY="5")
+    returncode, stdout, _ = run_command([PROJECT_NAME, APP_NAME, "--directory", INSTALL_DIR,
+                                        "--command-timeout", "1", "--retries", "0"], env=env)
+    assert returncode != 0, "The run should fail when npm times out."
+    assert "timed out after 1s" in stdout, "The npm timeout was not reported."
+
+    with open(os.path.join(INSTALL_DIR, GenerationJournal.FILENAME)) as f:
+        journal = json.load(f)
+    assert journal["failed"]["step"] == "tailwind_install", f"Unexpected failed step: {journal['failed']}"
+    assert "uv_init" in journal["steps"], "Finished steps were not recorded."
+
+    edited = "{# edited by hand #}\n"
+    with open("templates/base.html", 'w') as f:
+        f.write(edited)
+
+    returncode, stdout, stderr = run_command([PROJECT_NAME, APP_NAME, "--directory", INSTALL_DIR],
+                                             env=fake_env("resume-cache"))
+    assert returncode == 0, f"Resumed run failed with error: {stderr}"
+    assert "Resuming: step 'tailwind_install' failed last time" in stdout, "The resumed run did not report the failed step."
+    assert "Skipping step 'uv_init', already completed." in stdout, "Finished steps ran again."
+    with open("templates/base.html") as f:
+        assert f.read() == edited, "The edited base.html was overwritten."
+    assert os.path.isfile("static/css/output.css"), "The resumed run did not finish the Tailwind build."
+
+    # Regenerating files under the journal skips the edited one but still updates untouched ones.
+    with open(GenerationJournal.FILENAME) as f:
+        signature = json.load(f)["signature"]
+    journal = GenerationJournal.open(INSTALL_DIR, signature)
+    try:
+        assert not DirectoryManager.write_file(os.path.abspath("templates/base.html"), "regenerated\n"), "The edited base.html was rewritten."
+        assert DirectoryManager.write_file(os.path.abspath("static/css/style.css"), "/* regenerated */\n"), "An untouched generated file was not rewritten."
+    finally:
+        journal.close()
+    with open("templates/base.html") as f:
+        assert f.read() == edited, "The edited base.html was overwritten."
+
+def test_snapshot_rename_and_secret_key():
+    """Test that a snapshot is materialized under the real names, with a fresh SECRET_KEY."""
+    print("Testing snapshot cache rename and SECRET_KEY regeneration...")
+    env = fake_env("snapshot-cache")
+    projects = [("alpha_site", "blog", "BlogConfig"), ("beta_site", "shop_items", "ShopItemsConfig")]
+    keys = []
+    for project_name, app_name, config_class in projects:
+        directory = os.path.join(INSTALL_DIR, project_name)
+        returncode, stdout, stderr = run_command([project_name, app_name, "--directory", directory, "--snapshot-cache"], env=env)
+        assert returncode == 0, f"Snapshot run failed with error: {stderr}"
+
+        settings_path = os.path.join(directory, project_name, "settings.py")
+        assert os.path.isfile(settings_path), f"{settings_path} was not renamed from the snapshot."
+        with open(os.path.join(directory, app_name, "apps.py")) as f:
+            assert f"class {config_class}(AppConfig)" in f.read(), f"apps.py of {app_name} does not define {config_class}."
+        for root, dirs, files in os.walk(directory):
+            dirs[:] = [d for d in dirs if d not in ("node_modules", ".git", ".venv")]
+            for name in files + dirs:
+                assert "dpsnapshot" not in name, f"Placeholder name left in {os.path.join(root, name)}."
+            for name in files:
+                with open(os.path.join(root, name), 'rb') as f:
+                    assert b"dpsnapshot" not in f.read(), f"Placeholder text left in {os.path.join(root, name)}."
+        with open(settings_path) as f:
+            keys += [line for line in f if line.startswith("SECRET_KEY = ")]
+    assert "Snapshot cache hit" in stdout, "The second project was not materialized from the snapshot."
+    assert len(keys) == 2 and keys[0] != keys[1], "Both projects got the same SECRET_KEY."
+
+def test_snapshot_keeps_user_files():
+    """Test that materializing a snapshot keeps files the target directory already had."""
+    print("Testing that snapshots keep existing files...")
+    directory = os.path.join(INSTALL_DIR, "gamma_site")
+    user_files = {"README.md": "# My notes\n", ".env": "SECRET_KEY=mine\n", "templates/base.html": "<html>mine</html>\n"}
+    for path, content in user_files.items():
+        os.makedirs(os.path.dirname(os.path.join(directory, path)), exist_ok=True)
+        with open(os.path.join(directory, path), 'w') as f:
+            f.write(content)
+    returncode, stdout, stderr = run_command(["gamma_site", "blog", "--directory", directory, "--snapshot-cache"],
+                                             env=fake_env("snapshot-cache"))
+    assert returncode == 0, f"Snapshot run failed with error: {stderr}"
+    assert "Snapshot cache hit" in stdout, "The run was not served from the snapshot."
+    for path, content in user_files.items():
+        with open(os.path.join(directory, path)) as f:
+            assert f.read() == content, f"The snapshot overwrote {path}."
+        assert f"Keeping preexisting file {path}." in stdout, f"Keeping {path} was not reported."
+    assert os.path.isfile(os.path.join(directory, "gamma_site", "settings.py")), "The rest of the snapshot was not copied."
+
+def test_production_profile():
+    """Test that the production profile gets its own SECRET_KEY and switches only the servers to its settings."""
+    print("Testing the production profile...")
+    env_keys = []
+    for project_name in ("prod_one", "prod_two"):
+        directory = os.path.join(INSTALL_DIR, project_name)
+        returncode, stdout, stderr = run_command([project_name, "--directory", directory, "--profile", "production",
+                                                  "--no-tailwind", "--snapshot-cache"], env=fake_env("production-cache"))
+        assert returncode == 0, f"Production project setup failed with error: {stderr}"
+
+        with open(os.path.join(directory, ".env")) as f:
+            env_lines = [line for line in f.read().splitlines() if line.startswith("SECRET_KEY=")]
+        assert len(env_lines) == 1, "The production .env has no SECRET_KEY line."
+        key = env_lines[0][len("SECRET_KEY="):].strip("'")
+        assert len(key) == 50 and not key.startswith("django-insecure-"), f"The production .env key is not a fresh secret: {key!r}"
+        with open(os.path.join(directory, project_name, "settings.py")) as f:
+            assert key not in f.read(), "The production key is the one committed in settings.py."
+        env_keys.append(key)
+
+        for filename in ("wsgi.py", "asgi.py"):
+            with open(os.path.join(directory, project_name, filename)) as f:
+                assert f"'{project_name}.production'" in f.read(), f"{filename} does not use the production settings."
+        with open(os.path.join(directory, "manage.py")) as f:
+            assert f"'{project_name}.settings'" in f.read(), "manage.py was switched to the production settings."
+        assert f"pass --settings={project_name}.production" in stdout, "The manage.py settings notice was not printed."
+
+        with open(os.path.join(directory, project_name, "production.py")) as f:
+            production = f.read()
+        compile(production, "production.py", "exec")
+        assert "raise ImproperlyConfigured(" in production and "SECRET_KEY = ENV.get('SECRET_KEY', '')" in production, \
+            "production.py does not refuse a missing or insecure SECRET_KEY."
+        with open(os.path.join(directory, "gunicorn.conf.py")) as f:
+            assert f"'{project_name}.wsgi:application'" in f.read(), "gunicorn.conf.py does not serve the project."
+    assert "Snapshot cache hit" in stdout, "The second production project was not materialized from the snapshot."
+    assert env_keys[0] != env_keys[1], "Projects materialized from one snapshot share the production SECRET_KEY."
+
+def test_rerun_with_other_options():
+    """Test that a completed project is not regenerated with other options and that files keep their provenance."""
+    print("Testing reruns with different options...")
+    directory = os.path.join(INSTALL_DIR, "rerun")
+    returncode, _, stderr = run_command([PROJECT_NAME, "--directory", directory, "--profile", "production", "--no-tailwind"])
+    assert returncode == 0, f"Production project setup failed with error: {stderr}"
+    with open(os.path.join(directory, ".env")) as f:
+        production_env = f.read()
+
+    returncode, stdout, _ = run_command([PROJECT_NAME, "extra", "--directory", directory, "--no-tailwind"])
+    assert returncode == 1, "A completed project was regenerated with different options."
+    assert f"Refusing to scaffold into {directory}: it holds a completed project" in stdout, "The refusal was not explained."
+    with open(os.path.join(directory, ".env")) as f:
+        assert f.read() == production_env, "The rerun replaced the production .env."
+    assert not os.path.exists(os.path.join(directory, "extra")), "The rerun created the extra app."
+
+    returncode, stdout, _ = run_command([PROJECT_NAME, "extra", "--directory", directory, "--no-tailwind", "--plan"])
+    assert returncode == 1, "--plan did not report the completed project as a conflict."
+    assert f"Conflict: {GenerationJournal.FILENAME}: it holds a completed project" in stdout, "The --plan conflict was not reported."
+
+    # An unfinished run records which step wrote each file; other inputs keep it instead of overwriting it.
+    partial = os.path.join(INSTALL_DIR, "partial")
+    os.makedirs(partial)
+    env_path = os.path.join(partial, ".env")
+    journal = GenerationJournal.open(partial, "a" * 64)
+    try:
+        with TraceRecorder.instance().step('production_profile', PROJECT_NAME):
+            assert DirectoryManager.write_file(env_path, "DEBUG=False\n"), "The first run did not write .env."
+    finally:
+        journal.close()
+    with open(os.path.join(partial, GenerationJournal.FILENAME)) as f:
+        entry = json.load(f)['files']['.env']
+    assert entry['step'] == 'production_profile' and entry['signature'] == "a" * 16, f"Wrong provenance recorded: {entry}"
+
+    journal = GenerationJournal.open(partial, "b" * 64)
+    try:
+        assert not DirectoryManager.write_file(env_path, "DEBUG=True\n"), "A file from other options was overwritten."
+    finally:
+        journal.close()
+    with open(env_path) as f:
+        assert f.read() == "DEBUG=False\n", "The .env written with other options was changed."
+
+def test_batch_manifest():
+    """Test manifest loading, numbered labels for projects sharing a name, and the per-project report."""
+    print("Testing batch manifests...")
+    batch_dir = os.path.join(INSTALL_DIR, "batch")
+    os.makedirs(os.path.join(batch_dir, "broken"))
+    with open(os.path.join(batch_dir, "broken", "manage.py"), 'w') as f:
+        f.write("# not Django's\n")
+    manifest = os.path.join(batch_dir, "projects.toml")
+    with open(manifest, 'w') as f:
+        f.write('workers = 3\n\n[defaults]\ntailwind = false\n\n'
+                '[[project]]\nname = "shop"\napp = "catalog"\ndirectory = "one"\n\n'
+                '[[project]]\nname = "shop"\napps = ["cart", "orders"]\ndirectory = "two"\n\n'
+                '[[project]]\nname = "broken"\n')
+
+    specs, workers = BatchManager.load_manifest(manifest)
+    assert workers == 3, "The manifest's worker count was not read."
+    assert [spec.directory for spec in specs] == [os.path.join(batch_dir, name) for name in ("one", "two", "broken")], \
+        "Relative directories were not resolved against the manifest's folder."
+    assert specs[1].app_names == ["cart", "orders"] and not any(spec.install_tailwind for spec in specs), \
+        "Per-project keys and [defaults] were not applied."
+
+    duplicate = os.path.join(batch_dir, "duplicate.toml")
+    with open(duplicate, 'w') as f:
+        f.write('[[project]]\nname = "a"\ndirectory = "same"\n\n[[project]]\nname = "b"\ndirectory = "same"\n')
+    try:
+        BatchManager.load_manifest(duplicate)
+        raise AssertionError("A manifest assigning two projects to one directory was accepted.")
+    except ValueError as e:
+        assert "several projects to the same directory" in str(e), f"Unexpected error: {e}"
+
+    returncode, stdout, _ = run_command(["--manifest", manifest], env=fake_env("batch-cache"))
+    assert returncode == 1, "A batch with a failed project should exit 1."
+    report = stdout[stdout.index("Batch report:"):]
+    for label, status in (("shop#1", "ok"), ("shop#2", "ok"), ("broken", "failed")):
+        assert any(line.split()[:2] == [label, status] for line in report.splitlines()), f"{label} is not reported as {status}."
+    assert "2 succeeded, 1 failed." in report, "The batch totals are wrong."
+    for directory, apps in (("one", ["catalog"]), ("two", ["cart", "orders"])):
+        for app in apps:
+            assert os.path.isfile(os.path.join(batch_dir, directory, app, "urls.py")), f"{app} was not created in {directory}."
+
+def test_toolchain_probe_cache():
+    """Test that tool versions are probed once per binary and probed again when the binary changes."""
+    print("Testing the toolchain probe cache...")
+    bin_dir = os.path.join(TEST_ROOT, "probe-bin")
+    os.makedirs(bin_dir)
+    tool, log = os.path.join(bin_dir, "probetool"), os.path.join(TEST_ROOT, "probe.log")
+
+    def install(version):
+        with open(tool, 'w') as f:
+            f.write(f"#!/bin/sh\necho probed >> {log}\necho 'probetool {version}'\n")
+        os.chmod(tool, 0o755)
+
+    def probes():
+        with open(log) as f:
+            return len(f.readlines())
+
+    cache_dir = os.path.join(TEST_ROOT, "probe-cache")
+    with environment(PATH=f"{bin_dir}{os.pathsep}{os.environ['PATH']}", DJANGO_SETUP_CACHE_DIR=cache_dir):
+        try:
+            install("1.0")
+            assert Toolchain.get("probetool").version == "probetool 1.0", "The probe did not read the version."
+            Toolchain.forget("probetool")
+            assert Toolchain.get("probetool").version == "probetool 1.0" and probes() == 1, \
+                "An unchanged binary was probed again instead of using the cache."
+
+            install("2.00")
+            Toolchain.forget("probetool")
+            assert Toolchain.get("probetool").version == "probetool 2.00", "A replaced binary kept its cached version."
+            assert probes() == 2, "The replaced binary was not probed exactly once more."
+            assert not Toolchain.get("missingtool").installed, "A tool absent from PATH counts as installed."
+        finally:
+            Toolchain.forget("probetool")
+
+def test_trace_output():
+    """Test that --trace writes a Chrome trace and a summary covering every step, its commands and its writes."""
+    print("Testing --trace output...")
+    directory = os.path.join(INSTALL_DIR, "traced")
+    trace_path = os.path.join(TEST_ROOT, "trace.json")
+    returncode, stdout, stderr = run_command([PROJECT_NAME, APP_NAME, "--directory", directory, "--no-tailwind",
+                                              "--trace", trace_path])
+    assert returncode == 0, f"Traced project setup failed with error: {stderr}"
+    summary_path = os.path.join(TEST_ROOT, "trace.summary.json")
+    assert f"Wrote trace to {trace_path} and summary to {summary_path}." in stdout, "The trace paths were not reported."
+
+    with open(trace_path) as f:
+        events = json.load(f)['traceEvents']
+    assert {"name": "process_name", "ph": "M", "pid": 1, "tid": 0, "args": {"name": PROJECT_NAME}} in events, \
+        "The trace has no process row for the project."
+    steps = {event['name']: event for event in events if event['ph'] == 'X'}
+    for name in ("uv_init", "add_django", "startproject", "app_files", "register_apps"):
+        assert name in steps and steps[name]['args']['status'] == 'ok', f"Step {name} is missing from the trace."
+    assert steps['uv_init']['args']['exit_codes'] == [0], "The uv init exit code was not traced."
+    assert steps['app_files']['args']['files_created'] > 0, "The app files were not counted."
+
+    with open(summary_path) as f:
+        project = json.load(f)['projects'][PROJECT_NAME]
+    assert {step['name'] for step in project['steps']} == set(steps), "The summary and the trace list different steps."
+    assert project['bytes_written'] == sum(step['bytes_written'] for step in project['steps']) > 0, \
+        "The summary's byte total does not add up its steps."
+    assert 0 < max(step['wall_time'] for step in project['steps']) <= project['wall_time'], "The project wall time is wrong."
+
+    recorder = TraceRecorder()
+    try:
+        with recorder.step('broken', 'traced'):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    assert recorder.summary()['projects']['traced']['steps'][0]['status'] == 'failed', "A failed step was not marked failed."
+
+def test_custom_template_pack():
+    """Test that a pack directory is rendered with [[ var ]] substitution and app-named paths, leaving Django tags alone."""
+    print("Testing a custom template pack...")
+    pack_dir = os.path.join(TEST_ROOT, "custom_pack")
+    pack_files = {
+        "site/docs/notes.md": "# [[ project_name ]]\n",
+        "site/templates/base.html": "<title>[[project_name]]</title>{% block content %}{% endblock %}[[ tailwind_stylesheet ]]\n",
+        "app/app_name/urls.py": "app_name = '[[ app_name ]]'\nurlpatterns = []\n",
+        "app/app_name/templates/app_name/index.html": "{% extends 'base.html' %}<h1>[[ camel_case_app_name ]] {{ title }}</h1>\n",
+    }
+    for relative_path, content in pack_files.items():
+        os.makedirs(os.path.dirname(os.path.join(pack_dir, relative_path)), exist_ok=True)
+        with open(os.path.join(pack_dir, relative_path), 'w') as f:
+            f.write(content)
+
+    directory = os.path.join(INSTALL_DIR, "packed")
+    returncode, _, stderr = run_command([PROJECT_NAME, "blog_posts", "--directory", directory, "--no-tailwind",
+                                         "--template-pack", pack_dir])
+    assert returncode == 0, f"Project setup with a custom pack failed with error: {stderr}"
+    expected = {
+        "docs/notes.md": f"# {PROJECT_NAME}\n",
+        "templates/base.html": f"<title>{PROJECT_NAME}</title>{{% block content %}}{{% endblock %}}\n",
+        "blog_posts/urls.py": "app_name = 'blog_posts'\nurlpatterns = []\n",
+        "blog_posts/templates/blog_posts/index.html": "{% extends 'base.html' %}<h1>BlogPosts {{ title }}</h1>\n",
+    }
+    for relative_path, content in expected.items():
+        with open(os.path.join(directory, relative_path)) as f:
+            assert f.read() == content, f"{relative_path} was not rendered from the custom pack."
+    assert not os.path.exists(os.path.join(directory, "blog_posts", "forms.py")), "A file missing from the pack was generated."
+
+    with open(os.path.join(pack_dir, "site", "typo.txt"), 'w') as f:
+        f.write("[[ projct_name ]]\n")
+    pack = TemplatePack(pack_dir, pack_dir)
+    try:
+        pack.render('site', {'project_name': PROJECT_NAME, 'tailwind_stylesheet': ''})
+        raise AssertionError("An unknown template variable was rendered.")
+    except ValueError as e:
+        assert "unknown variable 'projct_name' in typo.txt" in str(e), f"Unexpected error: {e}"
+
+def test_multiple_apps():
+    """Test that several apps are created and each is registered once in INSTALLED_APPS and the root urlconf."""
+    print("Testing projects with several apps...")
+    directory = os.path.join(INSTALL_DIR, "multi")
+    apps = ["blog", "shop", "news"]
+    returncode, stdout, stderr = run_command([PROJECT_NAME, "blog,shop", "news", "--directory", directory, "--no-tailwind"])
+    assert returncode == 0, f"Multi-app project setup failed with error: {stderr}"
+    assert "Registered 3 apps in INSTALLED_APPS and the root urlconf." in stdout, "The apps were not registered."
+
+    def registrations():
+        with open(os.path.join(directory, PROJECT_NAME, "settings.py")) as f:
+            settings = f.read()
+        with open(os.path.join(directory, PROJECT_NAME, "urls.py")) as f:
+            urls = f.read()
+        return settings, urls
+
+    settings, urls = registrations()
+    for app in apps:
+        assert os.path.isfile(os.path.join(directory, app, "urls.py")), f"App {app} was not created."
+        assert settings.count(f"    '{app}',\n") == 1, f"{app} is not in INSTALLED_APPS exactly once."
+        assert urls.count(f"path('{app}/', include('{app}.urls'))") == 1, f"{app} is not in the root urlconf exactly once."
+    assert settings.index("'blog'") < settings.index("'shop'") < settings.index("'news'"), "The apps were registered out of order."
+    assert "'DIRS': [BASE_DIR / 'templates']," in settings, "The site templates directory was not added to TEMPLATES."
+    assert "from django.urls import include, path\n" in urls, "include was not imported in the root urlconf."
+
+    DjangoProjectManager.register_apps(directory, PROJECT_NAME, apps)
+    assert registrations() == (settings, urls), "Registering the same apps again changed settings.py or urls.py."
+
+    returncode, _, stderr = run_command([PROJECT_NAME, "blog", "blog", "--directory", os.path.join(INSTALL_DIR, "twice")])
+    assert returncode != 0 and "App names must be unique; blog given more than once." in stderr, "Duplicate apps were accepted."
+
+def test_node_modules_store():
+    """Test that Tailwind is installed into the store once, linked into projects, used offline and garbage collected."""
+    print("Testing the shared node_modules store...")
+    cache_dir = os.path.join(TEST_ROOT, "store-cache")
+    for index, name in enumerate(("linked_one", "linked_two")):
+        directory = os.path.join(INSTALL_DIR, name)
+        returncode, stdout, stderr = run_command([PROJECT_NAME, "--directory", directory], env=fake_env("store-cache"))
+        assert returncode == 0, f"Tailwind project setup failed with error: {stderr}"
+        assert ("Installing tailwindcss 3.4.17 into the shared node_modules store." in stdout) == (index == 0), \
+            "Tailwind was not installed into the store exactly once."
+        assert "Linked tailwindcss 3.4.17 from the shared node_modules store." in stdout, "Tailwind was not linked from the store."
+        with open(os.path.join(directory, "package.json")) as f:
+            assert json.load(f)["name"] == name, "package.json kept the store entry's package name."
+
+    with environment(DJANGO_SETUP_CACHE_DIR=cache_dir):
+        entry = os.path.join(NodeModulesStore.store_directory(), NodeModulesStore.key("3.4.17"))
+        stored_file = os.path.join(entry, "node_modules", "tailwindcss", "lib", "index.js")
+        for name in ("linked_one", "linked_two"):
+            linked_file = os.path.join(INSTALL_DIR, name, "node_modules", "tailwindcss", "lib", "index.js")
+            assert os.path.samefile(linked_file, stored_file), f"{name}'s node_modules is not hardlinked from the store."
+
+        # With the registry unreachable and no remembered resolution, "latest" falls back to the newest stored version.
+        os.remove(NodeModulesStore._resolutions_path())
+        with environment(PATH=f"{BIN_DIR}{os.pathsep}{os.environ['PATH']}", FAKE_OFFLINE="1"):
+            assert NodeModulesStore.resolve_version() == "3.4.17", "The stored version was not used offline."
+            assert NodeModulesStore.resolve_version("^4") is None, "An unstored range resolved offline."
+
+        old = os.path.join(NodeModulesStore.store_directory(), "0123456789abcdef")
+        os.makedirs(old)
+        with open(os.path.join(old, "meta.json"), 'w') as f:
+            json.dump({"key": NodeModulesStore.key("3.0.0"), "package": "tailwindcss", "version": "3.0.0",
+                       "created": 0, "last_used": 0, "size": 1024}, f)
+        assert NodeModulesStore.stored_versions() == ["3.0.0", "3.4.17"], "The store does not list both versions."
+        assert NodeModulesStore.gc(30) == 1024 and not os.path.exists(old), "An unused version was not collected."
+        with open(os.path.join(entry, "meta.json")) as f:
+            meta = json.load(f)
+        with open(os.path.join(entry, "meta.json"), 'w') as f:
+            json.dump(dict(meta, last_used=0), f)
+        NodeModulesStore.gc(30)
+        assert os.path.isdir(entry), "gc removed the most recently used version."
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """Serves a directory over HTTP without logging every request."""
+
+    def log_message(self, format, *args):
+        pass
+
+def test_standalone_tailwind_checksums():
+    """Test that a standalone Tailwind download is kept only when its SHA-256 matches the published or pinned one."""
+    print("Testing standalone Tailwind checksum verification...")
+    release_dir = os.path.join(TEST_ROOT, "releases")
+    asset = f"tailwindcss-{TailwindStandalone.platform_suffix()}"
+    binary = b"#!/bin/sh\necho tailwindcss\n"
+    digest = hashlib.sha256(binary).hexdigest()
+    checksums = {"1.0.0": f"{digest}  ./{asset}\n", "1.0.1": f"{'0' * 64}  {asset}\n", "1.0.2": f"{digest}  other-asset\n"}
+    for version, listing in checksums.items():
+        os.makedirs(os.path.join(release_dir, f"v{version}"))
+        with open(os.path.join(release_dir, f"v{version}", asset), 'wb') as f:
+            f.write(binary)
+        with open(os.path.join(release_dir, f"v{version}", TailwindStandalone.CHECKSUMS_ASSET), 'w') as f:
+            f.write(listing)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(QuietHandler, directory=release_dir))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    release_url = TailwindStandalone.RELEASE_URL
+    TailwindStandalone.RELEASE_URL = f"http://127.0.0.1:{server.server_port}"
+    try:
+        with environment(DJANGO_SETUP_CACHE_DIR=os.path.join(TEST_ROOT, "standalone-cache")):
+            path = TailwindStandalone.ensure("1.0.0")
+            with open(path, 'rb') as f:
+                assert f.read() == binary, "The downloaded executable differs from the release asset."
+            assert os.stat(path).st_mode & 0o777 == 0o755, "The downloaded executable is not executable."
+
+            for version in ("1.0.1", "1.0.2"):
+                try:
+                    TailwindStandalone.ensure(version)
+                    raise AssertionError(f"Tailwind {version} was accepted without a matching checksum.")
+                except SystemExit as e:
+                    assert e.code == 1, f"Rejecting Tailwind {version} exited with {e.code}."
+                cache = os.path.dirname(TailwindStandalone.binary_path(version))
+                assert not [name for name in os.listdir(cache) if version in name], f"Tailwind {version} was left in the cache."
+
+            with environment(DJANGO_SETUP_TAILWIND_SHA256=digest.upper()):
+                assert os.path.isfile(TailwindStandalone.ensure("1.0.2")), "A pinned checksum was not honoured."
+    finally:
+        TailwindStandalone.RELEASE_URL = release_url
+        server.shutdown()
+        server.server_close()
+
+def test_workspace_members():
+    """Test that --workspace registers members once and adds Django offline from a workspace lock that pins it."""
+    print("Testing uv workspace members...")
+    workspace = os.path.join(INSTALL_DIR, "workspace")
+    os.makedirs(workspace)
+    pyproject = os.path.join(workspace, "pyproject.toml")
+    with open(pyproject, 'w') as f:
+        f.write('[project]\nname = "workspace"\nversion = "0.1.0"\n\n[tool.uv.workspace]\nmembers = ["libs/*"]\n')
+    with open(os.path.join(workspace, "uv.lock"), 'w') as f:
+        f.write('version = 1\n\n[[package]]\nname = "django"\nversion = "5.1.3"\n')
+
+    log = os.path.join(TEST_ROOT, "workspace-tools.log")
+    for member in ("sites/alpha", "libs/beta"):
+        directory = os.path.join(workspace, *member.split("/"))
+        returncode, stdout, stderr = run_command([PROJECT_NAME, "--directory", directory, "--no-tailwind", "--workspace"],
+                                                 env=fake_env(FAKE_TOOL_LOG=log))
+        assert returncode == 0, f"Workspace member setup failed with error: {stderr}"
+        assert "Django 5.1.3 added from the workspace lock." in stdout, f"{member} did not add Django from the workspace lock."
+        registered = f"Registered {member} as a member of the uv workspace at {workspace}." in stdout
+        assert registered == (member == "sites/alpha"), f"{member} was registered wrongly; 'libs/*' already covers libs/beta."
+    with open(pyproject) as f:
+        assert f.read().endswith('members = ["libs/*", "sites/alpha"]\n'), "The workspace members were not updated in place."
+
+    with open(log) as f:
+        adds = [json.loads(line) for line in f if json.loads(line)[:2] == ["uv", "add"]]
+    assert adds and all("--offline" in add and add[-3:-1] == ["--link-mode", "hardlink"] for add in adds), \
+        f"Workspace members did not add Django offline with hardlinks: {adds}"
+
+    outside = os.path.join(INSTALL_DIR, "outside")
+    returncode, stdout, _ = run_command([PROJECT_NAME, "--directory", outside, "--no-tailwind", "--workspace", workspace])
+    assert returncode == 1 and f"{outside} is not inside the uv workspace at {workspace}." in stdout, \
+        "A project outside the workspace was accepted."
+
+def test_prewarm_and_offline():
+    """Test that --offline refuses what was not prewarmed and, after a prewarm, pins its versions without the network."""
+    print("Testing prewarm and --offline...")
+    directory = os.path.join(INSTALL_DIR, "offline")
+    returncode, stdout, _ = run_command([PROJECT_NAME, "--directory", directory, "--offline"], env=fake_env("prewarm-cache"))
+    assert returncode == 1 and "Cannot scaffold offline:" in stdout, "An offline run without a prewarm was not refused."
+    for problem in (f"{PROJECT_NAME}: Django (latest) has not been prewarmed.", f"{PROJECT_NAME}: tailwindcss (latest) has not been prewarmed."):
+        assert problem in stdout, f"The offline check did not report: {problem}"
+    assert not os.path.exists(directory) or not os.listdir(directory), "The refused offline run created files."
+
+    returncode, stdout, stderr = run_command(["prewarm"], env=fake_env("prewarm-cache"))
+    assert returncode == 0, f"prewarm failed with error: {stderr}"
+    assert "Cached Django 5.1.3 in uv's cache." in stdout and "Cached tailwindcss 3.4.17 in the node_modules store." in stdout, \
+        "prewarm did not cache Django and Tailwind."
+
+    log = os.path.join(TEST_ROOT, "offline-tools.log")
+    returncode, _, stderr = run_command([PROJECT_NAME, "--directory", directory, "--offline"],
+                                        env=fake_env("prewarm-cache", FAKE_OFFLINE="1", FAKE_TOOL_LOG=log))
+    assert returncode == 0, f"The prewarmed offline run failed with error: {stderr}"
+    with open(log) as f:
+        commands = [json.loads(line) for line in f]
+    assert ["uv", "add", "django==5.1.3"] in commands, "The offline run did not pin the prewarmed Django."
+    assert not [command for command in commands if command[:2] == ["npm", "view"]], "The offline run asked the npm registry."
+
+    for args, problem in ((["--django-version", "4.2"], "Django 4.2 has not been prewarmed."),
+                          (["--profile", "production"], "gunicorn has not been prewarmed.")):
+        returncode, stdout, _ = run_command([PROJECT_NAME, "--directory", os.path.join(INSTALL_DIR, "offline_pins"),
+                                             "--offline", *args], env=fake_env("prewarm-cache"))
+        assert returncode == 1 and f"{PROJECT_NAME}: {problem}" in stdout, f"The offline check did not report: {problem}"
+
+def test_precompressed_storage():
+    """Test that projects collect static files into hashed names with gzip siblings, compressing each file once."""
+    print("Testing the precompressed static files storage...")
+    directory = os.path.join(INSTALL_DIR, "collected")
+    returncode, stdout, stderr = run_command([PROJECT_NAME, "--directory", directory])
+    assert returncode == 0, f"Project setup failed with error: {stderr}"
+    assert "Configured hashed, precompressed static files for collectstatic." in stdout, "The static pipeline was not configured."
+    with open(os.path.join(directory, PROJECT_NAME, "settings.py")) as f:
+        settings = f.read()
+    backend = f"{PROJECT_NAME}.storage.PrecompressedManifestStaticFilesStorage"
+    for line in ("STATICFILES_DIRS = [BASE_DIR / 'static']", "STATIC_ROOT = BASE_DIR / 'staticfiles'", f"'BACKEND': '{backend}',"):
+        assert line in settings, f"settings.py is missing: {line}"
+    with open(os.path.join(directory, "package.json")) as f:
+        assert "collectstatic --noinput" in json.load(f)["scripts"]["static"], "package.json has no static script."
+
+    try:
+        import django
+        from django.conf import settings as django_settings
+        from django.core.management import call_command
+    except ImportError:
+        print("Django is not importable here; skipping the collectstatic run.")
+        return
+    css = "".join(f".rule-{index} {{ margin: {index}px; }}\n" for index in range(100))
+    with open(os.path.join(directory, "static", "css", "site.css"), 'w') as f:
+        f.write(css)
+    sys.path.insert(0, directory)
+    django_settings.configure(
+        INSTALLED_APPS=["django.contrib.staticfiles"], STATIC_URL="/static/",
+        STATICFILES_DIRS=[os.path.join(directory, "static")], STATIC_ROOT=os.path.join(directory, "staticfiles"),
+        STORAGES={"staticfiles": {"BACKEND": backend}})
+    django.setup()
+    call_command("collectstatic", interactive=False, verbosity=0)
+
+    with open(os.path.join(directory, "staticfiles", "staticfiles.json")) as f:
+        hashed = json.load(f)["paths"]["css/site.css"]
+    hashed_path = os.path.join(directory, "staticfiles", hashed)
+    assert hashed != "css/site.css" and os.path.isfile(hashed_path), "site.css was not collected under a hashed name."
+    with gzip.open(f"{hashed_path}.gz", 'rt') as f:
+        assert f.read() == css, "The gzip sibling does not hold the stylesheet."
+    compressed_at = os.stat(f"{hashed_path}.gz").st_mtime_ns
+    call_command("collectstatic", interactive=False, verbosity=0)
+    assert os.stat(f"{hashed_path}.gz").st_mtime_ns == compressed_at, "An unchanged file was compressed again."
+
+class StatusHandler(BaseHTTPRequestHandler):
+    """Answers /ok with 200 and every other path with 404, keeping connections alive."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"ok\n" if self.path == "/ok" else b"missing\n"
+        self.send_response(200 if self.path == "/ok" else 404)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def test_loadtest_command():
+    """Test that the loadtest command counts only 2xx/3xx responses as successful and reports the error rate."""
+    print("Testing the loadtest command...")
+    directory = os.path.join(INSTALL_DIR, "loaded")
+    returncode, _, stderr = run_command([PROJECT_NAME, "first", "second", "--directory", directory, "--no-tailwind", "--load-test"])
+    assert returncode == 0, f"Load test project setup failed with error: {stderr}"
+    command_path = os.path.join(directory, "first", "management", "commands", "loadtest.py")
+    with open(command_path) as f:
+        source = f.read()
+    compile(source, command_path, "exec")
+    assert "'/first/about/'" in source and "'/second/portfolio/'" in source, "The default paths do not cover every app."
+    assert not os.path.exists(os.path.join(directory, "second", "management")), "The command was added to every app."
+
+    try:
+        from django.conf import settings as django_settings
+    except ImportError:
+        print("Django is not importable here; skipping the loadtest run.")
+        return
+    if not django_settings.configured:
+        django_settings.configure()
+    spec = importlib.util.spec_from_file_location("loadtest_command", command_path)
+    loadtest = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(loadtest)
+
+    assert loadtest.percentile(list(range(1, 101)), 95) == 95, "p95 of 1..100 is not 95."
+    assert loadtest.percentile([7], 99) == 7 and loadtest.percentile([], 50) is None, "Percentiles of short lists are wrong."
+
+    options = {"warmup": 2, "requests": 20, "duration": None, "concurrency": 3, "timeout": 5.0}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StatusHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        results = asyncio.run(loadtest.Command().run("127.0.0.1", server.server_port, ["/ok", "/missing"], options))
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert results["requests"] == 20 and results["successful"] == 10, f"Wrong request counts: {results}"
+    assert results["error_rate"] == 0.5 and results["status_codes"] == {"200": 10, "404": 10}, f"Wrong error rate: {results}"
+    assert results["latency_ms"]["count"] == 10 and set(results["paths"]) == {"/ok", "/missing"}, f"Wrong latencies: {results}"
+
+    # Nothing listens on the closed server's port, so every request fails with a connection error.
+    results = asyncio.run(loadtest.Command().run("127.0.0.1", server.server_port, ["/ok"], dict(options, warmup=0, requests=4)))
+    assert results["error_rate"] == 1.0 and results["errors"] == {"ConnectionRefusedError": 4}, f"Errors were not counted: {results}"
+
+def test_scaffold_server():
+    """Test the server's socket permissions, its JSON-lines protocol, the bounded queue and a clean shutdown."""
+    print("Testing the scaffold server...")
+    socket_path = os.path.join(TEST_ROOT, "scaffold.sock")
+    log_path = os.path.join(TEST_ROOT, "server.log")
+    with open(log_path, 'w') as log:
+        server = subprocess.Popen([sys.executable, MAIN, "serve", "--socket", socket_path, "--workers", "1", "--queue-size", "1"],
+                                  stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+                                  env=fake_env("server-cache", FAKE_UV_LATENCY="0.3"))
+    try:
+        deadline = time.monotonic() + TIMEOUT
+        while not ScaffoldClient.is_listening(socket_path):
+            assert server.poll() is None and time.monotonic() < deadline, "The scaffold server did not start."
+            time.sleep(0.05)
+        assert stat.S_IMODE(os.stat(socket_path).st_mode) & 0o077 == 0, "Other users can connect to the server's socket."
+
+        def request(message):
+            return list(ScaffoldClient.request(socket_path, message))
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(socket_path)
+            sock.sendall(b"not json\n")
+            assert json.loads(sock.makefile('rb').readline())['error'].startswith("Invalid request:"), "Invalid JSON was not refused."
+        assert request({"action": "dance"})[0]['event'] == 'error', "An unknown action was not refused."
+        relative = request({"action": "submit", "project": {"name": PROJECT_NAME, "directory": "relative"}})
+        assert relative == [{"event": "rejected", "error": "The project needs an absolute 'directory'."}], f"Unexpected reply: {relative}"
+
+        def project(name):
+            return {"name": name, "apps": [APP_NAME], "tailwind": False, "directory": os.path.join(INSTALL_DIR, name)}
+
+        first = request({"action": "submit", "project": project("served_one"), "follow": False})[0]
+        assert first['event'] == 'queued', f"The first job was not queued: {first}"
+        while request({"action": "jobs"})[0]['jobs'][0]['status'] == 'queued':
+            time.sleep(0.05)
+        busy = request({"action": "submit", "project": project("served_one"), "follow": False})[0]
+        assert busy['event'] == 'rejected' and "is already scaffolding" in busy['error'], "A busy directory was accepted twice."
+        second = request({"action": "submit", "project": project("served_two"), "follow": False})[0]
+        assert second == {"event": "queued", "job": second['job'], "ahead": 0}, f"The second job was not queued: {second}"
+        full = request({"action": "submit", "project": project("served_three"), "follow": False})[0]
+        assert full['event'] == 'rejected' and "The job queue is full (1 waiting)" in full['error'], "A full queue accepted a job."
+
+        events = request({"action": "watch", "job": second['job']})
+        kinds = [event['event'] for event in events]
+        assert kinds[0] == 'started' and 'output' in kinds and 'step' in kinds, f"The watch stream is incomplete: {kinds}"
+        assert events[-1]['event'] == 'finished' and events[-1]['status'] == 'ok', f"The second job failed: {events[-1]}"
+        assert all(event['job'] == second['job'] for event in events), "The watch stream mixed in another job's events."
+        for name in ("served_one", "served_two"):
+            assert os.path.isfile(os.path.join(INSTALL_DIR, name, APP_NAME, "urls.py")), f"{name} was not scaffolded."
+        statuses = {job['job']: job['status'] for job in request({"action": "jobs"})[0]['jobs']}
+        assert statuses == {first['job']: 'ok', second['job']: 'ok'}, f"Unexpected job list: {statuses}"
+
+        assert request({"action": "shutdown"}) == [{"event": "stopping"}], "The server did not acknowledge the shutdown."
+        assert server.wait(TIMEOUT) == 0, "The scaffold server did not exit cleanly."
+        assert not os.path.exists(socket_path), "The server left its socket behind."
+    finally:
+        if server.poll() is None:
+            server.kill()
+            server.wait()
+
+def test_scheduler_ordering_and_failure():
+    """Test that steps start after their inputs exist and that a failure stops the dependent steps."""
+    print("Testing step scheduler ordering and failure propagation...")
+    ran = []
+    scheduler = StepScheduler(max_workers=4)
+    scheduler.add('d', lambda: ran.append('d'), inputs=['y', 'z'])
+    scheduler.add('b', lambda: ran.append('b'), inputs=['x'], outputs=['y'])
+    scheduler.add('c', lambda: ran.append('c'), inputs=['x'], outputs=['z'])
+    scheduler.add('a', lambda: ran.append('a'), outputs=['x'])
+    scheduler.run()
+    assert ran[0] == 'a' and ran[-1] == 'd' and sorted(ran[1:3]) == ['b', 'c'], f"Steps ran out of order: {ran}"
+
+    def fail():
+        raise RuntimeError("step failed")
+
+    ran = []
+    scheduler = StepScheduler(max_workers=2)
+    scheduler.add('fail', fail, outputs=['x'])
+    scheduler.add('after', lambda: ran.append('after'), inputs=['x'])
+    scheduler.add('independent', lambda: (time.sleep(0.2), ran.append('independent')))
+    try:
+        scheduler.run()
+    except RuntimeError as e:
+        assert str(e) == "step failed", f"Unexpected error: {e}"
+    else:
+        raise AssertionError("The step failure was not raised.")
+    assert ran == ['independent'], f"Dependent step ran, or the running step was abandoned: {ran}"
+
+    scheduler = StepScheduler()
+    scheduler.add('a', lambda: None, inputs=['y'], outputs=['x'])
+    scheduler.add('b', lambda: None, inputs=['x'], outputs=['y'])
+    try:
+        scheduler.run()
+    except ValueError as e:
+        assert "cycle" in str(e), f"Unexpected error: {e}"
+    else:
+        raise AssertionError("A dependency cycle was not rejected.")
+
+def test_plan_conflicts():
+    """Test that --plan reports conflicts in the target and exits 1 only when there are some."""
+    print("Testing --plan conflicts and exit status...")
+    clean_dir = os.path.join(INSTALL_DIR, "clean")
+    returncode, stdout, _ = run_command([PROJECT_NAME, APP_NAME, "--directory", clean_dir, "--plan"])
+    assert returncode == 0, "--plan failed for an empty target."
+    assert "Conflict" not in stdout, "--plan reported conflicts for an empty target."
+    assert not os.path.exists(clean_dir), "--plan created the target directory."
+
+    conflict_dir = os.path.join(INSTALL_DIR, "conflict")
+    os.makedirs(conflict_dir)
+    with open(os.path.join(conflict_dir, "manage.py"), 'w') as f:
+        f.write("# not Django's\n")
+    returncode, stdout, _ = run_command([PROJECT_NAME, APP_NAME, "--directory", conflict_dir, "--plan"])
+    assert returncode == 1, "--plan should exit 1 when the target has conflicts."
+    assert "Conflict: manage.py: startproject refuses to overwrite an existing file" in stdout, "The manage.py conflict was not reported."
+    assert os.listdir(conflict_dir) == ["manage.py"], "--plan wrote into the target."
+
+def test_initial_commit_contents():
+    """Test that --initial-commit commits the generated files, honouring .gitignore, and leaves a clean tree."""
+    print("Testing the fast-import initial commit...")
+    # Without a real git the fake one creates no repository, and the run says it skipped the commit.
+    directory = os.path.join(INSTALL_DIR, "uncommitted")
+    returncode, stdout, stderr = run_command([PROJECT_NAME, APP_NAME, "--directory", directory, "--initial-commit"],
+                                             env=fake_env("git-cache", FAKE_REAL_GIT=""))
+    assert returncode == 0, f"Project setup failed with error: {stderr}"
+    assert "Skipping the initial commit: the project has no Git repository of its own." in stdout, \
+        "A run without a real git did not report the skipped commit."
+    assert "Created the initial commit" not in stdout, "A commit was reported without a real git."
+
+    if REAL_GIT is None:
+        print("Skipping the rest: git is not installed.")
+        return
+    # The fake git hands repository commands to the real one.
+    env = fake_env("git-cache")
+    directory = os.path.join(INSTALL_DIR, "committed")
+    returncode, stdout, stderr = run_command([PROJECT_NAME, APP_NAME, "--directory", directory, "--initial-commit"], env=env)
+    assert returncode == 0, f"Project setup failed with error: {stderr}"
+
+    def git(*args):
+        return subprocess.run([REAL_GIT, *args], cwd=directory, env=env, stdout=subprocess.PIPE, text=True, check=True).stdout
+
+    tracked = set(git("ls-tree", "-r", "--name-only", "HEAD").splitlines())
+    for path in ("manage.py", f"{PROJECT_NAME}/settings.py", f"{APP_NAME}/apps.py", "templates/base.html",
+                 ".gitignore", "pyproject.toml", "package.json"):
+        assert path in tracked, f"{path} is missing from the initial commit."
+    for path in (".env", GenerationJournal.FILENAME, "static/css/output.css"):
+        assert path not in tracked, f"{path} should be ignored but was committed."
+    assert not any(path.startswith("node_modules/") for path in tracked), "node_modules was committed."
+    assert git("log", "--format=%s").strip() == "Initial commit", "Unexpected commit history."
+    assert git("status", "--porcelain") == "", "The working tree is not clean after the initial commit."
+
+def test_command_timeout_and_retry():
+    """Test that a timed-out command is stopped with its children, and that retries rerun a failing command."""
+    print("Testing command runner timeout and retry...")
+    marker = "9.8765"  # an unusual sleep length, to find leftover processes
+    start = time.perf_counter()
+    try:
+        CommandRunner.run(["sh", "-c", f"echo started; sleep {marker}"], timeout=1)
+    except CommandTimeout as e:
+        assert e.timeout == 1, f"Unexpected timeout: {e.timeout}"
+    else:
+        raise AssertionError("The command did not time out.")
+    assert time.perf_counter() - start < 5, "The timed-out command was not stopped promptly."
+    if os.path.isdir("/proc"):
+        leftovers = []
+        for pid in filter(str.isdigit, os.listdir("/proc")):
+            try:
+                with open(f"/proc/{pid}/cmdline", 'rb') as f:
+                    if f.read().split(b"\0")[:2] == [b"sleep", marker.encode()]:
+                        leftovers.append(pid)
+            except OSError:
+                pass
+        assert not leftovers, f"The command's child outlived the timeout: {leftovers}"
+
+    counter = os.path.join(TEST_ROOT, "attempts")
+    script = f'n=$(cat {counter} 2>/dev/null || echo 0); n=$((n + 1)); echo $n > {counter}; [ $n -ge 2 ]'
+    backoff, CommandRunner.backoff = CommandRunner.backoff, 0.0
+    try:
+        result = CommandRunner.run(["sh", "-c", script], retries=2)
+    finally:
+        CommandRunner.backoff = backoff
+    assert result.returncode == 0, "The command still failed after retrying."
+    with open(counter) as f:
+        assert f.read().strip() == "2", "The command was not retried exactly once."
+
+def test_replace_file_keeps_target_on_failure():
+    """Test that an atomic write that fails part-way leaves the old file and no temporary file behind."""
+    print("Testing atomic file replacement...")
+    path = os.path.join(INSTALL_DIR, "state.json")
+    DirectoryManager.write_json(path, {"version": 1})
+
+    def chunks():
+        yield b'{"version": '
+        raise ValueError("download interrupted")
+
+    try:
+        DirectoryManager.replace_file(path, chunks())
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("The failing write was not reported.")
+    with open(path) as f:
+        assert json.load(f) == {"version": 1}, "A failed write replaced the file."
+    assert os.listdir(INSTALL_DIR).count("state.json") == 1 and not any(name.endswith(".tmp") for name in os.listdir(INSTALL_DIR)), \
+        "A temporary file was left behind."
+
 def run_tests():
     """Run all tests in sequence."""
     setup_test_environment()
@@ -127,7 +998,7 @@ def run_tests():
         test_env_files()
         test_urls_and_forms_files()
         test_tailwind_setup()
-        
+
         cleanup_test_environment()
 
         setup_test_environment()
@@ -136,12 +1007,44 @@ def run_tests():
         test_app_html_files()
         test_env_files()
         test_urls_and_forms_files()
-        
+
+        cleanup_test_environment()
+
+        setup_test_environment()
+        test_gitignore_merges_into_user_file()
+        test_journal_resume_keeps_edited_files()
+        cleanup_test_environment()
+
+        setup_test_environment()
+        test_snapshot_rename_and_secret_key()
+        test_snapshot_keeps_user_files()
+        test_production_profile()
+        test_plan_conflicts()
+        test_rerun_with_other_options()
+        test_batch_manifest()
+        test_initial_commit_contents()
+        test_toolchain_probe_cache()
+        test_trace_output()
+        test_custom_template_pack()
+        test_multiple_apps()
+        test_node_modules_store()
+        test_standalone_tailwind_checksums()
+        test_workspace_members()
+        test_prewarm_and_offline()
+        test_precompressed_storage()
+        test_loadtest_command()
+        test_scaffold_server()
+        test_scheduler_ordering_and_failure()
+        test_command_timeout_and_retry()
+        test_replace_file_keeps_target_on_failure()
+
         print("\nAll tests passed successfully!")
     except AssertionError as e:
         print(f"Test failed: {e}")
+        sys.exit(1)
     finally:
-        cleanup_test_environment()
+        os.chdir(ROOT_DIR)
+        shutil.rmtree(TEST_ROOT, ignore_errors=True)
 
 if __name__ == "__main__":
-    run_tests()
\ No newline at end of file
+    run_tests()
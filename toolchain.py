@@ -0,0 +1,114 @@
+import json
+import os
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from command_runner import CommandRunner
+from directory_manager import DirectoryManager
+
+class ToolInfo:
+    """Result of probing one command-line tool."""
+
+    def __init__(self, name, path=None, version=None):
+        self.name = name
+        self.path = path
+        self.version = version
+
+    @property
+    def installed(self):
+        return self.path is not None and self.version is not None
+
+class Toolchain:
+    """Probes external tools once per process, and once per binary across runs.
+
+    A tool is first looked up on PATH. Its ``--version`` subprocess only runs when the binary's
+    (path, mtime, inode, size) differs from the persisted cache, so repeated and batch runs reuse
+    earlier results until the tool is upgraded or replaced.
+    """
+
+    # Seconds a ``--version`` probe may take before the tool counts as unusable.
+    PROBE_TIMEOUT = 30
+
+    _results = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def probe(names):
+        """Resolve every tool in ``names`` concurrently and return a name -> ToolInfo dict."""
+        names = list(dict.fromkeys(names))
+        with Toolchain._lock:
+            missing = [name for name in names if name not in Toolchain._results]
+
+        if missing:
+            cache = Toolchain._load_cache()
+            before = json.dumps(cache, sort_keys=True)
+            with ThreadPoolExecutor(max_workers=len(missing)) as pool:
+                probed = list(pool.map(lambda name: Toolchain._probe_one(name, cache), missing))
+            with Toolchain._lock:
+                for info in probed:
+                    Toolchain._results[info.name] = info
+            if json.dumps(cache, sort_keys=True) != before:
+                Toolchain._save_cache(cache)
+
+        with Toolchain._lock:
+            return {name: Toolchain._results[name] for name in names}
+
+    @staticmethod
+    def get(name):
+        """Return the ToolInfo for one tool, probing it if needed."""
+        return Toolchain.probe([name])[name]
+
+    @staticmethod
+    def forget(name):
+        """Drop the in-process result for a tool, e.g. after installing it."""
+        with Toolchain._lock:
+            Toolchain._results.pop(name, None)
+
+    @staticmethod
+    def _probe_one(name, cache):
+        """Look the tool up on PATH, reusing the cached version if the binary is unchanged."""
+        path = shutil.which(name)
+        if path is None:
+            return ToolInfo(name)
+
+        try:
+            st = os.stat(path)
+        except OSError:
+            return ToolInfo(name)
+        fingerprint = [os.path.realpath(path), st.st_mtime_ns, st.st_ino, st.st_size]
+
+        entry = cache.get(name)
+        if entry and entry.get('fingerprint') == fingerprint:
+            return ToolInfo(name, path, entry['version'])
+
+        try:
+            result = CommandRunner.capture([path, '--version'], merge_stderr=True, timeout=Toolchain.PROBE_TIMEOUT)
+        except (subprocess.CalledProcessError, OSError):
+            cache.pop(name, None)
+            return ToolInfo(name, path)
+
+        output = result.stdout.decode(errors='replace').strip()
+        version = output.splitlines()[0] if output else ''
+        cache[name] = {'fingerprint': fingerprint, 'version': version}
+        return ToolInfo(name, path, version)
+
+    @staticmethod
+    def _cache_path():
+        return os.path.join(DirectoryManager.cache_directory('toolchain'), 'probes.json')
+
+    @staticmethod
+    def _load_cache():
+        try:
+            with open(Toolchain._cache_path()) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _save_cache(cache):
+        """Persist the probe cache atomically so concurrent runs never read a torn file."""
+        try:
+            DirectoryManager.write_json(Toolchain._cache_path(), cache, indent=2, sort_keys=True)
+        except OSError:
+            pass
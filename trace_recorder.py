@@ -0,0 +1,198 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+class Span:
+    """Measurements for one step of one project."""
+
+    def __init__(self, name, project, recorder):
+        self.name = name
+        self.project = project
+        self.recorder = recorder
+        self.thread = threading.get_ident()
+        self.start = time.perf_counter()
+        self.end = None
+        self.cpu_start = time.thread_time()
+        self.cpu_time = 0.0
+        self.child_cpu_time = 0.0
+        self.exit_codes = []
+        self.bytes_written = 0
+        self.files_created = 0
+        self.status = 'running'
+
+    @property
+    def wall_time(self):
+        return (self.end or time.perf_counter()) - self.start
+
+    def as_dict(self):
+        return {
+            'name': self.name,
+            'project': self.project,
+            'status': self.status,
+            'wall_time': round(self.wall_time, 6),
+            'cpu_time': round(self.cpu_time, 6),
+            'child_cpu_time': round(self.child_cpu_time, 6),
+            'exit_codes': self.exit_codes,
+            'bytes_written': self.bytes_written,
+            'files_created': self.files_created,
+        }
+
+class TraceRecorder:
+    """Collects per-step timings for every project in a run and writes them as JSON or Chrome trace events.
+
+    Steps open a span with ``recorder.step(name, project)``. Code running inside the step reports
+    subprocess exit codes and file writes through the static ``record_*`` helpers, which attach to
+    the calling thread's current span and do nothing outside of one.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+    _current = threading.local()
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.spans = []
+        self.listeners = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def instance():
+        """Return the process-wide recorder."""
+        with TraceRecorder._instance_lock:
+            if TraceRecorder._instance is None:
+                TraceRecorder._instance = TraceRecorder()
+            return TraceRecorder._instance
+
+    def subscribe(self, callback):
+        """Call ``callback(span)`` whenever a step finishes; returns a function that unsubscribes."""
+        with self._lock:
+            self.listeners.append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self.listeners:
+                    self.listeners.remove(callback)
+        return unsubscribe
+
+    @contextmanager
+    def step(self, name, project=None):
+        """Measure the enclosed block as one step of ``project``."""
+        span = Span(name, project, self)
+        parent = getattr(TraceRecorder._current, 'span', None)
+        TraceRecorder._current.span = span
+        try:
+            yield span
+            span.status = 'ok'
+        except BaseException:
+            span.status = 'failed'
+            raise
+        finally:
+            span.end = time.perf_counter()
+            span.cpu_time = time.thread_time() - span.cpu_start
+            TraceRecorder._current.span = parent
+            with self._lock:
+                self.spans.append(span)
+                listeners = list(self.listeners)
+            for listener in listeners:
+                listener(span)
+
+    def discard(self, project):
+        """Drop the finished spans of ``project``, so a long-running process does not accumulate them."""
+        with self._lock:
+            self.spans = [span for span in self.spans if span.project != project]
+
+    @staticmethod
+    def current():
+        """Return the span open on the calling thread, or None."""
+        return getattr(TraceRecorder._current, 'span', None)
+
+    @staticmethod
+    def bind(function):
+        """Wrap ``function`` so that, run on a worker thread, it reports to the calling thread's current span."""
+        span = TraceRecorder.current()
+
+        def bound(*args, **kwargs):
+            previous = getattr(TraceRecorder._current, 'span', None)
+            TraceRecorder._current.span = span
+            try:
+                return function(*args, **kwargs)
+            finally:
+                TraceRecorder._current.span = previous
+        return bound
+
+    @staticmethod
+    def record_command(returncode, child_cpu_time=0.0):
+        """Attach a finished subprocess's exit code and CPU time to the current span."""
+        span = TraceRecorder.current()
+        if span is not None:
+            with span.recorder._lock:
+                span.exit_codes.append(returncode)
+                span.child_cpu_time += child_cpu_time
+
+    @staticmethod
+    def record_write(nbytes, created):
+        """Attach a file write to the current span."""
+        span = TraceRecorder.current()
+        if span is not None:
+            # Spans can be shared with worker threads (see ``bind``), so updates take the recorder's lock.
+            with span.recorder._lock:
+                span.bytes_written += nbytes
+                span.files_created += 1 if created else 0
+
+    def summary(self):
+        """Return a machine-readable summary grouped by project."""
+        with self._lock:
+            spans = list(self.spans)
+
+        projects = {}
+        for span in spans:
+            project = projects.setdefault(span.project or '-', {'steps': [], 'wall_time': 0.0, 'cpu_time': 0.0,
+                                                                'bytes_written': 0, 'files_created': 0})
+            project['steps'].append(span.as_dict())
+            project['cpu_time'] += span.cpu_time + span.child_cpu_time
+            project['bytes_written'] += span.bytes_written
+            project['files_created'] += span.files_created
+
+        for name, project in projects.items():
+            project_spans = [s for s in spans if (s.project or '-') == name]
+            project['wall_time'] = max(s.end for s in project_spans) - min(s.start for s in project_spans)
+
+        return {'projects': projects, 'wall_time': time.perf_counter() - self.origin}
+
+    def chrome_trace(self):
+        """Return the spans in Chrome trace-event format (one process per project, one track per thread)."""
+        with self._lock:
+            spans = list(self.spans)
+
+        pids, tids, events = {}, {}, []
+        for span in spans:
+            project = span.project or '-'
+            if project not in pids:
+                pids[project] = len(pids) + 1
+                events.append({'name': 'process_name', 'ph': 'M', 'pid': pids[project], 'tid': 0,
+                               'args': {'name': project}})
+            tid = tids.setdefault(span.thread, len(tids) + 1)
+            details = span.as_dict()
+            events.append({
+                'name': span.name,
+                'cat': 'scaffold',
+                'ph': 'X',
+                'ts': round((span.start - self.origin) * 1e6),
+                'dur': round(span.wall_time * 1e6),
+                'pid': pids[project],
+                'tid': tid,
+                'args': {key: details[key] for key in ('status', 'cpu_time', 'child_cpu_time', 'exit_codes',
+                                                       'bytes_written', 'files_created')},
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write(self, path):
+        """Write the Chrome trace to ``path`` and the summary next to it as ``<name>.summary.json``."""
+        with open(path, 'w') as f:
+            json.dump(self.chrome_trace(), f)
+        summary_path = f"{os.path.splitext(path)[0]}.summary.json"
+        with open(summary_path, 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+        print(f"Wrote trace to {path} and summary to {summary_path}.")